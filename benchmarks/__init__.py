@@ -0,0 +1 @@
+"""Offline benchmarks for the bot and viewer hot paths. See README "Benchmarks"."""
@@ -0,0 +1,313 @@
+"""
+Offline benchmarks for the bot's hot paths, against benchmarks.fakes (no Discord, no MySQL).
+
+    python -m benchmarks.bot_paths -o bench-bot.json
+    python -m benchmarks.bot_paths --quick --compare bench-bot.json
+
+Covered: handle_user_dm (relay into an open ticket, and the welcome-menu path),
+generate_transcript on 1k/10k-message channels, DatabaseManager.save_ticket_transcript
+on those transcripts, TranscriptManager.save_transcript as the per-user JSON file
+grows, and one timer_task pass (process_due_timers) over 10k pending timers.
+Image downloads are left out of generate_transcript; they are network-bound.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.fakes import (
+    FakeDiscord,
+    FakeMySQLConnection,
+    build_ticket_history,
+    make_bench_bot,
+    seed_store,
+    seed_world,
+)
+from benchmarks.harness import build_report, compare, print_table, summarize, time_async, time_sync, write_report
+
+BENCHMARKS = (
+    "dm_relay",
+    "dm_welcome",
+    "generate_transcript",
+    "save_ticket_transcript",
+    "transcript_manager_growth",
+    "timer_pass",
+)
+
+
+class Suite:
+    def __init__(self, args, workdir: str):
+        import bot as bot_module
+
+        self.args = args
+        self.workdir = workdir
+        self.bot_module = bot_module
+        self.transcripts = {}
+
+    def world(self, **kwargs) -> FakeDiscord:
+        return FakeDiscord(self.bot_module.GUILD_ID, http_latency=self.args.http_latency_ms / 1000, **kwargs)
+
+    def connection(self) -> FakeMySQLConnection:
+        return FakeMySQLConnection(latency=self.args.db_latency_ms / 1000)
+
+
+def _per_call(world, conn, calls: int) -> dict:
+    return {
+        "db_round_trips_per_call": conn.round_trips / calls if calls else 0,
+        "http_calls_per_call": sum(world.http_calls.values()) / calls if calls else 0,
+    }
+
+
+# ---------------- handle_user_dm ----------------
+
+
+async def bench_dm_relay(ctx: Suite) -> dict:
+    """DMs from users with an open ticket: lookup, watcher mentions, embed relay."""
+    world = ctx.world(keep_sent_messages=False)
+    members, staff, channels = seed_world(world, ctx.bot_module.CATEGORY_IDS, users=ctx.args.users)
+    conn = ctx.connection()
+    seed_store(conn.store, channels)
+    for index, channel in enumerate(channels.values()):
+        if index % 10 == 0:
+            conn.store.watchers[channel.id] = {staff[index % len(staff)].id}
+    bot = make_bench_bot(world, conn)
+
+    messages = [world.dm(members[index % len(members)], f"Relay message {index}") for index in range(ctx.args.dms)]
+    await bot.handle_user_dm(messages[0])
+    world.reset_counters()
+    conn.round_trips = 0
+
+    samples = []
+    for message in messages:
+        start = time.perf_counter()
+        await bot.handle_user_dm(message)
+        samples.append(time.perf_counter() - start)
+    per_call = _per_call(world, conn, len(messages))
+
+    # The same DMs arriving together, as a surge would deliver them.
+    start = time.perf_counter()
+    await asyncio.gather(*(bot.handle_user_dm(message) for message in messages))
+    burst = time.perf_counter() - start
+    return summarize(samples, open_tickets=len(channels), burst_s=burst, burst_msgs_per_s=len(messages) / burst, **per_call)
+
+
+async def bench_dm_welcome(ctx: Suite) -> dict:
+    """DMs from users without a ticket: DB miss, guild channel scan, welcome menu with the category view."""
+    world = ctx.world(keep_sent_messages=False)
+    members, _, channels = seed_world(
+        world, ctx.bot_module.CATEGORY_IDS, users=ctx.args.users * 2, open_tickets=ctx.args.users
+    )
+    conn = ctx.connection()
+    seed_store(conn.store, channels)
+    bot = make_bench_bot(world, conn)
+
+    newcomers = members[ctx.args.users:]
+    messages = [world.dm(newcomers[index % len(newcomers)], "Hello?") for index in range(ctx.args.dms)]
+    await bot.handle_user_dm(messages[0])
+    world.reset_counters()
+    conn.round_trips = 0
+
+    samples = []
+    for message in messages:
+        start = time.perf_counter()
+        await bot.handle_user_dm(message)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, open_tickets=len(channels), **_per_call(world, conn, len(messages)))
+
+
+# ---------------- Transcripts ----------------
+
+
+def _modmail_cog(ctx: Suite, bot):
+    import cogs.modmail as modmail_module
+
+    modmail_module.TRANSCRIPT_DIR = os.path.join(ctx.workdir, "transcripts")
+    modmail_module.IMAGE_DIR = os.path.join(ctx.workdir, "transcripts", "images")
+    return modmail_module.Modmail(bot)
+
+
+async def bench_generate_transcript(ctx: Suite, size: int) -> dict:
+    world = ctx.world()
+    members, staff, channels = seed_world(world, ctx.bot_module.CATEGORY_IDS, users=1)
+    owner = members[0]
+    channel = channels[owner.id]
+    build_ticket_history(world, channel, owner, staff, size)
+    conn = ctx.connection()
+    seed_store(conn.store, channels)
+    bot = make_bench_bot(world, conn)
+    cog = _modmail_cog(ctx, bot)
+
+    result = {}
+
+    async def run():
+        result["path"], result["data"] = await cog.generate_transcript(channel)
+
+    iterations = 2 if size >= 10000 else 5
+    samples = await time_async(run, iterations)
+    ctx.transcripts[size] = result["data"]
+    return summarize(
+        samples,
+        ops_per_sample=size,
+        messages=size,
+        transcript_bytes=os.path.getsize(result["path"]),
+    )
+
+
+def bench_save_ticket_transcript(ctx: Suite, size: int) -> dict:
+    """JSON encode + upsert + staff-activity bookkeeping for one closed ticket."""
+    transcript_data = ctx.transcripts[size]
+    world = ctx.world()
+    conn = ctx.connection()
+    bot = make_bench_bot(world, conn)
+    closed_by_id = next(
+        (message["author_id"] for message in transcript_data["messages"] if message.get("role") == "staff"), None
+    )
+
+    def run():
+        bot.db.save_ticket_transcript(transcript_data, closed_by="staff0", close_reason="Resolved", closed_by_id=closed_by_id)
+
+    run()
+    conn.round_trips = 0
+    conn.store.staff_activity_writes = 0
+    samples = time_sync(run, iterations=5, warmup=0)
+    # Re-saving an unchanged transcript should apply no staff-activity deltas.
+    return summarize(
+        samples,
+        messages=size,
+        db_round_trips_per_call=conn.round_trips / len(samples),
+        staff_activity_writes_per_call=conn.store.staff_activity_writes / len(samples),
+    )
+
+
+def bench_transcript_manager_growth(ctx: Suite) -> dict:
+    """Repeated %transcript saves for one user: each save re-reads and rewrites the whole file."""
+    import cogs.staff_commands as staff_module
+
+    staff_module.TRANSCRIPT_DIR = os.path.join(ctx.workdir, "user-transcripts")
+    world = ctx.world()
+    members, staff, channels = seed_world(world, ctx.bot_module.CATEGORY_IDS, users=1)
+    owner = members[0]
+    channel = channels[owner.id]
+    messages = build_ticket_history(world, channel, owner, staff, ctx.args.channel_messages)
+
+    samples = []
+    sizes = []
+    path = os.path.join(staff_module.TRANSCRIPT_DIR, f"{owner.id}.json")
+    for _ in range(ctx.args.saves):
+        start = time.perf_counter()
+        staff_module.TranscriptManager.save_transcript(owner.id, channel, messages)
+        samples.append(time.perf_counter() - start)
+        sizes.append(os.path.getsize(path))
+    return summarize(
+        samples,
+        saves=len(samples),
+        messages_per_save=len(messages),
+        first_s=samples[0],
+        last_s=samples[-1],
+        growth_ratio=samples[-1] / samples[0] if samples[0] else 0.0,
+        final_file_bytes=sizes[-1],
+        per_save_s=samples,
+    )
+
+
+# ---------------- Timers ----------------
+
+
+async def bench_timer_pass(ctx: Suite) -> dict:
+    """One process_due_timers() pass with `--timers` pending rows, 10% of them due suspend closures."""
+    total = ctx.args.timers
+    due = max(total // 10, 1)
+    world = ctx.world(keep_sent_messages=False)
+    members, _, channels = seed_world(world, ctx.bot_module.CATEGORY_IDS, users=due)
+    conn = ctx.connection()
+    bot = make_bench_bot(world, conn)
+    # ticket_timers.execute_at is a naive UTC DATETIME.
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    def reset():
+        conn.store.timers.clear()
+        conn.store.tickets.clear()
+        conn.store.open_by_user.clear()
+        for channel in channels.values():
+            world.guild.add_channel(channel)
+        seed_store(conn.store, channels)
+        for channel in channels.values():
+            conn.store.add_timer(channel.id, 0, "suspend", now - timedelta(minutes=5))
+        for index in range(total - due):
+            conn.store.add_timer(10_000_000 + index, 0, "unclaimed", now + timedelta(hours=24))
+        world.reset_counters()
+        conn.round_trips = 0
+
+    samples = await time_async(bot.process_due_timers, iterations=3, setup=reset)
+    return summarize(
+        samples,
+        pending_timers=total,
+        due_timers=due,
+        db_round_trips_per_pass=conn.round_trips,
+        http_calls_per_pass=sum(world.http_calls.values()),
+    )
+
+
+# ---------------- CLI ----------------
+
+
+async def run_benchmarks(ctx: Suite, selected) -> dict:
+    results = {}
+    if "dm_relay" in selected:
+        results["handle_user_dm.relay"] = await bench_dm_relay(ctx)
+    if "dm_welcome" in selected:
+        results["handle_user_dm.welcome"] = await bench_dm_welcome(ctx)
+    sizes = (1000, 10000) if not ctx.args.quick else (1000,)
+    if "generate_transcript" in selected or "save_ticket_transcript" in selected:
+        for size in sizes:
+            label = f"{size // 1000}k"
+            generated = await bench_generate_transcript(ctx, size)
+            if "generate_transcript" in selected:
+                results[f"generate_transcript.{label}"] = generated
+            if "save_ticket_transcript" in selected:
+                results[f"save_ticket_transcript.{label}"] = bench_save_ticket_transcript(ctx, size)
+    if "transcript_manager_growth" in selected:
+        results["TranscriptManager.save_transcript.growth"] = bench_transcript_manager_growth(ctx)
+    if "timer_pass" in selected:
+        results[f"timer_task.pass_{ctx.args.timers // 1000}k"] = await bench_timer_pass(ctx)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the bot's hot paths offline and report JSON.")
+    parser.add_argument("-o", "--output", default=None, help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Print mean-time changes against an earlier report")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="Run a subset")
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes for a fast smoke run")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="Simulated blocking MySQL round trip")
+    parser.add_argument("--http-latency-ms", type=float, default=0.0, help="Simulated Discord REST round trip")
+    parser.add_argument("--users", type=int, default=500, help="Users with an open ticket (dm_* benchmarks)")
+    parser.add_argument("--dms", type=int, default=2000, help="DMs per dm_* benchmark")
+    parser.add_argument("--timers", type=int, default=10000, help="Pending timers for timer_pass")
+    parser.add_argument("--saves", type=int, default=50, help="Successive saves for transcript_manager_growth")
+    parser.add_argument("--channel-messages", type=int, default=200, help="Messages per save for transcript_manager_growth")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.users, args.dms, args.timers, args.saves = 100, 200, 2000, 10
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s", stream=sys.stderr)
+    selected = set(args.only or BENCHMARKS)
+    with tempfile.TemporaryDirectory(prefix="modmail-bench-") as workdir:
+        ctx = Suite(args, workdir)
+        results = asyncio.run(run_benchmarks(ctx, selected))
+
+    params = {key: value for key, value in vars(args).items() if key not in ("output", "compare", "only")}
+    report = build_report("bot_paths", results, params)
+    write_report(report, args.output)
+    print_table(report)
+    if args.compare:
+        sys.stderr.write("\n".join(compare(report, args.compare)) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,318 @@
+"""
+Synthetic DM-surge load generator: drives the bot's real handlers against benchmarks.fakes.
+
+    python -m benchmarks.dm_surge -o surge.json
+    python -m benchmarks.dm_surge --rates 50 100 200 400 --duration 20 --http-latency-ms 80 --db-latency-ms 2
+    python -m benchmarks.dm_surge --quick --compare surge.json
+
+Each step offers an open-loop Poisson arrival stream at a fixed DM rate, plus
+ticket-menu selections and staff `%r` replies in proportion to it:
+
+    dm      a user DM delivered to ModmailBot.on_message and the cogs' on_message listeners
+            (relay into an open ticket, or the welcome menu for newcomers)
+    select  TicketCategorySelect.callback on a newcomer's welcome menu (opens a ticket)
+    reply   a staff `%r` message in an open ticket channel, through the same on_message path
+
+Latency is measured from each event's scheduled arrival, so time spent waiting
+behind a blocked loop counts (no coordinated omission). A sampler records the
+number of in-flight handlers (queue depth) and event-loop lag. A step is saturated
+when its p99 exceeds --slo-ms, more than a second's worth of arrivals is still
+in flight when arrivals stop, or handlers are still queued --drain-timeout
+seconds later; the run stops at the first saturated step unless --all-steps
+is given.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.fakes import (
+    FakeDiscord,
+    FakeInteraction,
+    FakeMySQLConnection,
+    deliver,
+    load_cogs,
+    make_bench_bot,
+    seed_store,
+    seed_world,
+)
+from benchmarks.harness import build_report, compare, percentile, summarize, write_report
+
+EVENT_KINDS = ("dm", "select", "reply")
+
+
+class SurgeStep:
+    """One load step: a fresh world, bot and DB, fed `rate` DMs per second for `duration` seconds."""
+
+    def __init__(self, args, workdir: str, rate: float, seed: int):
+        import bot as bot_module
+
+        self.args = args
+        self.workdir = workdir
+        self.rate = rate
+        self.rng = random.Random(seed)
+        self.bot_module = bot_module
+        self.world = FakeDiscord(bot_module.GUILD_ID, http_latency=args.http_latency_ms / 1000, keep_sent_messages=False)
+        self.members, self.staff, channels = seed_world(
+            self.world,
+            bot_module.CATEGORY_IDS,
+            users=args.users + args.newcomers,
+            staff=args.staff,
+            open_tickets=args.users,
+        )
+        self.ticket_holders = self.members[:args.users]
+        self.newcomers = self.members[args.users:]
+        self.conn = FakeMySQLConnection(latency=args.db_latency_ms / 1000)
+        seed_store(self.conn.store, channels)
+        self.bot = None
+        self.welcomes = {}
+        self.latencies = {kind: [] for kind in EVENT_KINDS}
+        self.errors = {kind: 0 for kind in EVENT_KINDS}
+        self.in_flight = 0
+        self.depth_samples = []
+        self.lag_samples = []
+
+    async def setup(self):
+        from note_manager import NoteManager
+        from search_index import TranscriptSearchIndex
+
+        import cogs.modmail as modmail_module
+
+        modmail_module.TRANSCRIPT_DIR = os.path.join(self.workdir, "transcripts")
+        modmail_module.IMAGE_DIR = os.path.join(self.workdir, "transcripts", "images")
+        search_index = TranscriptSearchIndex(os.path.join(self.workdir, f"search-{self.rate:g}.db"))
+        search_index.setup()
+        self.bot = make_bench_bot(self.world, self.conn, search_index=search_index)
+        self.bot.note_manager = NoteManager(self.bot)
+        await load_cogs(self.bot)
+
+    # ---------------- Events ----------------
+
+    def _open_channel(self, user_id):
+        channel_id = self.conn.store.open_by_user.get(user_id)
+        return self.world.channels.get(channel_id) if channel_id else None
+
+    async def _dm(self):
+        if self.rng.random() < self.args.new_user_ratio:
+            user = self.rng.choice(self.newcomers)
+        else:
+            user = self.rng.choice(self.ticket_holders)
+        message = self.world.dm(user, f"Hello, I need help with my order #{self.rng.randint(1000, 9999)}.")
+        if self._open_channel(user.id) is None:
+            self.welcomes.setdefault(user.id, message)
+        return await deliver(self.bot, "message", message)
+
+    async def _select(self):
+        from bot import TicketCategoryView
+
+        user_id = next(iter(self.welcomes), None)
+        if user_id is not None:
+            user, message = self.world.users[user_id], self.welcomes.pop(user_id)
+        else:
+            # Nobody is waiting on a menu yet: someone clicks an older one.
+            user = self.rng.choice(self.newcomers)
+            message = self.world.dm(user, "")
+        view = TicketCategoryView()
+        select = view.children[0]
+        # What discord.py's view store does with the interaction payload before calling back.
+        select._values = [self.rng.choice(list(self.bot_module.CATEGORY_IDS))]
+        await select.callback(FakeInteraction(self.world, self.bot, user, message))
+        return []
+
+    async def _reply(self):
+        channel_ids = list(self.conn.store.open_by_user.values())
+        channel = self.world.channels.get(self.rng.choice(channel_ids)) if channel_ids else None
+        if channel is None:
+            return []
+        author = self.rng.choice(self.staff)
+        message = self.world.dm(author, "%r Thanks for waiting, we're looking into it now.")
+        message.channel = channel
+        message.guild = channel.guild
+        return await deliver(self.bot, "message", message)
+
+    async def _handle(self, kind: str, scheduled: float):
+        self.in_flight += 1
+        try:
+            errors = await getattr(self, f"_{kind}")()
+        except Exception:
+            logging.getLogger("modmail.bench").exception("%s handler raised", kind)
+            errors = [True]
+        finally:
+            self.in_flight -= 1
+        self.errors[kind] += len(errors)
+        self.latencies[kind].append(time.perf_counter() - scheduled)
+
+    # ---------------- Driving ----------------
+
+    def _schedule(self):
+        """(offset_s, kind) arrivals for the step: independent Poisson streams per kind."""
+        rates = {
+            "dm": self.rate,
+            "select": self.rate * self.args.select_ratio,
+            "reply": self.rate * self.args.reply_ratio,
+        }
+        arrivals = []
+        for kind, rate in rates.items():
+            if rate <= 0:
+                continue
+            offset = self.rng.expovariate(rate)
+            while offset < self.args.duration:
+                arrivals.append((offset, kind))
+                offset += self.rng.expovariate(rate)
+        arrivals.sort()
+        return arrivals, sum(rates.values())
+
+    async def _sample(self, interval: float):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            self.lag_samples.append(max(loop.time() - start - interval, 0.0))
+            self.depth_samples.append(self.in_flight)
+
+    async def run(self) -> dict:
+        await self.setup()
+        arrivals, offered_rate = self._schedule()
+        self.world.reset_counters()
+        self.conn.round_trips = 0
+        sampler = asyncio.create_task(self._sample(self.args.sample_interval_ms / 1000))
+        tasks = []
+        start = time.perf_counter()
+        for offset, kind in arrivals:
+            delay = start + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self._handle(kind, start + offset)))
+        arrivals_done = time.perf_counter()
+        backlog_at_end = self.in_flight
+        _, pending = await asyncio.wait(tasks, timeout=self.args.drain_timeout) if tasks else (set(), set())
+        finished = time.perf_counter()
+        for task in pending:
+            task.cancel()
+        sampler.cancel()
+
+        completed = sum(len(samples) for samples in self.latencies.values())
+        all_latencies = sorted(latency for samples in self.latencies.values() for latency in samples)
+        elapsed = finished - start
+        result = summarize(
+            all_latencies,
+            offered_per_s=offered_rate,
+            dm_rate=self.rate,
+            arrivals=len(arrivals),
+            completed=completed,
+            completed_per_s=completed / elapsed if elapsed else 0.0,
+            unfinished=len(pending),
+            backlog_at_end=backlog_at_end,
+            drain_s=finished - arrivals_done,
+            errors=dict(self.errors),
+            queue_depth_max=max(self.depth_samples, default=0),
+            queue_depth_mean=sum(self.depth_samples) / len(self.depth_samples) if self.depth_samples else 0.0,
+            queue_depth_p99=percentile(sorted(self.depth_samples), 99),
+            loop_lag_max_s=max(self.lag_samples, default=0.0),
+            loop_lag_p99_s=percentile(sorted(self.lag_samples), 99),
+            http_max_in_flight=self.world.max_in_flight,
+            http_calls=dict(self.world.http_calls),
+            db_round_trips=self.conn.round_trips,
+            tickets_opened=len(self.conn.store.open_by_user) - self.args.users,
+        )
+        # The overall summary's ops_per_s is 1/mean latency; completed_per_s is the throughput.
+        result.pop("ops_per_s", None)
+        result["by_kind"] = {
+            kind: summarize(samples) for kind, samples in self.latencies.items() if samples
+        }
+        result["saturated"] = (
+            result["p99_s"] * 1000 > self.args.slo_ms
+            or backlog_at_end > offered_rate
+            or bool(pending)
+        )
+        return result
+
+
+def print_steps(report: dict, stream=sys.stderr):
+    stream.write(
+        f"{'step':<12} {'offered/s':>10} {'done/s':>9} {'p50 ms':>9} {'p99 ms':>10} {'depth max':>10} "
+        f"{'lag max ms':>11} {'http inflt':>10} {'errors':>7}  saturated\n"
+    )
+    for name, result in report["results"].items():
+        if not name.startswith("step."):
+            continue
+        stream.write(
+            f"{name:<12} {result['offered_per_s']:10.1f} {result['completed_per_s']:9.1f} "
+            f"{result['p50_s'] * 1000:9.1f} {result['p99_s'] * 1000:10.1f} {result['queue_depth_max']:10d} "
+            f"{result['loop_lag_max_s'] * 1000:11.1f} {result['http_max_in_flight']:10d} "
+            f"{sum(result['errors'].values()):7d}  {'yes' if result['saturated'] else 'no'}\n"
+        )
+    saturation = report["results"].get("saturation", {})
+    stream.write(
+        f"max sustained: {saturation.get('max_sustained_offered_per_s')} events/s, "
+        f"saturated at: {saturation.get('saturated_at_offered_per_s')} events/s\n"
+    )
+
+
+async def run_steps(args, workdir: str) -> dict:
+    results = {}
+    sustained = None
+    saturated_at = None
+    for index, rate in enumerate(args.rates):
+        step = SurgeStep(args, workdir, rate, seed=args.seed + index)
+        result = await step.run()
+        results[f"step.{rate:g}"] = result
+        if not result["saturated"]:
+            sustained = result["offered_per_s"]
+        elif saturated_at is None:
+            saturated_at = result["offered_per_s"]
+            if not args.all_steps:
+                break
+    results["saturation"] = summarize(
+        [],
+        max_sustained_offered_per_s=sustained,
+        saturated_at_offered_per_s=saturated_at,
+        slo_ms=args.slo_ms,
+    )
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Drive the bot's DM, ticket-menu and %r handlers with a synthetic surge.")
+    parser.add_argument("-o", "--output", default=None, help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Print mean-latency changes against an earlier report")
+    parser.add_argument("--quick", action="store_true", help="Short steps at a few rates for a smoke run")
+    parser.add_argument("--rates", type=float, nargs="+", default=[10, 25, 50, 100, 200, 400, 800], help="DMs per second, one step each")
+    parser.add_argument("--select-ratio", type=float, default=0.2, help="Ticket-menu selections per DM")
+    parser.add_argument("--reply-ratio", type=float, default=0.4, help="Staff %%r replies per DM")
+    parser.add_argument("--new-user-ratio", type=float, default=0.4, help="Share of DMs from users without a ticket")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of arrivals per step")
+    parser.add_argument("--drain-timeout", type=float, default=30.0, help="Seconds to wait for queued handlers after arrivals stop")
+    parser.add_argument("--slo-ms", type=float, default=2000.0, help="p99 latency above which a step counts as saturated")
+    parser.add_argument("--all-steps", action="store_true", help="Keep going after the first saturated step")
+    parser.add_argument("--users", type=int, default=300, help="Users with an open ticket at the start of each step")
+    parser.add_argument("--newcomers", type=int, default=2000, help="Users without a ticket who may DM in")
+    parser.add_argument("--staff", type=int, default=10)
+    parser.add_argument("--db-latency-ms", type=float, default=1.0, help="Simulated blocking MySQL round trip")
+    parser.add_argument("--http-latency-ms", type=float, default=50.0, help="Simulated Discord REST round trip")
+    parser.add_argument("--sample-interval-ms", type=float, default=50.0, help="Queue-depth / loop-lag sampling period")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.rates, args.duration, args.drain_timeout = [10, 50, 200], 3.0, 10.0
+        args.users, args.newcomers = 100, 500
+
+    logging.basicConfig(level=logging.ERROR, format="%(levelname)s %(name)s: %(message)s", stream=sys.stderr)
+    with tempfile.TemporaryDirectory(prefix="modmail-surge-") as workdir:
+        results = asyncio.run(run_steps(args, workdir))
+
+    params = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+    report = build_report("dm_surge", results, params)
+    write_report(report, args.output)
+    print_steps(report)
+    if args.compare:
+        sys.stderr.write("\n".join(compare(report, args.compare)) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1048 @@
+"""
+Offline stand-ins for the Discord and MySQL layers the bot talks to.
+
+`FakeDiscord` is a tiny in-process "world": one guild with ticket categories,
+users/members, text and DM channels, and an HTTP layer that only counts calls and
+optionally sleeps to simulate REST round trips. Channel classes subclass the real
+discord.py types so the bot's `isinstance` checks still pass.
+
+`FakeMySQLConnection` speaks enough of the mysql.connector connection/cursor API
+for `DatabaseManager(bot, conn=...)`. The tables the hot paths use (tickets, timers,
+watchers, transcripts, notes, staff activity and roster, live snapshots) are kept in memory;
+schema statements are no-ops, and any other statement raises so a changed query
+can't silently turn into a free one. `latency` blocks the caller like a real
+round trip would.
+"""
+import asyncio
+import io
+import itertools
+import logging
+import re
+import time
+from datetime import datetime, timedelta, timezone
+
+import discord
+import mysql.connector
+from discord.ext import commands
+from mysql.connector import errorcode
+
+from bot_metrics import BotMetrics
+from database_manager import DatabaseManager
+
+DISCORD_EPOCH_MS = 1420070400000
+
+
+def snowflake_at(when: datetime, sequence: int = 0) -> int:
+    return ((int(when.timestamp() * 1000) - DISCORD_EPOCH_MS) << 22) | (sequence & 0x3FFFFF)
+
+
+# ---------------- Discord objects ----------------
+
+
+class FakeAsset:
+    def __init__(self, url: str):
+        self.url = url
+
+    def __str__(self):
+        return self.url
+
+
+class FakePermissions:
+    def __init__(self, manage_channels=False, manage_messages=False, administrator=False):
+        self.manage_channels = manage_channels
+        self.manage_messages = manage_messages
+        self.administrator = administrator
+
+
+class FakeRole:
+    def __init__(self, role_id: int, name: str):
+        self.id = role_id
+        self.name = name
+        self.mention = f"<@&{role_id}>"
+
+
+class FakeUser:
+    """Doubles as a guild Member: carries roles and guild_permissions."""
+
+    def __init__(self, world, user_id: int, name: str, *, bot=False, permissions=None, roles=()):
+        self.world = world
+        self.id = user_id
+        self.name = name
+        self.global_name = None
+        self.display_name = name
+        self.discriminator = "0"
+        self.bot = bot
+        self.guild_permissions = permissions or FakePermissions()
+        self.roles = list(roles)
+        self.display_avatar = FakeAsset(f"https://cdn.discordapp.com/embed/avatars/{user_id % 6}.png")
+        self.avatar = self.display_avatar
+        self.created_at = datetime(2022, 1, 1, tzinfo=timezone.utc)
+        self.joined_at = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        self._dm_channel = None
+
+    @property
+    def mention(self):
+        return f"<@{self.id}>"
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return f"<FakeUser id={self.id} name={self.name!r}>"
+
+    @property
+    def dm_channel(self):
+        if self._dm_channel is None:
+            self._dm_channel = FakeDMChannel(self.world, self)
+        return self._dm_channel
+
+    async def create_dm(self):
+        return self.dm_channel
+
+    async def send(self, *args, **kwargs):
+        return await self.dm_channel.send(*args, **kwargs)
+
+
+class FakeAttachment:
+    def __init__(self, attachment_id: int, filename: str, content_type: str, size: int = 2048):
+        self.id = attachment_id
+        self.filename = filename
+        self.content_type = content_type
+        self.size = size
+        self.url = f"https://cdn.discordapp.com/attachments/0/{attachment_id}/{filename}"
+
+    async def to_file(self):
+        return discord.File(io.BytesIO(b"\0" * self.size), filename=self.filename)
+
+
+class FakeMessage:
+    def __init__(self, world, channel, author, content: str = "", *, embeds=(), attachments=(), created_at=None, message_id=None):
+        self.world = world
+        self.created_at = created_at or datetime.now(timezone.utc)
+        self.id = message_id or world.snowflake(self.created_at)
+        self.channel = channel
+        self.guild = getattr(channel, "guild", None)
+        self.author = author
+        self.content = content
+        self.embeds = list(embeds)
+        self.attachments = list(attachments)
+        self.mentions = []
+        self.reference = None
+        self._state = None
+
+    @property
+    def clean_content(self):
+        return self.content
+
+    async def edit(self, **kwargs):
+        await self.world.http("edit_message")
+        if "content" in kwargs:
+            self.content = kwargs["content"] or ""
+        if kwargs.get("embed") is not None:
+            self.embeds = [kwargs["embed"]]
+        return self
+
+    async def delete(self):
+        await self.world.http("delete_message")
+
+    async def add_reaction(self, emoji):
+        await self.world.http("add_reaction")
+
+
+class _Typing:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeMessageable:
+    """send/history/typing for the fake channel types, backed by `self.messages`."""
+
+    async def send(self, content=None, *, embed=None, embeds=None, file=None, files=None, view=None, **kwargs):
+        await self.world.http("send_message")
+        message = FakeMessage(
+            self.world,
+            self,
+            self.world.bot_user,
+            content or "",
+            embeds=[embed] if embed is not None else (embeds or ()),
+        )
+        if self.world.keep_sent_messages:
+            self.messages.append(message)
+        return message
+
+    async def history(self, limit=None, oldest_first=False, before=None, after=None):
+        messages = self.messages if oldest_first else list(reversed(self.messages))
+        for index, message in enumerate(messages):
+            if limit is not None and index >= limit:
+                break
+            # Real history() pages 100 messages per REST call.
+            if index % 100 == 0:
+                await self.world.http("get_messages")
+            yield message
+
+    async def fetch_message(self, message_id: int):
+        await self.world.http("get_message")
+        for message in self.messages:
+            if message.id == message_id:
+                return message
+        raise discord.NotFound(_FakeResponse(404), "Unknown Message")
+
+    def typing(self):
+        return _Typing()
+
+
+class _FakeResponse:
+    def __init__(self, status: int):
+        self.status = status
+        self.reason = "Not Found"
+
+
+class FakeDMChannel(_FakeMessageable, discord.DMChannel):
+    def __init__(self, world, recipient: FakeUser):
+        self.world = world
+        self.id = world.snowflake()
+        self._recipient = recipient
+        self.me = world.bot_user
+        self._state = None
+        self.messages = []
+
+    @property
+    def recipient(self):
+        return self._recipient
+
+    @property
+    def recipients(self):
+        return [self._recipient]
+
+    def __repr__(self):
+        return f"<FakeDMChannel id={self.id} recipient={self._recipient!r}>"
+
+
+class FakeCategoryChannel(discord.CategoryChannel):
+    def __init__(self, world, guild, category_id: int, name: str):
+        self.world = world
+        self.guild = guild
+        self.id = category_id
+        self.name = name
+        self.position = 0
+        self.nsfw = False
+        self.category_id = None
+        self._state = None
+
+    @property
+    def text_channels(self):
+        return [channel for channel in self.guild.text_channels if channel.category_id == self.id]
+
+    @property
+    def channels(self):
+        return self.text_channels
+
+    def __repr__(self):
+        return f"<FakeCategoryChannel id={self.id} name={self.name!r}>"
+
+
+class FakeTextChannel(_FakeMessageable, discord.TextChannel):
+    def __init__(self, world, guild, channel_id: int, name: str, *, category=None, topic=None):
+        self.world = world
+        self.guild = guild
+        self.id = channel_id
+        self.name = name
+        self.topic = topic
+        self.category_id = category.id if category is not None else None
+        self.position = 0
+        self.nsfw = False
+        self._state = None
+        self.messages = []
+
+    @property
+    def category(self):
+        return self.guild.get_channel(self.category_id) if self.category_id else None
+
+    @property
+    def mention(self):
+        return f"<#{self.id}>"
+
+    def __repr__(self):
+        return f"<FakeTextChannel id={self.id} name={self.name!r}>"
+
+    async def edit(self, **kwargs):
+        await self.world.http("edit_channel")
+        for key in ("name", "topic"):
+            if key in kwargs:
+                setattr(self, key, kwargs[key])
+        if "category" in kwargs:
+            self.category_id = kwargs["category"].id if kwargs["category"] is not None else None
+        return self
+
+    async def set_permissions(self, target, **kwargs):
+        await self.world.http("edit_channel_permissions")
+
+    async def delete(self, reason=None):
+        await self.world.http("delete_channel")
+        self.guild.remove_channel(self)
+
+
+class FakeGuild:
+    def __init__(self, world, guild_id: int, name: str):
+        self.world = world
+        self.id = guild_id
+        self.name = name
+        self._channels = {}
+        self._members = {}
+        self._members_by_name = {}
+        self._roles = {}
+        self.default_role = FakeRole(guild_id, "@everyone")
+
+    @property
+    def text_channels(self):
+        return [channel for channel in self._channels.values() if isinstance(channel, FakeTextChannel)]
+
+    @property
+    def categories(self):
+        return [channel for channel in self._channels.values() if isinstance(channel, FakeCategoryChannel)]
+
+    @property
+    def members(self):
+        return list(self._members.values())
+
+    @property
+    def roles(self):
+        return list(self._roles.values())
+
+    @property
+    def me(self):
+        return self.world.bot_user
+
+    def get_channel(self, channel_id):
+        return self._channels.get(channel_id)
+
+    def get_member(self, user_id):
+        return self._members.get(user_id)
+
+    def get_member_named(self, name):
+        return self._members_by_name.get(name)
+
+    def get_role(self, role_id):
+        return self._roles.get(role_id)
+
+    def add_member(self, member: FakeUser):
+        self._members[member.id] = member
+        self._members_by_name[member.name] = member
+
+    def add_role(self, role: FakeRole):
+        self._roles[role.id] = role
+
+    def add_channel(self, channel):
+        self._channels[channel.id] = channel
+        self.world.channels[channel.id] = channel
+        return channel
+
+    def remove_channel(self, channel):
+        self._channels.pop(channel.id, None)
+        self.world.channels.pop(channel.id, None)
+
+    async def create_text_channel(self, name, *, category=None, topic=None, overwrites=None, **kwargs):
+        await self.world.http("create_channel")
+        return self.add_channel(FakeTextChannel(self.world, self, self.world.snowflake(), name, category=category, topic=topic))
+
+    async def fetch_member(self, user_id):
+        await self.world.http("get_member")
+        member = self._members.get(user_id)
+        if member is None:
+            raise discord.NotFound(_FakeResponse(404), "Unknown Member")
+        return member
+
+
+class FakeDiscord:
+    """
+    The mocked gateway/REST side: owns the guild, users and channels and counts every
+    REST call by route. `http_latency` (seconds) is awaited per call; 0 still yields
+    to the event loop once, like a real request does.
+    """
+
+    def __init__(self, guild_id: int, guild_name: str = "Benchmark Guild", http_latency: float = 0.0, keep_sent_messages: bool = True):
+        self.http_latency = http_latency
+        self.keep_sent_messages = keep_sent_messages
+        self.http_calls = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.users = {}
+        self.channels = {}
+        self._sequence = itertools.count(1)
+        # The production bot runs with administrator, which the transcript code keys roles on.
+        self.bot_user = FakeUser(self, self.snowflake(), "Modmail", bot=True, permissions=FakePermissions(administrator=True))
+        self.guild = FakeGuild(self, guild_id, guild_name)
+
+    def snowflake(self, when: datetime = None) -> int:
+        return snowflake_at(when or datetime.now(timezone.utc), next(self._sequence))
+
+    async def http(self, route: str):
+        self.http_calls[route] = self.http_calls.get(route, 0) + 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.http_latency)
+        finally:
+            self.in_flight -= 1
+
+    def reset_counters(self):
+        self.http_calls = {}
+        self.max_in_flight = 0
+
+    def add_category(self, category_id: int, name: str) -> FakeCategoryChannel:
+        return self.guild.add_channel(FakeCategoryChannel(self, self.guild, category_id, name))
+
+    def add_user(self, name: str, *, member=True, permissions=None, roles=(), user_id=None) -> FakeUser:
+        user = FakeUser(self, user_id or self.snowflake(), name, permissions=permissions, roles=roles)
+        self.users[user.id] = user
+        if member:
+            self.guild.add_member(user)
+        return user
+
+    def add_staff(self, name: str, roles=()) -> FakeUser:
+        permissions = FakePermissions(manage_channels=True, manage_messages=True)
+        return self.add_user(name, permissions=permissions, roles=roles)
+
+    def add_ticket_channel(self, owner: FakeUser, category: FakeCategoryChannel) -> FakeTextChannel:
+        return self.guild.add_channel(
+            FakeTextChannel(
+                self,
+                self.guild,
+                self.snowflake(),
+                f"dx-{owner.name}",
+                category=category,
+                topic=f"Ticket for {owner.name} ({owner.id})",
+            )
+        )
+
+    def dm(self, user: FakeUser, content: str, attachments=(), created_at=None) -> FakeMessage:
+        """A DM as the gateway would deliver it to on_message."""
+        return FakeMessage(self, user.dm_channel, user, content, attachments=attachments, created_at=created_at)
+
+
+# ---------------- Interactions ----------------
+
+
+class FakeInteractionResponse:
+    def __init__(self, interaction):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self):
+        return self._done
+
+    async def send_message(self, content=None, *, embed=None, embeds=None, view=None, ephemeral=False, **kwargs):
+        if self._done:
+            raise discord.InteractionResponded(self._interaction)
+        await self._interaction.world.http("interaction_response")
+        self._done = True
+
+    async def defer(self, **kwargs):
+        if self._done:
+            raise discord.InteractionResponded(self._interaction)
+        await self._interaction.world.http("interaction_response")
+        self._done = True
+
+
+class FakeFollowup:
+    def __init__(self, interaction):
+        self._interaction = interaction
+
+    async def send(self, content=None, *, embed=None, embeds=None, ephemeral=False, **kwargs):
+        world = self._interaction.world
+        await world.http("webhook_send")
+        return FakeMessage(world, self._interaction.channel, world.bot_user, content or "", embeds=[embed] if embed is not None else (embeds or ()))
+
+
+class FakeInteraction:
+    """A component interaction on `message` (e.g. the welcome menu in a user's DMs)."""
+
+    def __init__(self, world, client, user: FakeUser, message: FakeMessage, guild=None):
+        self.world = world
+        self.client = client
+        self.user = user
+        self.message = message
+        self.channel = message.channel
+        self.guild = guild
+        self.id = world.snowflake()
+        self.created_at = datetime.now(timezone.utc)
+        self.response = FakeInteractionResponse(self)
+        self.followup = FakeFollowup(self)
+
+
+async def deliver(bot, event: str, *args) -> list:
+    """
+    Run `on_<event>` and every cog listener for it concurrently, as Client.dispatch
+    would, and wait for all of them. Returns the exceptions they raised.
+    """
+    name = f"on_{event}"
+    handlers = []
+    if hasattr(bot, name):
+        handlers.append(getattr(bot, name))
+    handlers.extend(bot.extra_events.get(name, ()))
+    results = await asyncio.gather(*(handler(*args) for handler in handlers), return_exceptions=True)
+    return [result for result in results if isinstance(result, BaseException)]
+
+
+# ---------------- MySQL stand-in ----------------
+
+
+def _normalize_sql(query: str) -> str:
+    return re.sub(r"\s*([=,])\s*", r"\1", " ".join(query.split()))
+
+
+# Statements accepted without touching the in-memory tables.
+_NO_OP_STATEMENTS = (
+    r"^CREATE (?:TABLE|INDEX|UNIQUE INDEX) ",
+    r"^ALTER TABLE ",
+)
+
+
+class FakeTicketStore:
+    """In-memory rows for the tables the bot's hot paths read and write."""
+
+    def __init__(self):
+        self.tickets = {}
+        self.open_by_user = {}
+        self.timers = {}
+        self.watchers = {}
+        self.transcripts = {}
+        self.saved_transcripts = []
+        self.notes = {}
+        self.staff_ticket_activity = {}
+        self.staff_metrics = {}
+        self.live_messages = {}
+        self.roster = {}
+        self.rollup_state = {}
+        self.statements = 0
+        self.staff_activity_writes = 0
+        self._unhandled = set()
+        self._no_ops = [re.compile(pattern, re.IGNORECASE) for pattern in _NO_OP_STATEMENTS]
+        self._handlers = [
+            (re.compile(pattern, re.IGNORECASE), getattr(self, name))
+            for pattern, name in (
+                (r"^INSERT INTO active_tickets", "_insert_ticket"),
+                (r"^SELECT channel_id FROM active_tickets WHERE user_id=%s AND category_id=%s AND status='open'", "_open_channel_in_category"),
+                (r"^SELECT channel_id FROM active_tickets WHERE user_id=%s AND status='open'", "_open_channel"),
+                (r"^SELECT (?:\*|mod_id) FROM active_tickets WHERE channel_id=%s AND status='open'", "_open_ticket_row"),
+                (r"^SELECT channel_id,mod_id FROM active_tickets WHERE user_id=%s AND status='open'", "_open_rows_for_user"),
+                (r"^SELECT COUNT\(\*\) AS n FROM active_tickets WHERE status='open'", "_count_open"),
+                (r"^UPDATE active_tickets SET status='closed',closed_at=%s WHERE channel_id=%s", "_close_by_channel"),
+                (r"^UPDATE active_tickets SET status='closed',closed_at=NOW\(\) WHERE user_id=%s", "_close_by_user"),
+                (r"^UPDATE active_tickets SET mod_id=%s,mod_username=%s WHERE channel_id=%s", "_assign_mod"),
+                (r"^INSERT INTO ticket_timers", "_insert_timer"),
+                (r"^DELETE FROM ticket_timers WHERE channel_id=%s AND action=%s", "_delete_timer"),
+                (r"^SELECT \* FROM ticket_timers WHERE status='pending'", "_pending_timers"),
+                (r"^SELECT COUNT\(\*\) AS n FROM ticket_timers WHERE status='pending'", "_count_timers"),
+                (r"^INSERT IGNORE INTO ticket_watchers", "_insert_watcher"),
+                (r"^SELECT mod_id FROM ticket_watchers WHERE channel_id=%s", "_watchers"),
+                (r"^DELETE FROM ticket_watchers WHERE channel_id=%s AND mod_id=%s", "_delete_watcher"),
+                (r"^INSERT INTO ticket_transcripts", "_insert_transcript"),
+                (r"^SELECT id,channel_id,closed_by,transcript_json FROM ticket_transcripts WHERE id > %s ORDER BY id LIMIT %s", "_saved_transcripts_after"),
+                (r"^INSERT INTO user_notes", "_insert_note"),
+                (r"^SELECT id,user_id,note,staff,created_at FROM user_notes WHERE user_id=%s", "_user_notes"),
+                (r"^SELECT staff_id,replies,closed FROM staff_ticket_activity WHERE channel_id=%s", "_staff_ticket_rows"),
+                (r"^DELETE FROM staff_ticket_activity WHERE channel_id=%s", "_delete_staff_ticket_rows"),
+                (r"^INSERT INTO staff_ticket_activity", "_insert_staff_ticket_row"),
+                (r"^INSERT INTO staff_activity_metrics \(staff_id,replies,tickets_handled,closes\)", "_add_staff_activity"),
+                (r"^INSERT INTO staff_activity_metrics \(staff_id,assigned_open,assigned_closed\)", "_add_assignment"),
+                (r"^SELECT user_id FROM staff_roster WHERE username=%s", "_roster_user_id"),
+                (r"^SELECT 1 FROM ticket_rollup_state WHERE name='staff_activity_backfill'", "_backfill_state"),
+                (r"^INSERT INTO ticket_rollup_state \(name,last_day\) VALUES \('staff_activity_backfill'", "_mark_backfill_done"),
+                (r"^INSERT IGNORE INTO ticket_live_messages", "_insert_live_message"),
+                (r"^DELETE FROM ticket_live_messages WHERE channel_id=%s", "_clear_live_messages"),
+                (r"^DELETE live FROM ticket_live_messages", "_prune_live_messages"),
+            )
+        ]
+
+    def execute(self, query: str, params):
+        """Returns (rows, rowcount). Raises NotImplementedError for statements it doesn't model."""
+        self.statements += 1
+        sql = _normalize_sql(query)
+        for pattern, handler in self._handlers:
+            if pattern.match(sql):
+                return handler(tuple(params or ()))
+        if any(pattern.match(sql) for pattern in self._no_ops):
+            return [], 0
+        if sql not in self._unhandled:
+            # The bot swallows most DB errors into warnings; make sure this one is seen.
+            self._unhandled.add(sql)
+            logging.getLogger("modmail.bench").error("FakeTicketStore has no handler for: %s", sql)
+        raise NotImplementedError(f"FakeTicketStore has no handler for: {sql}")
+
+    # ---- seeding ----
+
+    def open_ticket(self, channel_id: int, user_id: int, category_id: int = None, mod_id: int = None, ticket_type: str = "contact"):
+        self.tickets[channel_id] = {
+            "channel_id": channel_id,
+            "user_id": user_id,
+            "member_username": str(user_id),
+            "mod_username": None,
+            "category_id": category_id,
+            "channel_name": f"dx-{user_id}",
+            "created_at": datetime.now(),
+            "closed_at": None,
+            "status": "open",
+            "ticket_type": ticket_type,
+            "mod_id": mod_id,
+        }
+        self.open_by_user[user_id] = channel_id
+
+    def add_timer(self, channel_id: int, user_id: int, action: str, execute_at):
+        self.timers[(channel_id, action)] = {
+            "channel_id": channel_id,
+            "user_id": user_id,
+            "action": action,
+            "execute_at": execute_at,
+            "status": "pending",
+        }
+
+    def add_saved_transcript(self, channel_id: int, transcript_json: str, closed_by: str = "System"):
+        """A ticket_transcripts row from before the activity tables, for the staff activity backfill."""
+        self.saved_transcripts.append({
+            "id": len(self.saved_transcripts) + 1,
+            "channel_id": channel_id,
+            "closed_by": closed_by,
+            "transcript_json": transcript_json,
+        })
+
+    def add_roster_member(self, user_id: int, username: str):
+        self.roster[user_id] = username
+
+    # ---- active_tickets ----
+
+    def _insert_ticket(self, params):
+        channel_id, user_id, member_username, mod_username, category_id, channel_name, status, ticket_type, mod_id = params
+        if status == "open" and user_id in self.open_by_user:
+            raise mysql.connector.IntegrityError(msg="Duplicate entry for uq_active_tickets_one_open_per_user", errno=errorcode.ER_DUP_ENTRY)
+        self.open_ticket(channel_id, user_id, category_id, mod_id, ticket_type)
+        self.tickets[channel_id].update(member_username=member_username, mod_username=mod_username, channel_name=channel_name)
+        return [], 1
+
+    def _open_channel(self, params):
+        channel_id = self.open_by_user.get(params[0])
+        return ([{"channel_id": channel_id}] if channel_id else []), 0
+
+    def _open_channel_in_category(self, params):
+        channel_id = self.open_by_user.get(params[0])
+        if channel_id and self.tickets[channel_id]["category_id"] == params[1]:
+            return [{"channel_id": channel_id}], 0
+        return [], 0
+
+    def _open_ticket_row(self, params):
+        row = self.tickets.get(params[0])
+        return ([dict(row)] if row and row["status"] == "open" else []), 0
+
+    def _open_rows_for_user(self, params):
+        channel_id = self.open_by_user.get(params[0])
+        row = self.tickets.get(channel_id)
+        return ([{"channel_id": channel_id, "mod_id": row["mod_id"]}] if row else []), 0
+
+    def _count_open(self, params):
+        return [{"n": len(self.open_by_user)}], 0
+
+    def _close(self, row, closed_at):
+        row["status"] = "closed"
+        row["closed_at"] = closed_at
+        if self.open_by_user.get(row["user_id"]) == row["channel_id"]:
+            del self.open_by_user[row["user_id"]]
+
+    def _close_by_channel(self, params):
+        closed_at, channel_id = params
+        row = self.tickets.get(channel_id)
+        if row is None:
+            return [], 0
+        self._close(row, closed_at)
+        return [], 1
+
+    def _close_by_user(self, params):
+        channel_id = self.open_by_user.get(params[0])
+        if channel_id is None:
+            return [], 0
+        self._close(self.tickets[channel_id], datetime.now())
+        return [], 1
+
+    def _assign_mod(self, params):
+        mod_id, mod_username, channel_id = params
+        row = self.tickets.get(channel_id)
+        if row is None or row["status"] != "open":
+            return [], 0
+        row.update(mod_id=mod_id, mod_username=mod_username)
+        return [], 1
+
+    # ---- ticket_timers ----
+
+    def _insert_timer(self, params):
+        self.add_timer(*params)
+        return [], 1
+
+    def _delete_timer(self, params):
+        return [], 1 if self.timers.pop(tuple(params), None) else 0
+
+    def _pending_timers(self, params):
+        return [dict(row) for row in self.timers.values() if row["status"] == "pending"], 0
+
+    def _count_timers(self, params):
+        return [{"n": sum(1 for row in self.timers.values() if row["status"] == "pending")}], 0
+
+    # ---- ticket_watchers ----
+
+    def _insert_watcher(self, params):
+        watchers = self.watchers.setdefault(params[0], set())
+        if params[1] in watchers:
+            return [], 0
+        watchers.add(params[1])
+        return [], 1
+
+    def _watchers(self, params):
+        return [{"mod_id": mod_id} for mod_id in self.watchers.get(params[0], ())], 0
+
+    def _delete_watcher(self, params):
+        watchers = self.watchers.get(params[0], set())
+        if params[1] not in watchers:
+            return [], 0
+        watchers.discard(params[1])
+        return [], 1
+
+    # ---- ticket_transcripts ----
+
+    def _insert_transcript(self, params):
+        # Keep only the size; holding every transcript JSON would skew memory-heavy runs.
+        self.transcripts[params[0]] = len(params[-1] or "")
+        return [], 1
+
+    def _saved_transcripts_after(self, params):
+        after_id, limit = params
+        return [dict(row) for row in self.saved_transcripts if row["id"] > after_id][:limit], 0
+
+    # ---- user_notes ----
+
+    def _insert_note(self, params):
+        user_id, note, staff = params
+        notes = self.notes.setdefault(user_id, [])
+        notes.append({"id": len(notes) + 1, "user_id": user_id, "note": note, "staff": staff, "created_at": datetime.now()})
+        return [], 1
+
+    def _user_notes(self, params):
+        return [dict(row) for row in reversed(self.notes.get(params[0], ()))], 0
+
+    # ---- staff activity ----
+
+    def _staff_ticket_rows(self, params):
+        return [
+            {"staff_id": staff_id, "replies": replies, "closed": closed}
+            for (channel_id, staff_id), (replies, closed) in self.staff_ticket_activity.items()
+            if channel_id == params[0]
+        ], 0
+
+    def _delete_staff_ticket_rows(self, params):
+        keys = [key for key in self.staff_ticket_activity if key[0] == params[0]]
+        for key in keys:
+            del self.staff_ticket_activity[key]
+        self.staff_activity_writes += 1
+        return [], len(keys)
+
+    def _insert_staff_ticket_row(self, params):
+        channel_id, staff_id, replies, closed = params
+        self.staff_ticket_activity[(channel_id, staff_id)] = (replies, closed)
+        self.staff_activity_writes += 1
+        return [], 1
+
+    def _staff_metrics_row(self, staff_id):
+        return self.staff_metrics.setdefault(
+            staff_id, {"replies": 0, "tickets_handled": 0, "closes": 0, "assigned_open": 0, "assigned_closed": 0}
+        )
+
+    def _add_staff_activity(self, params):
+        staff_id, replies, handled, closes = params
+        row = self._staff_metrics_row(staff_id)
+        row["replies"] += replies
+        row["tickets_handled"] += handled
+        row["closes"] += closes
+        self.staff_activity_writes += 1
+        return [], 1
+
+    def _add_assignment(self, params):
+        staff_id, open_delta, closed_delta = params
+        row = self._staff_metrics_row(staff_id)
+        row["assigned_open"] = max(row["assigned_open"] + open_delta, 0)
+        row["assigned_closed"] += closed_delta
+        self.staff_activity_writes += 1
+        return [], 1
+
+    def _roster_user_id(self, params):
+        return [{"user_id": user_id} for user_id, username in self.roster.items() if username == params[0]][:1], 0
+
+    def _backfill_state(self, params):
+        return ([{"1": 1}] if "staff_activity_backfill" in self.rollup_state else []), 0
+
+    def _mark_backfill_done(self, params):
+        self.rollup_state["staff_activity_backfill"] = datetime.now().date()
+        return [], 1
+
+    # ---- ticket_live_messages ----
+
+    def _insert_live_message(self, params):
+        message_id, channel_id, message_json = params
+        messages = self.live_messages.setdefault(channel_id, {})
+        if message_id in messages:
+            return [], 0
+        # Size only, as for transcripts.
+        messages[message_id] = len(message_json)
+        return [], 1
+
+    def _clear_live_messages(self, params):
+        return [], len(self.live_messages.pop(params[0], {}))
+
+    def _prune_live_messages(self, params):
+        closed = [
+            channel_id for channel_id in self.live_messages
+            if self.tickets.get(channel_id, {}).get("status") == "closed"
+        ]
+        return [], sum(len(self.live_messages.pop(channel_id)) for channel_id in closed)
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self._rows = []
+        self.rowcount = -1
+        self.lastrowid = None
+
+    def execute(self, query, params=None):
+        self.connection.round_trip()
+        rows, rowcount = self.connection.store.execute(query, params)
+        self._rows = list(rows)
+        self.rowcount = rowcount if not rows else len(rows)
+
+    def executemany(self, query, seq_params):
+        self.connection.round_trip()
+        total = 0
+        for params in seq_params:
+            _, rowcount = self.connection.store.execute(query, params)
+            total += rowcount
+        self._rows = []
+        self.rowcount = total
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchmany(self, size=1):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def close(self):
+        self._rows = []
+
+
+class FakeMySQLConnection:
+    """mysql.connector-shaped connection over a FakeTicketStore; `latency` seconds block per statement."""
+
+    def __init__(self, store: FakeTicketStore = None, latency: float = 0.0):
+        self.store = store or FakeTicketStore()
+        self.latency = latency
+        self.connection_id = 1
+        self.round_trips = 0
+
+    def round_trip(self):
+        self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def cursor(self, dictionary=True, buffered=True):
+        return FakeCursor(self)
+
+    def ping(self, reconnect=True, attempts=1, delay=0):
+        self.round_trip()
+
+    def is_connected(self):
+        return True
+
+    def commit(self):
+        self.round_trip()
+
+    def rollback(self):
+        self.round_trip()
+
+    def close(self):
+        pass
+
+
+# ---------------- Bot ----------------
+
+
+def _make_bench_bot_class():
+    # Imported lazily: bot.py pulls in the whole bot (config, cogs' dependencies).
+    from bot import ModmailBot
+
+    class BenchContext(commands.Context):
+        """Context whose replies go through the fake channel instead of discord.py's HTTP client."""
+
+        async def send(self, content=None, **kwargs):
+            kwargs.pop("reference", None)
+            kwargs.pop("mention_author", None)
+            return await self.channel.send(content, **kwargs)
+
+        async def reply(self, content=None, **kwargs):
+            return await self.send(content, **kwargs)
+
+    class BenchBot(ModmailBot):
+        """
+        ModmailBot wired to a FakeDiscord world and a fake DB. Skips ModmailBot.__init__
+        (config cache, MySQL, SQLite indexes) but keeps discord.py's command machinery,
+        so cogs and `%` commands work offline.
+        """
+
+        def __init__(self, world: FakeDiscord, conn: FakeMySQLConnection, search_index=None, transcript_catalog=None, note_manager=None):
+            intents = discord.Intents.default()
+            intents.members = True
+            intents.message_content = True
+            commands.Bot.__init__(self, command_prefix="%", intents=intents, help_command=None)
+            self.world = world
+            self.confirmed_users = set()
+            self.guild_id = world.guild.id
+            self.metrics = BotMetrics()
+            self._metrics_tasks_started = True
+            self.db = self.metrics.instrument(DatabaseManager(self, conn=conn))
+            self.search_index = search_index
+            self.transcript_catalog = transcript_catalog
+            self.note_manager = note_manager
+            self.event_recorder = None
+            self._bench_closed = False
+            try:
+                # Client.dispatch schedules on self.loop, which discord.py only sets at login.
+                self.loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+
+        async def get_context(self, origin, *, cls=BenchContext):
+            return await super().get_context(origin, cls=cls)
+
+        @property
+        def user(self):
+            return self.world.bot_user
+
+        def get_channel(self, channel_id):
+            return self.world.channels.get(channel_id)
+
+        def get_user(self, user_id):
+            return self.world.users.get(user_id)
+
+        def get_guild(self, guild_id):
+            return self.world.guild if guild_id == self.world.guild.id else None
+
+        @property
+        def guilds(self):
+            return [self.world.guild]
+
+        async def fetch_user(self, user_id):
+            await self.world.http("get_user")
+            return self.world.users.get(user_id)
+
+        async def fetch_channel(self, channel_id):
+            await self.world.http("get_channel")
+            channel = self.world.channels.get(channel_id)
+            if channel is None:
+                raise discord.NotFound(_FakeResponse(404), "Unknown Channel")
+            return channel
+
+        async def wait_until_ready(self):
+            return None
+
+        def is_closed(self):
+            return self._bench_closed
+
+        def is_ready(self):
+            return True
+
+    return BenchBot
+
+
+_bench_bot_class = None
+
+
+def make_bench_bot(world: FakeDiscord, conn: FakeMySQLConnection = None, **kwargs):
+    global _bench_bot_class
+    if _bench_bot_class is None:
+        _bench_bot_class = _make_bench_bot_class()
+    return _bench_bot_class(world, conn or FakeMySQLConnection(), **kwargs)
+
+
+async def load_cogs(bot, names=("cogs.modmail", "cogs.staff_commands")):
+    """
+    Add the given cogs (their commands and listeners) to a bench bot. Calls each
+    module's setup() directly: load_extension re-executes the module, which would
+    undo any module-level patching a benchmark has done.
+    """
+    import importlib
+
+    for name in names:
+        await importlib.import_module(name).setup(bot)
+
+
+def seed_world(world: FakeDiscord, category_ids: dict, users: int, staff: int = 5, open_tickets: int = None):
+    """
+    Populate `world` with ticket categories, `users` members and `staff` staff members.
+    The first `open_tickets` users (default: all) get an open ticket channel. Returns
+    (users, staff_members, {user_id: channel}) for seeding the DB store to match.
+    """
+    categories = [world.add_category(category_id, key) for key, category_id in category_ids.items()]
+    staff_members = [world.add_staff(f"staff{index}") for index in range(staff)]
+    members = [world.add_user(f"user{index}") for index in range(users)]
+    open_count = users if open_tickets is None else open_tickets
+    channels = {
+        member.id: world.add_ticket_channel(member, categories[index % len(categories)])
+        for index, member in enumerate(members[:open_count])
+    }
+    return members, staff_members, channels
+
+
+def seed_store(store: FakeTicketStore, channels: dict):
+    for user_id, channel in channels.items():
+        store.open_ticket(channel.id, user_id, channel.category_id)
+
+
+def build_ticket_history(world: FakeDiscord, channel: FakeTextChannel, owner: FakeUser, staff_members, count: int, *, attachment_ratio=0.05, start=None):
+    """
+    Fill `channel.messages` with `count` messages shaped like a real ticket: relayed user
+    DMs and staff replies as bot embeds, plus a few plain staff messages and file
+    attachments. Image attachments are left out, since generate_transcript downloads those.
+    """
+    start = start or datetime.now(timezone.utc) - timedelta(days=2)
+    messages = []
+    for index in range(count):
+        created_at = start + timedelta(seconds=30 * index)
+        kind = index % 4
+        attachments = []
+        if attachment_ratio and index % max(int(1 / attachment_ratio), 1) == 0:
+            attachments.append(FakeAttachment(world.snowflake(created_at), f"log{index}.txt", "text/plain"))
+        if kind in (0, 1):
+            embed = discord.Embed(title="User Message", description=f"Message {index} from the user about their ticket.")
+            embed.set_author(name=owner.name, icon_url=owner.display_avatar.url)
+            author = world.bot_user
+            content = ""
+            embeds = [embed]
+        elif kind == 2:
+            staff = staff_members[index % len(staff_members)]
+            embed = discord.Embed(description=f"STAFF RESPONSE:\nReply {index} with some guidance for the user.")
+            embed.set_author(name=staff.name, icon_url=staff.display_avatar.url)
+            embed.set_footer(text=f"Moderator | CCACMsgCode:{world.snowflake(created_at)}")
+            author = world.bot_user
+            content = ""
+            embeds = [embed]
+        else:
+            author = staff_members[index % len(staff_members)]
+            content = f"Internal note {index}: checking logs for this user."
+            embeds = []
+        messages.append(
+            FakeMessage(world, channel, author, content, embeds=embeds, attachments=attachments, created_at=created_at)
+        )
+    channel.messages = messages
+    return messages
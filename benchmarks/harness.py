@@ -0,0 +1,160 @@
+"""
+Timing, summary and JSON report helpers shared by the benchmark scripts.
+
+A report looks like {"suite", "environment", "params", "results": {name: summary}}.
+Every summary has at least n, mean_s, p50_s, p95_s, min_s and max_s, so two reports
+can be diffed with `compare()` (or `--compare old.json` on any benchmark CLI).
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(sorted_samples, pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = (len(sorted_samples) - 1) * pct / 100
+    lower = int(index)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (index - lower)
+
+
+def summarize(samples, ops_per_sample: int = 1, **extra) -> dict:
+    """Latency summary of per-sample wall times (seconds); ops_per_s counts `ops_per_sample` per sample."""
+    ordered = sorted(samples)
+    total = sum(ordered)
+    summary = {
+        "n": len(ordered),
+        "total_s": total,
+        "mean_s": total / len(ordered) if ordered else 0.0,
+        "p50_s": percentile(ordered, 50),
+        "p95_s": percentile(ordered, 95),
+        "p99_s": percentile(ordered, 99),
+        "min_s": ordered[0] if ordered else 0.0,
+        "max_s": ordered[-1] if ordered else 0.0,
+        "ops_per_s": (len(ordered) * ops_per_sample / total) if total else 0.0,
+    }
+    summary.update(extra)
+    return summary
+
+
+def time_sync(fn, iterations: int, warmup: int = 1, setup=None):
+    """Wall time of `fn()` per iteration. `setup()` runs untimed before every call."""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def time_async(make_coro, iterations: int, warmup: int = 1, setup=None):
+    """Like time_sync for coroutines: `make_coro()` is awaited once per iteration."""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        await make_coro()
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        await make_coro()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def peak_memory(fn) -> int:
+    """Peak Python heap growth (bytes, via tracemalloc) while `fn()` runs. Run it apart from timing."""
+    import tracemalloc
+
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        fn()
+    finally:
+        peak = tracemalloc.get_traced_memory()[1]
+        if not already_tracing:
+            tracemalloc.stop()
+    return max(peak - baseline, 0)
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def environment() -> dict:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def build_report(suite: str, results: dict, params: dict = None) -> dict:
+    return {"suite": suite, "environment": environment(), "params": params or {}, "results": results}
+
+
+def write_report(report: dict, output: str = None):
+    """Write the report as JSON to `output` (or stdout when None / '-')."""
+    text = json.dumps(report, indent=2, sort_keys=True, default=str)
+    if not output or output == "-":
+        sys.stdout.write(text + "\n")
+        return
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+
+
+def compare(report: dict, baseline_path: str, metric: str = "mean_s"):
+    """Lines describing how each result's `metric` moved against a saved report."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    old_results = baseline.get("results", {})
+    lines = [f"vs {baseline_path} ({baseline.get('environment', {}).get('git_commit') or 'unknown commit'}):"]
+    for name, result in report.get("results", {}).items():
+        old = old_results.get(name, {}).get(metric)
+        new = result.get(metric)
+        if not old or new is None:
+            lines.append(f"  {name:<40} {metric}={new!s:<12} (no baseline)")
+            continue
+        change = (new - old) / old * 100
+        lines.append(f"  {name:<40} {old * 1000:10.3f} ms -> {new * 1000:10.3f} ms  {change:+7.1f}%")
+    return lines
+
+
+def print_table(report: dict, stream=sys.stderr):
+    for name, result in report.get("results", {}).items():
+        peak = f"  peak={result['peak_bytes'] / 1048576:8.1f} MiB" if "peak_bytes" in result else ""
+        stream.write(
+            f"{name:<40} n={result['n']:<5} mean={result['mean_s'] * 1000:10.3f} ms  "
+            f"p95={result['p95_s'] * 1000:10.3f} ms  ops/s={result['ops_per_s']:12.1f}{peak}\n"
+        )
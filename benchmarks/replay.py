@@ -0,0 +1,287 @@
+"""
+Replay a recorded gateway event log (see event_recorder.py) through the bot's handlers
+against benchmarks.fakes, at the recorded pace or accelerated.
+
+    python -m benchmarks.replay events.jsonl.gz -o replay.json
+    python -m benchmarks.replay events.jsonl.gz --speed 10 --http-latency-ms 80 --db-latency-ms 2
+    python -m benchmarks.replay events.jsonl.gz --speed 0 --profile replay.prof
+
+Users, channels and open tickets are created from the log as they first appear
+(pseudonymized IDs are snowflake-shaped, so topic parsing still works); message
+text is filler of the recorded length behind the recorded command word. Messages
+and typing go through on_message/on_typing and the cogs' listeners, channel deletes
+through on_guild_channel_delete, ticket-menu selections through
+TicketCategorySelect.callback and button clicks in ticket channels through the
+Claim Ticket button. `--speed 0` replays back to back with no pacing.
+
+Latency is measured from each event's scheduled replay time, per event kind.
+`--profile` wraps the run in cProfile and writes a .prof file for snakeviz / pstats.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import discord
+
+from benchmarks.fakes import (
+    FakeAttachment,
+    FakeDiscord,
+    FakeInteraction,
+    FakeMySQLConnection,
+    FakePermissions,
+    FakeRole,
+    deliver,
+    load_cogs,
+    make_bench_bot,
+)
+from benchmarks.harness import build_report, compare, percentile, print_table, summarize, write_report
+
+
+class Replayer:
+    def __init__(self, args, workdir: str):
+        import bot as bot_module
+
+        self.args = args
+        self.workdir = workdir
+        self.bot_module = bot_module
+        self.world = FakeDiscord(bot_module.GUILD_ID, http_latency=args.http_latency_ms / 1000, keep_sent_messages=False)
+        for key, category_id in bot_module.CATEGORY_IDS.items():
+            self.world.add_category(category_id, key)
+        self.conn = FakeMySQLConnection(latency=args.db_latency_ms / 1000)
+        self.bot = None
+        self.latencies = {}
+        self.errors = {}
+        self.skipped = {}
+        self.in_flight = 0
+        self.depth_samples = []
+        self.lag_samples = []
+
+    async def setup(self):
+        from note_manager import NoteManager
+        from search_index import TranscriptSearchIndex
+
+        import cogs.modmail as modmail_module
+
+        modmail_module.TRANSCRIPT_DIR = os.path.join(self.workdir, "transcripts")
+        modmail_module.IMAGE_DIR = os.path.join(self.workdir, "transcripts", "images")
+        search_index = TranscriptSearchIndex(os.path.join(self.workdir, "search.db"))
+        search_index.setup()
+        self.bot = make_bench_bot(self.world, self.conn, search_index=search_index)
+        self.bot.note_manager = NoteManager(self.bot)
+        await load_cogs(self.bot)
+
+    # ---------------- Materializing the log's entities ----------------
+
+    def user(self, entry: dict):
+        if entry.get("me"):
+            return self.world.bot_user
+        user_id = entry.get("u")
+        user = self.world.users.get(user_id)
+        if user is None:
+            roles = [FakeRole(role_id, str(role_id)) for role_id in entry.get("r", ())]
+            permissions = FakePermissions(manage_channels=True, manage_messages=True) if entry.get("mc") else None
+            user = self.world.add_user(f"user{len(self.world.users)}", user_id=user_id, roles=roles, permissions=permissions)
+            user.bot = bool(entry.get("b"))
+        return user
+
+    def channel(self, entry: dict, user=None):
+        if entry.get("dm"):
+            return (user or self.user(entry)).dm_channel
+        channel = self.world.channels.get(entry.get("ch"))
+        if channel is not None:
+            return channel
+        category = self.world.guild.get_channel(entry.get("cat")) if entry.get("cat") else None
+        if entry.get("cat") and category is None:
+            category = self.world.add_category(entry["cat"], str(entry["cat"]))
+        owner_id = entry.get("to")
+        owner = self.user({"u": owner_id}) if owner_id else None
+        channel = self.world.guild.add_channel(
+            self.world.add_ticket_channel(owner, category) if owner else self._plain_channel(entry, category)
+        )
+        # Re-key under the recorded ID so later events find the same channel.
+        self.world.guild.remove_channel(channel)
+        channel.id = entry["ch"]
+        self.world.guild.add_channel(channel)
+        if owner is not None and owner.id not in self.conn.store.open_by_user:
+            self.conn.store.open_ticket(channel.id, owner.id, channel.category_id)
+        return channel
+
+    def _plain_channel(self, entry: dict, category):
+        from benchmarks.fakes import FakeTextChannel
+
+        return FakeTextChannel(self.world, self.world.guild, entry["ch"], f"channel-{entry['ch'] % 10000}", category=category)
+
+    def message(self, entry: dict):
+        author = self.user(entry)
+        channel = self.channel(entry, author)
+        length = entry.get("n", 0)
+        command = entry.get("cmd")
+        content = f"{command} {'x' * max(length - len(command) - 1, 0)}".rstrip() if command else "x" * length
+        attachments = [
+            FakeAttachment(self.world.snowflake(), f"file{index}", content_type or None, size)
+            for index, (content_type, size) in enumerate(entry.get("at", ()))
+        ]
+        embeds = [discord.Embed(description="x" * size) for size in entry.get("em", ())]
+        message = self.world.dm(author, content, attachments=attachments)
+        message.channel = channel
+        message.guild = getattr(channel, "guild", None)
+        message.embeds = embeds
+        return message
+
+    # ---------------- Events ----------------
+
+    async def replay_event(self, entry: dict):
+        kind = entry["e"]
+        if kind == "message":
+            return await deliver(self.bot, "message", self.message(entry))
+        if kind == "typing":
+            user = self.user(entry)
+            return await deliver(self.bot, "typing", self.channel(entry, user), user, datetime.now(timezone.utc))
+        if kind == "guild_channel_delete":
+            channel = self.channel(entry)
+            # The gateway drops the channel from the cache before dispatching.
+            self.world.guild.remove_channel(channel)
+            return await deliver(self.bot, "guild_channel_delete", channel)
+        if kind == "interaction":
+            return await self._interaction(entry)
+        self.skipped[kind] = self.skipped.get(kind, 0) + 1
+        return []
+
+    async def _interaction(self, entry: dict):
+        from bot import ClaimTicketButton, TicketCategoryView
+
+        user = self.user(entry)
+        channel = self.channel(entry, user)
+        message = self.world.dm(user, "")
+        message.channel = channel
+        guild = None if entry.get("dm") else self.world.guild
+        interaction = FakeInteraction(self.world, self.bot, user, message, guild=guild)
+        values = entry.get("vs")
+        if values and values[0] in self.bot_module.CATEGORY_IDS:
+            select = TicketCategoryView().children[0]
+            # What discord.py's view store does with the interaction payload before calling back.
+            select._values = list(values)
+            await select.callback(interaction)
+        elif entry.get("ct") == discord.ComponentType.button.value and not entry.get("dm"):
+            await ClaimTicketButton(channel.id).children[0].callback(interaction)
+        else:
+            self.skipped["interaction"] = self.skipped.get("interaction", 0) + 1
+        return []
+
+    async def _handle(self, entry: dict, scheduled: float):
+        kind = entry["e"]
+        self.in_flight += 1
+        try:
+            errors = await self.replay_event(entry)
+        except Exception:
+            logging.getLogger("modmail.bench").exception("Replaying %s raised", kind)
+            errors = [True]
+        finally:
+            self.in_flight -= 1
+        self.errors[kind] = self.errors.get(kind, 0) + len(errors)
+        self.latencies.setdefault(kind, []).append(time.perf_counter() - scheduled)
+
+    async def _sample(self, interval: float):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            self.lag_samples.append(max(loop.time() - start - interval, 0.0))
+            self.depth_samples.append(self.in_flight)
+
+    async def run(self, entries) -> dict:
+        await self.setup()
+        self.world.reset_counters()
+        self.conn.round_trips = 0
+        sampler = asyncio.create_task(self._sample(0.05))
+        speed = self.args.speed
+        tasks = []
+        first = None
+        start = time.perf_counter()
+        for entry in entries:
+            if first is None:
+                first = entry["t"]
+            scheduled = start + (entry["t"] - first) / speed if speed > 0 else time.perf_counter()
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if speed > 0:
+                tasks.append(asyncio.create_task(self._handle(entry, scheduled)))
+            else:
+                await self._handle(entry, scheduled)
+        if tasks:
+            await asyncio.wait(tasks)
+        elapsed = time.perf_counter() - start
+        sampler.cancel()
+
+        results = {
+            f"replay.{kind}": summarize(samples, errors=self.errors.get(kind, 0))
+            for kind, samples in sorted(self.latencies.items())
+        }
+        all_latencies = [latency for samples in self.latencies.values() for latency in samples]
+        results["replay.all"] = summarize(
+            all_latencies,
+            events=len(all_latencies),
+            wall_s=elapsed,
+            recorded_span_s=(entries[-1]["t"] - entries[0]["t"]) if entries else 0.0,
+            speed=speed,
+            events_per_s=len(all_latencies) / elapsed if elapsed else 0.0,
+            skipped=dict(self.skipped),
+            queue_depth_max=max(self.depth_samples, default=0),
+            queue_depth_p99=percentile(sorted(self.depth_samples), 99),
+            loop_lag_max_s=max(self.lag_samples, default=0.0),
+            loop_lag_p99_s=percentile(sorted(self.lag_samples), 99),
+            http_max_in_flight=self.world.max_in_flight,
+            http_calls=dict(self.world.http_calls),
+            db_round_trips=self.conn.round_trips,
+        )
+        return results
+
+
+def main(argv=None) -> int:
+    from event_recorder import read_event_log
+
+    parser = argparse.ArgumentParser(description="Replay a recorded gateway event log through the bot offline.")
+    parser.add_argument("log", help="Event log written by EVENT_RECORD_PATH (.jsonl or .jsonl.gz)")
+    parser.add_argument("-o", "--output", default=None, help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Print mean-latency changes against an earlier report")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier; 0 replays back to back")
+    parser.add_argument("--start", type=float, default=0.0, help="Skip events recorded before this many seconds")
+    parser.add_argument("--limit", type=int, default=None, help="Replay at most this many events")
+    parser.add_argument("--db-latency-ms", type=float, default=1.0, help="Simulated blocking MySQL round trip")
+    parser.add_argument("--http-latency-ms", type=float, default=50.0, help="Simulated Discord REST round trip")
+    parser.add_argument("--profile", metavar="PATH", help="Run under cProfile and write the stats here")
+    args = parser.parse_args(argv)
+
+    entries = [entry for entry in read_event_log(args.log) if entry["t"] >= args.start]
+    if args.limit is not None:
+        entries = entries[:args.limit]
+
+    logging.basicConfig(level=logging.ERROR, format="%(levelname)s %(name)s: %(message)s", stream=sys.stderr)
+    with tempfile.TemporaryDirectory(prefix="modmail-replay-") as workdir:
+        replayer = Replayer(args, workdir)
+        if args.profile:
+            import cProfile
+
+            profiler = cProfile.Profile()
+            results = profiler.runcall(asyncio.run, replayer.run(entries))
+            profiler.dump_stats(args.profile)
+        else:
+            results = asyncio.run(replayer.run(entries))
+
+    params = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+    report = build_report("replay", results, params)
+    write_report(report, args.output)
+    print_table(report)
+    if args.compare:
+        sys.stderr.write("\n".join(compare(report, args.compare)) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,372 @@
+"""
+Benchmarks for the transcript viewer's data functions and full page reruns, no browser needed.
+
+    python -m benchmarks.viewer_data -o bench-viewer.json
+    python -m benchmarks.viewer_data --sizes 1000 50000 --embed-ratio 0.8 --image-ratio 0.2
+    python -m benchmarks.viewer_data --skip-pages --compare bench-viewer.json
+
+Function benchmarks run on synthetic transcripts shaped like the bot's
+generate_transcript output (tunable size, embed ratio, image and attachment counts)
+and report wall time plus tracemalloc peak memory. Page benchmarks drive
+streamlit_transcripts.py through Streamlit's headless AppTest with a signed-in admin
+session, the MySQL helpers replaced by the same synthetic data, and the synthetic
+transcripts on disk: Overview, Logs, and one large transcript.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from benchmarks.harness import REPO_ROOT, build_report, compare, peak_memory, print_table, summarize, time_sync, write_report
+
+STAFF_IDENTIFIERS = ["mod", "staff", "admin", "mousse"]
+INTERNAL_MARKERS = ["internal", "note", "staff-only"]
+ADMIN_ROLE_ID = 1243929060145631262
+
+_WORDS = (
+    "ticket order refund artist commission payment invoice screenshot proof discord server role "
+    "appeal warning event giveaway prize partner link please thanks hello waiting update sorry "
+    "question channel reaction emoji image file deadline paypal kofi trusted buyer seller verify"
+).split()
+
+
+# ---------------- Synthetic data ----------------
+
+
+def _sentence(rng: random.Random, low: int = 4, high: int = 40) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(low, high))).capitalize() + "."
+
+
+def make_messages(count: int, *, embed_ratio: float = 0.6, image_ratio: float = 0.05, attachment_ratio: float = 0.02,
+                  max_images: int = 3, staff_count: int = 4, channel_id: int = 1, seed: int = 0, start: datetime = None):
+    """
+    Transcript messages in the bot's JSON shape. `embed_ratio` of them are relayed
+    embeds (content carries the flattened embed text, as generate_transcript writes it);
+    the rest are plain user/staff/system messages.
+    """
+    rng = random.Random(seed)
+    start = start or datetime(2026, 1, 1, tzinfo=timezone.utc)
+    owner_id = 300000000000000000 + seed
+    owner = f"user{seed}"
+    staff = [(200000000000000000 + index, f"staff{index}") for index in range(staff_count)]
+    messages = []
+    for index in range(count):
+        roll = rng.random()
+        text = _sentence(rng)
+        embeds = []
+        if roll < 0.45:
+            role, author_id, author = "user", owner_id, owner
+            if rng.random() < embed_ratio:
+                embeds.append({"title": "User Message", "description": text, "author": owner, "author_icon_url": "", "fields": []})
+                content = f"User Message\n{owner}\n{text}"
+            else:
+                content = text
+        elif roll < 0.85:
+            author_id, author = rng.choice(staff)
+            role = "staff"
+            if rng.random() < embed_ratio:
+                embeds.append({"title": "", "description": f"STAFF RESPONSE:\n{text}", "author": author, "author_icon_url": "", "fields": []})
+                content = f"{author}\nSTAFF RESPONSE:\n{text}"
+            else:
+                content = f"Internal note: {text}" if rng.random() < 0.3 else text
+        else:
+            role, author_id, author = "system", 0, "Modmail"
+            content = rng.choice(("%close 1h", "Ticket claimed by staff0.", f"!{rng.choice(_WORDS)}"))
+        images = []
+        if rng.random() < image_ratio:
+            images = [f"transcripts/images/{channel_id}_{index}_{n}.png" for n in range(rng.randint(1, max_images))]
+        attachments = []
+        if rng.random() < attachment_ratio:
+            attachments = [f"https://cdn.discordapp.com/attachments/{channel_id}/{index}/file.txt"]
+        messages.append({
+            "timestamp": (start + timedelta(seconds=45 * index)).isoformat(),
+            "author": author,
+            "author_id": author_id,
+            "author_avatar_url": "",
+            "role": role,
+            "content": content,
+            "embeds": embeds,
+            "images": images,
+            "attachments": attachments,
+        })
+    return messages
+
+
+def make_transcript(count: int, channel_id: int, seed: int = 0, **kwargs) -> dict:
+    messages = make_messages(count, channel_id=channel_id, seed=seed, **kwargs)
+    closed_at = datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=45 * count)
+    return {
+        "ticket": {
+            "channel_id": channel_id,
+            "channel_name": f"dx-user{seed}",
+            "category": "Contact",
+            "guild_id": 1,
+            "guild_name": "Benchmark Guild",
+            "owner_id": 300000000000000000 + seed,
+            "owner_name": f"user{seed}",
+            "closed_at": closed_at.isoformat(),
+            "closed_by": f"staff{seed % 4}",
+        },
+        "messages": messages,
+    }
+
+
+def make_raw_transcript(count: int, seed: int = 0, image_ratio: float = 0.05) -> str:
+    """Legacy .txt transcript: `[ts] author: content`, continuation lines, image/attachment markers."""
+    rng = random.Random(seed)
+    lines = []
+    for index in range(count):
+        author = f"user{seed}" if index % 2 == 0 else f"staff{index % 4}"
+        lines.append(f"[2026-01-01 12:{index // 60 % 60:02d}:{index % 60:02d}] {author}: {_sentence(rng)}")
+        if rng.random() < 0.2:
+            lines.append(_sentence(rng))
+        if rng.random() < image_ratio:
+            lines.append(f"[Image saved: transcripts/images/{seed}_{index}.png]")
+        if rng.random() < 0.02:
+            lines.append(f"[Attachment: https://cdn.discordapp.com/attachments/{seed}/{index}/file.txt]")
+    return "\n".join(lines)
+
+
+def make_ticket_rows(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    created = datetime(2026, 1, 1)
+    rows = []
+    for index in range(count):
+        status = "open" if rng.random() < 0.2 else "closed"
+        rows.append({
+            "channel_id": 400000000000000000 + index,
+            "user_id": 300000000000000000 + index,
+            "member_username": f"user{index}",
+            "mod_username": f"staff{index % 4}" if rng.random() < 0.8 else None,
+            "category_id": 1,
+            "created_at": created + timedelta(hours=index),
+            "closed_at": None if status == "open" else created + timedelta(hours=index + 5),
+            "status": status,
+        })
+    return rows
+
+
+def make_transcript_db_rows(transcripts: dict):
+    """ticket_transcripts rows (as query_mysql_transcripts_map fetches them) for {channel_id: payload}."""
+    return [
+        {
+            "channel_id": channel_id,
+            "owner_id": payload["ticket"]["owner_id"],
+            "owner_name": payload["ticket"]["owner_name"],
+            "opened_by": payload["ticket"]["owner_name"],
+            "closed_by": payload["ticket"]["closed_by"],
+            "opened_at": None,
+            "closed_at": None,
+            "transcript_json": json.dumps(payload, ensure_ascii=False),
+        }
+        for channel_id, payload in transcripts.items()
+    ]
+
+
+def make_transcript_set(count: int, messages_each: int, **kwargs) -> dict:
+    return {
+        str(500000000000000000 + index): make_transcript(messages_each, 500000000000000000 + index, seed=index, **kwargs)
+        for index in range(count)
+    }
+
+
+# ---------------- Function benchmarks ----------------
+
+
+def _measure(fn, iterations: int, ops: int, **extra) -> dict:
+    samples = time_sync(fn, iterations)
+    return summarize(samples, ops_per_sample=ops, peak_bytes=peak_memory(fn), **extra)
+
+
+def bench_functions(args) -> dict:
+    from viewer.core import parse_transcript_rows
+    from viewer.sections.overview import compute_staff_overview_metrics
+    from viewer.transcripts import (
+        build_message_table,
+        classify_message_kind,
+        filter_messages_by_kind,
+        normalize_display_message,
+        parse_transcript,
+    )
+
+    shape = {"embed_ratio": args.embed_ratio, "image_ratio": args.image_ratio, "attachment_ratio": args.attachment_ratio}
+    results = {}
+    for size in args.sizes:
+        label = f"{size // 1000}k" if size >= 1000 else str(size)
+        iterations = 3 if size >= 10000 else 7
+        messages = make_messages(size, **shape)
+        normalized = [normalize_display_message(msg)[1] for msg in messages]
+        raw = make_raw_transcript(size, image_ratio=args.image_ratio)
+
+        def normalize_all():
+            for msg in messages:
+                normalize_display_message(msg)
+
+        def classify_all():
+            for msg, content in zip(messages, normalized):
+                classify_message_kind(msg, content, INTERNAL_MARKERS, STAFF_IDENTIFIERS)
+
+        results[f"normalize_display_message.{label}"] = _measure(normalize_all, iterations, size, messages=size)
+        results[f"classify_message_kind.{label}"] = _measure(classify_all, iterations, size, messages=size)
+        results[f"filter_messages_by_kind.{label}"] = _measure(
+            lambda: filter_messages_by_kind(messages, INTERNAL_MARKERS, STAFF_IDENTIFIERS, {"user", "staff"}),
+            iterations,
+            size,
+            messages=size,
+        )
+        results[f"build_message_table.{label}"] = _measure(
+            lambda: build_message_table(messages, INTERNAL_MARKERS, STAFF_IDENTIFIERS), iterations, size, messages=size
+        )
+        results[f"parse_transcript.{label}"] = _measure(
+            lambda: parse_transcript(raw), iterations, size, messages=size, raw_bytes=len(raw.encode("utf-8"))
+        )
+
+    transcripts = make_transcript_set(args.db_transcripts, args.messages_per_transcript, **shape)
+    rows = make_transcript_db_rows(transcripts)
+    results[f"parse_transcript_rows.{len(rows)}"] = _measure(
+        lambda: parse_transcript_rows(rows),
+        3,
+        len(rows),
+        rows=len(rows),
+        json_bytes=sum(len(row["transcript_json"]) for row in rows),
+    )
+
+    tickets = make_ticket_rows(500)
+    auth = {"user": {"id": "200000000000000001", "username": "staff1", "global_name": "Staff One", "discriminator": "0"}}
+    results["compute_staff_overview_metrics"] = _measure(
+        lambda: compute_staff_overview_metrics(tickets, transcripts, auth),
+        5,
+        1,
+        tickets=len(tickets),
+        transcripts=len(transcripts),
+        messages=len(transcripts) * args.messages_per_transcript,
+    )
+    return results
+
+
+# ---------------- Page reruns (AppTest) ----------------
+
+
+def _patch_viewer_data(tickets, db_transcripts):
+    """Point the viewer's MySQL-backed helpers at synthetic data so a rerun never opens a connection."""
+    import importlib
+
+    import viewer.app
+    import viewer.core
+    from viewer.timing import SECTION_MODULES
+
+    modules = [viewer.core, viewer.app] + [importlib.import_module(name) for name in SECTION_MODULES]
+    for module in modules:
+        for flag in ("MYSQL_AVAILABLE", "SQLALCHEMY_AVAILABLE", "PYMYSQL_AVAILABLE"):
+            if hasattr(module, flag):
+                setattr(module, flag, False)
+    viewer.app.query_mysql_tickets = lambda: tickets
+    viewer.app.query_mysql_transcripts_map = lambda: db_transcripts
+
+
+def bench_pages(args, workdir: str) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    for key in ("DISCORD_CLIENT_ID", "DISCORD_CLIENT_SECRET", "DISCORD_REDIRECT_URI"):
+        os.environ.setdefault(key, "benchmark")
+
+    shape = {"embed_ratio": args.embed_ratio, "image_ratio": 0.0, "attachment_ratio": args.attachment_ratio}
+    transcript_dir = Path(workdir) / "transcripts"
+    transcript_dir.mkdir(parents=True, exist_ok=True)
+    local = make_transcript_set(args.page_transcripts, args.messages_per_transcript, **shape)
+    for channel_id, payload in local.items():
+        (transcript_dir / f"{channel_id}.json").write_text(json.dumps(payload), encoding="utf-8")
+    large_channel = "600000000000000000"
+    (transcript_dir / f"{large_channel}.json").write_text(
+        json.dumps(make_transcript(args.large_transcript, int(large_channel), seed=7, **shape)), encoding="utf-8"
+    )
+    db_transcripts = make_transcript_set(args.db_transcripts, args.messages_per_transcript, **shape)
+    _patch_viewer_data(make_ticket_rows(500), db_transcripts)
+
+    auth = {
+        "access_token": "",
+        "user": {"id": "200000000000000001", "username": "staff1", "global_name": "Staff One", "discriminator": "0", "avatar": ""},
+        "role_ids": [ADMIN_ROLE_ID],
+    }
+    pages = {
+        "page.overview": ("overview", None),
+        "page.logs": ("logs", None),
+        f"page.transcript_{args.large_transcript // 1000}k": ("logs", large_channel),
+    }
+    script = str(Path(REPO_ROOT) / "streamlit_transcripts.py")
+    results = {}
+    for name, (section, channel) in pages.items():
+        app = AppTest.from_file(script, default_timeout=args.page_timeout)
+        app.session_state["discord_auth"] = auth
+        app.session_state["section_key"] = section
+        if channel:
+            app.query_params["channel"] = channel
+
+        start = time.perf_counter()
+        app.run()
+        first_run = time.perf_counter() - start
+        samples = []
+        for _ in range(args.reruns):
+            start = time.perf_counter()
+            app.run()
+            samples.append(time.perf_counter() - start)
+        results[name] = summarize(
+            samples,
+            first_run_s=first_run,
+            exceptions=[str(getattr(error, "message", error))[:300] for error in app.exception],
+        )
+    return results
+
+
+# ---------------- CLI ----------------
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the transcript viewer's data functions and page reruns.")
+    parser.add_argument("-o", "--output", default=None, help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Print mean-time changes against an earlier report")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="Messages per synthetic transcript")
+    parser.add_argument("--embed-ratio", type=float, default=0.6)
+    parser.add_argument("--image-ratio", type=float, default=0.05)
+    parser.add_argument("--attachment-ratio", type=float, default=0.02)
+    parser.add_argument("--db-transcripts", type=int, default=2000, help="Rows for the transcripts-map parse (the query's LIMIT)")
+    parser.add_argument("--messages-per-transcript", type=int, default=40)
+    parser.add_argument("--page-transcripts", type=int, default=200, help="Transcript files on disk for the page runs")
+    parser.add_argument("--large-transcript", type=int, default=10000, help="Messages in the large transcript page")
+    parser.add_argument("--reruns", type=int, default=5, help="Timed reruns per page after the first run")
+    parser.add_argument("--page-timeout", type=float, default=120.0)
+    parser.add_argument("--skip-pages", action="store_true", help="Only run the function benchmarks")
+    parser.add_argument("--skip-functions", action="store_true", help="Only run the page benchmarks")
+    args = parser.parse_args(argv)
+
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    results = {}
+    if not args.skip_functions:
+        results.update(bench_functions(args))
+    if not args.skip_pages:
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory(prefix="viewer-bench-") as workdir:
+            # The viewer resolves transcripts/ and its SQLite files relative to the working directory.
+            os.chdir(workdir)
+            try:
+                results.update(bench_pages(args, workdir))
+            finally:
+                os.chdir(cwd)
+
+    params = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+    report = build_report("viewer_data", results, params)
+    write_report(report, args.output)
+    print_table(report)
+    if args.compare:
+        sys.stderr.write("\n".join(compare(report, args.compare)) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,12 @@ import traceback
 from config_manager import ConfigManager
 from thread_manager import ThreadManager
 from database_manager import DatabaseManager
+from search_index import TranscriptSearchIndex
+from staff_roles import CCAC_ALLOWED_ROLE_IDS, STAFF_GUILD_ID
+from transcript_catalog import TranscriptCatalog, default_path, move_legacy_database
+from bot_metrics import BotMetrics
+from event_recorder import EventRecorder
+from loop_watchdog import LoopWatchdog
 from dateutil.relativedelta import relativedelta
 import config as app_config
 
@@ -37,6 +43,25 @@ TEMP_DIR = getattr(app_config, "TEMP_DIR", ".")
 LOG_DIR = getattr(app_config, "LOG_DIR", "logs")
 TICKET_REMINDER_HOURS = getattr(app_config, "TICKET_REMINDER_HOURS", 48)
 ERROR_CHANNEL_ID = getattr(app_config, "ERROR_CHANNEL_ID", 1482074428606255154)
+TRANSCRIPT_DIR = getattr(app_config, "TRANSCRIPT_DIR", "transcripts")
+# Kept outside TRANSCRIPT_DIR so SQLite's own files don't change the directory the catalogue watches.
+SEARCH_INDEX_PATH = getattr(app_config, "SEARCH_INDEX_PATH", default_path(TRANSCRIPT_DIR, "search_index.sqlite3"))
+TRANSCRIPT_CATALOG_PATH = getattr(app_config, "TRANSCRIPT_CATALOG_PATH", default_path(TRANSCRIPT_DIR, "catalog.sqlite3"))
+# Roles that put a member of STAFF_GUILD_ID on the staff roster the viewer's leaderboard
+# reads; the same guild and roles the viewer accepts at login unless ROSTER_ROLE_IDS
+# overrides the roles.
+ROSTER_ROLE_IDS = set(getattr(app_config, "ROSTER_ROLE_IDS", set())) or CCAC_ALLOWED_ROLE_IDS
+# Prometheus text endpoint (GET /metrics); set METRICS_PORT = 0 to disable it.
+METRICS_HOST = getattr(app_config, "METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(getattr(app_config, "METRICS_PORT", 9108))
+
+# Event-loop stalls longer than this get their stack captured; 0 disables the watchdog.
+LOOP_WATCHDOG_THRESHOLD_MS = float(getattr(app_config, "LOOP_WATCHDOG_THRESHOLD_MS", 250))
+LOOP_WATCHDOG_REPORT_MINUTES = float(getattr(app_config, "LOOP_WATCHDOG_REPORT_MINUTES", 15))
+# Opt-in gateway event capture for benchmarks/replay.py (a path; ".gz" compresses). Empty disables it.
+EVENT_RECORD_PATH = getattr(app_config, "EVENT_RECORD_PATH", "")
+# Fixed salt keeps recorded pseudonyms stable across restarts; random per session when unset.
+EVENT_RECORD_SALT = getattr(app_config, "EVENT_RECORD_SALT", None)
 
 BOT_BUILD_MARKER = getattr(app_config, "BOT_BUILD_MARKER", "2026-03-04T14:58Z-note-fix-v3")
 
@@ -153,12 +178,30 @@ HELP_COMMAND_OVERRIDES = {
         "example": "%note User was cooperative and provided proof quickly.",
         "group": "Staff Tools",
     },
+    "search": {
+        "summary": "Full-text search across ticket transcripts, usernames and open/close reasons.",
+        "usage": "%search <terms>",
+        "example": "%search stolen art",
+        "group": "Staff Tools",
+    },
     "trs": {
         "summary": "Review a user's stored transcripts and internal notes.",
         "usage": "%trs <user_id>",
         "example": "%trs 123456789012345678",
         "group": "Staff Tools",
     },
+    "dbstats": {
+        "summary": "Show the query shapes that dominate bot database time.",
+        "usage": "%dbstats [total|avg|max|calls|rows|reset]",
+        "example": "%dbstats avg",
+        "group": "Staff Tools",
+    },
+    "profile": {
+        "summary": "Sample the running bot and upload flamegraph-ready CPU and asyncio task stacks.",
+        "usage": "%profile [seconds]",
+        "example": "%profile 30",
+        "group": "Staff Tools",
+    },
     "remindme": {
         "summary": "Send yourself a reminder after a delay.",
         "usage": "%remindme <about> <when>",
@@ -225,14 +268,33 @@ class ModmailBot(commands.Bot):
         self._connected = asyncio.Event()
 
         self.guild_id = GUILD_ID
+        self.metrics = BotMetrics()
+        self.metrics.watch_rate_limits()
+        self._metrics_tasks_started = False
+        self._rollup_task_started = False
+        self.loop_watchdog = None
+        if LOOP_WATCHDOG_THRESHOLD_MS:
+            self.loop_watchdog = LoopWatchdog(self.metrics, threshold=LOOP_WATCHDOG_THRESHOLD_MS / 1000)
         self.threads = ThreadManager(self)
-        self.db = DatabaseManager(self)
+        self.db = self.metrics.instrument(DatabaseManager(self))
+        self.search_index = TranscriptSearchIndex(SEARCH_INDEX_PATH)
+        self.transcript_catalog = TranscriptCatalog(TRANSCRIPT_CATALOG_PATH, TRANSCRIPT_DIR)
         self.note_manager = NoteManager(self)
+        self.event_recorder = None
+        if EVENT_RECORD_PATH:
+            self.event_recorder = EventRecorder(
+                EVENT_RECORD_PATH, ticket_category_ids=CATEGORY_IDS.values(), salt=EVENT_RECORD_SALT
+            )
 
         self.log_file_path = os.path.join(TEMP_DIR, LOG_DIR, "modmail.log")
         configure_logging()
         self.add_command(self._build_help_command())
 
+    def dispatch(self, event_name, /, *args, **kwargs):
+        if self.event_recorder is not None:
+            self.event_recorder.record(event_name, *args, me_id=self.user.id if self.user else None)
+        super().dispatch(event_name, *args, **kwargs)
+
     def _command_meta(self, command: commands.Command):
         return HELP_COMMAND_OVERRIDES.get(command.name, {})
 
@@ -347,7 +409,20 @@ class ModmailBot(commands.Bot):
         if not self._extensions_loaded:
             await self.load_extensions()
             self._extensions_loaded = True
+            self.loop.create_task(self.staff_activity_backfill_task())
         self.loop.create_task(self.timer_task())
+        if not self._rollup_task_started:
+            # on_ready fires again after every gateway reconnect.
+            self._rollup_task_started = True
+            self.loop.create_task(self.rollup_task())
+        if not self._metrics_tasks_started:
+            self._metrics_tasks_started = True
+            self.loop.create_task(self.metrics_task())
+            self.loop.create_task(self.metrics.monitor_event_loop())
+            if self.loop_watchdog is not None:
+                self.loop.create_task(self.loop_watchdog.run())
+                self.loop.create_task(self.loop_watchdog_task())
+        self.sync_staff_roster()
         self._connected.set()
 
     async def _resolve_error_channel(self):
@@ -417,48 +492,7 @@ class ModmailBot(commands.Bot):
         await self.wait_until_ready()
         while not self.is_closed():
             try:
-                now = datetime.now(timezone.utc)
-
-                # === Handle 24-hour suspended ticket closures ===
-                pending_timers = self.db.get_pending_timers()
-                for timer_entry in pending_timers:
-                    try:
-                        execute_at = timer_entry["execute_at"]
-                        if isinstance(execute_at, str):
-                            execute_at = datetime.strptime(execute_at, "%Y-%m-%d %H:%M:%S")
-                        execute_at = execute_at.replace(tzinfo=timezone.utc)
-
-                        if now >= execute_at:
-                            channel = self.get_channel(int(timer_entry["channel_id"]))
-                            action = timer_entry["action"]
-
-                            if action in ("close", "suspend"):
-                                if action == "suspend":
-                                    embed = discord.Embed(
-                                        title="📨 Ticket Closed",
-                                        description="User did not respond. This suspended ticket has been closed automatically.",
-                                        color=discord.Color.red()
-                                    )
-                                    if channel:
-                                        await channel.send(embed=embed)
-
-                                if channel:
-                                    await self.close_ticket_now(channel)
-
-                            # Remove timer from database
-                            self.db.cancel_ticket_timer(timer_entry["channel_id"], action)
-
-                    except Exception as e:
-                        logger.error(f"Error while processing timer entry {timer_entry}: {e}")
-                        try:
-                            await self._send_error_report(
-                                "⚠️ Timer Processing Error",
-                                f"Timer entry channel_id={timer_entry.get('channel_id')} action={timer_entry.get('action')}",
-                                traceback.format_exc()
-                            )
-                        except Exception:
-                            pass
-
+                await self.process_due_timers()
             except Exception as e:
                 logger.error(f"Error in timer_task loop: {e}")
                 try:
@@ -473,9 +507,112 @@ class ModmailBot(commands.Bot):
             # Run every 5 minutes
             await asyncio.sleep(300)
 
+    async def process_due_timers(self, now: datetime = None):
+        """One timer_task pass: fire every pending ticket timer whose execute_at has passed."""
+        now = now or datetime.now(timezone.utc)
+
+        # === Handle 24-hour suspended ticket closures ===
+        pending_timers = self.db.get_pending_timers()
+        for timer_entry in pending_timers:
+            try:
+                execute_at = timer_entry["execute_at"]
+                if isinstance(execute_at, str):
+                    execute_at = datetime.strptime(execute_at, "%Y-%m-%d %H:%M:%S")
+                execute_at = execute_at.replace(tzinfo=timezone.utc)
+
+                if now >= execute_at:
+                    self.metrics.timer_lateness_seconds.observe((now - execute_at).total_seconds())
+                    channel = self.get_channel(int(timer_entry["channel_id"]))
+                    action = timer_entry["action"]
+
+                    if action in ("close", "suspend"):
+                        if action == "suspend":
+                            embed = discord.Embed(
+                                title="📨 Ticket Closed",
+                                description="User did not respond. This suspended ticket has been closed automatically.",
+                                color=discord.Color.red()
+                            )
+                            if channel:
+                                await channel.send(embed=embed)
+
+                        if channel:
+                            await self.close_ticket_now(channel)
+
+                    # Remove timer from database
+                    self.db.cancel_ticket_timer(timer_entry["channel_id"], action)
+
+            except Exception as e:
+                logger.error(f"Error while processing timer entry {timer_entry}: {e}")
+                try:
+                    await self._send_error_report(
+                        "⚠️ Timer Processing Error",
+                        f"Timer entry channel_id={timer_entry.get('channel_id')} action={timer_entry.get('action')}",
+                        traceback.format_exc()
+                    )
+                except Exception:
+                    pass
+
 
 
     
+    async def rollup_task(self):
+        """Hourly task that rolls finished days into the rollup tables and prunes closed tickets' live snapshots."""
+        await self.wait_until_ready()
+        while not self.is_closed():
+            try:
+                for day in self.db.pending_rollup_days():
+                    self.db.rollup_ticket_day(day)
+                    # Yield between days so a first-run backfill doesn't stall the gateway.
+                    await asyncio.sleep(0)
+                self.db.prune_live_messages()
+            except Exception as e:
+                logger.error(f"Error in rollup_task loop: {e}")
+
+            await asyncio.sleep(3600)
+
+    async def staff_activity_backfill_task(self):
+        """One-time fill of staff activity metrics from transcripts saved before the tables existed."""
+        await self.wait_until_ready()
+        try:
+            if self.db.staff_activity_backfill_done():
+                return
+            logger.info("Backfilling staff activity metrics from saved transcripts...")
+            after_id = 0
+            while after_id is not None:
+                after_id = self.db.backfill_staff_activity_batch(after_id)
+                # Yield between batches so a large ticket_transcripts table doesn't stall the gateway.
+                await asyncio.sleep(0)
+            logger.info("Staff activity backfill complete.")
+        except Exception as e:
+            logger.warning(f"Failed to backfill staff activity metrics: {e}")
+
+    async def metrics_task(self):
+        """Refresh the ticket and timer gauges once a minute."""
+        await self.wait_until_ready()
+        while not self.is_closed():
+            try:
+                self.metrics.open_tickets.set(self.db.count_open_tickets())
+                self.metrics.pending_timers.set(self.db.count_pending_timers())
+            except Exception as e:
+                logger.warning(f"Error in metrics_task loop: {e}")
+
+            await asyncio.sleep(60)
+
+    async def loop_watchdog_task(self):
+        """Report the call sites that blocked the event loop, every LOOP_WATCHDOG_REPORT_MINUTES."""
+        await self.wait_until_ready()
+        while not self.is_closed():
+            await asyncio.sleep(LOOP_WATCHDOG_REPORT_MINUTES * 60)
+            report = self.loop_watchdog.take_report()
+            if report is None:
+                continue
+            summary, details = report
+            logger.warning(f"{summary}\n{details}")
+            try:
+                await self._send_error_report("🐢 Event Loop Blocked", summary, details)
+            except Exception:
+                pass
+
     async def close_ticket_now(self, channel):
         self.db.close_ticket(channel.id, datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"))
         await channel.delete()
@@ -599,6 +736,9 @@ class ModmailBot(commands.Bot):
                         embed.set_image(url=first_attachment.url)
 
                 await channel.send(embed=embed)
+                self.metrics.dm_relay_seconds.observe(
+                    (datetime.now(timezone.utc) - message.created_at).total_seconds()
+                )
 
                 if len(message.attachments) > 1:
                     files = []
@@ -637,6 +777,60 @@ class ModmailBot(commands.Bot):
         )
         await message.channel.send(embed=welcome_embed, view=TicketCategoryView())
 
+    # ---------------- Staff roster ----------------
+
+    @staticmethod
+    def _roster_entry(member):
+        role_ids = {role.id for role in member.roles if role.id in ROSTER_ROLE_IDS}
+        return member.id, member.name, member.display_name, role_ids
+
+    def sync_staff_roster(self):
+        """Rebuild staff_roster from the staff guild's member cache (populated by the members intent)."""
+        guild = self.get_guild(STAFF_GUILD_ID)
+        if guild is None:
+            logger.warning(f"Staff guild {STAFF_GUILD_ID} not in cache; staff roster not synced.")
+            return
+        entries = [self._roster_entry(m) for m in guild.members if not m.bot]
+        try:
+            self.db.replace_staff_roster([e for e in entries if e[3]])
+        except Exception as e:
+            logger.warning(f"Failed to sync staff roster: {e}")
+
+    def _update_roster_member(self, member):
+        if member.guild.id != STAFF_GUILD_ID or member.bot:
+            return
+        user_id, username, display_name, role_ids = self._roster_entry(member)
+        try:
+            if role_ids:
+                self.db.upsert_staff_member(user_id, username, display_name, role_ids)
+            else:
+                self.db.remove_staff_member(user_id)
+        except Exception as e:
+            logger.warning(f"Failed to update staff roster for {user_id}: {e}")
+
+    async def on_member_join(self, member):
+        self._update_roster_member(member)
+
+    async def on_member_update(self, before, after):
+        if before.roles != after.roles or before.name != after.name or before.display_name != after.display_name:
+            self._update_roster_member(after)
+
+    async def on_member_remove(self, member):
+        if member.guild.id != STAFF_GUILD_ID:
+            return
+        try:
+            self.db.remove_staff_member(member.id)
+        except Exception as e:
+            logger.warning(f"Failed to remove {member.id} from staff roster: {e}")
+
+    async def on_user_update(self, before, after):
+        if before.name == after.name:
+            return
+        guild = self.get_guild(STAFF_GUILD_ID)
+        member = guild.get_member(after.id) if guild else None
+        if member is not None:
+            self._update_roster_member(member)
+
     async def on_guild_channel_delete(self, channel):
         if channel.topic:
             try:
@@ -656,11 +850,21 @@ class ModmailBot(commands.Bot):
             async with self:
                 self.session = ClientSession()
                 self.db.setup()
+                if not hasattr(app_config, "SEARCH_INDEX_PATH"):
+                    move_legacy_database(os.path.join(TRANSCRIPT_DIR, "search_index.sqlite3"), SEARCH_INDEX_PATH)
+                self.search_index.setup()
+                self.transcript_catalog.setup()
+                if METRICS_PORT:
+                    await self.metrics.start_server(METRICS_HOST, METRICS_PORT)
                 token = getattr(app_config, "BOT_TOKEN", None)
                 if not token:
                     logger.error("Bot token is missing. Set BOT_TOKEN (or DISCORD_TOKEN) in config/env.")
                     return
-                await self.start(token)
+                try:
+                    await self.start(token)
+                finally:
+                    if self.event_recorder is not None:
+                        self.event_recorder.close()
 
         asyncio.run(runner())
 
@@ -982,6 +1186,15 @@ async def _send_category_details(interaction: discord.Interaction, category_key:
             logger.warning(f"Failed to delete duplicate ticket channel {ticket_channel.id}: {e}")
         return
 
+    await asyncio.to_thread(
+        bot.search_index.index_ticket,
+        ticket_channel.id,
+        owner_id=user.id,
+        owner_name=str(user),
+        member_username=str(user),
+        category=category_key,
+    )
+
     # --- CREATE USER INFO EMBED AND SEND IT ---
     user_info_embed = await bot.get_user_info_embed(user)
     await ticket_channel.send(embed=user_info_embed)
@@ -0,0 +1,292 @@
+"""
+Bot metrics - in-process histograms, counters and gauges rendered in the Prometheus
+text exposition format (version 0.0.4) on a local aiohttp endpoint.
+
+Needs nothing beyond aiohttp, which the bot already uses. Only the event loop
+writes metrics, so there is no locking. Scrape with Prometheus or just `curl http://127.0.0.1:9108/metrics`.
+"""
+import asyncio
+import functools
+import logging
+import math
+import time
+
+from aiohttp import web
+
+logger = logging.getLogger("modmail.metrics")
+
+# Seconds. Covers sub-millisecond DB calls up to multi-minute timer lateness.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+BYTE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in (*zip(names, values), *extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+
+    def _key(self, labels: dict):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._series[key] = self._series.get(key, 0) + amount
+
+    def render(self):
+        yield from super().render()
+        for key, value in sorted(self._series.items()):
+            yield f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        self._series[self._key(labels)] = value
+
+    def render(self):
+        yield from super().render()
+        for key, value in sorted(self._series.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series["counts"][index] += 1
+                break
+        series["sum"] += value
+        series["count"] += 1
+
+    def time(self, **labels):
+        """Context manager that observes the elapsed wall time of its block."""
+        return _Timer(self, labels)
+
+    def render(self):
+        yield from super().render()
+        for key, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series["counts"]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, (("le", _format_value(float(bound))),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(series['sum'])}"
+            yield f"{self.name}_count{labels} {series['count']}"
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: dict):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class _RateLimitLogHandler(logging.Handler):
+    """
+    Counts the 429s discord.py retries internally and only logs. Each 429 logs one
+    "We are being rate limited" warning, followed in the same coroutine step by
+    "Global rate limit has been hit" when it was global, so the count is deferred
+    until that step yields and each 429 is counted once with its scope.
+    """
+
+    def __init__(self, counter: Counter):
+        super().__init__(level=logging.WARNING)
+        self.counter = counter
+        self._last = None
+
+    def emit(self, record):
+        try:
+            message = record.getMessage()
+        except Exception:
+            return
+        if message.startswith("We are being rate limited"):
+            hit = self._last = {"scope": "route"}
+            try:
+                asyncio.get_running_loop().call_soon(self._count, hit)
+            except RuntimeError:
+                self._count(hit)
+        elif message.startswith("Global rate limit has been hit") and self._last is not None:
+            self._last["scope"] = "global"
+
+    def _count(self, hit):
+        self.counter.inc(scope=hit["scope"])
+
+
+class BotMetrics:
+    def __init__(self, namespace: str = "modmail"):
+        self.namespace = namespace
+        self._metrics = []
+        self.dm_relay_seconds = self.histogram(
+            "dm_relay_seconds", "Time from a user's DM being sent to it being posted in the ticket channel."
+        )
+        self.db_call_seconds = self.histogram(
+            "db_call_seconds", "DatabaseManager method latency.", labelnames=("method",)
+        )
+        self.db_call_errors = self.counter(
+            "db_call_errors", "DatabaseManager method calls that raised.", labelnames=("method",)
+        )
+        self.timer_lateness_seconds = self.histogram(
+            "timer_lateness_seconds", "How long after execute_at a ticket timer actually fired."
+        )
+        self.transcript_build_seconds = self.histogram(
+            "transcript_build_seconds", "generate_transcript wall time."
+        )
+        self.transcript_bytes = self.histogram(
+            "transcript_bytes", "Size of generated transcript JSON files.", buckets=BYTE_BUCKETS
+        )
+        self.event_loop_lag_seconds = self.histogram(
+            "event_loop_lag_seconds", "Extra delay of a periodic asyncio.sleep wake-up."
+        )
+        self.event_loop_stall_seconds = self.histogram(
+            "event_loop_stall_seconds", "Event-loop stalls past the loop watchdog threshold."
+        )
+        self.discord_rate_limits = self.counter(
+            "discord_rate_limits", "Discord 429 responses reported by discord.py.", labelnames=("scope",)
+        )
+        self.open_tickets = self.gauge("open_tickets", "Tickets with status 'open' in active_tickets.")
+        self.pending_timers = self.gauge("pending_timers", "Ticket timers with status 'pending'.")
+        self._runner = None
+
+    # ---------------- Registry ----------------
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(f"{self.namespace}_{name}", documentation, labelnames, buckets))
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter(f"{self.namespace}_{name}", documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._register(Gauge(f"{self.namespace}_{name}", documentation, labelnames))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    # ---------------- Instrumentation ----------------
+
+    def instrument(self, obj, histogram: Histogram = None, errors: Counter = None, skip=("setup",)):
+        """
+        Wrap every public method of `obj` except those in `skip` (on the instance) so each
+        call is timed into `histogram` labelled with the method name. Defaults to the DB
+        call metrics; startup DDL is skipped so it doesn't land in the request latencies.
+        """
+        histogram = histogram or self.db_call_seconds
+        errors = errors or self.db_call_errors
+        for name in dir(type(obj)):
+            if name.startswith("_") or name in skip:
+                continue
+            method = getattr(obj, name, None)
+            if not callable(method) or asyncio.iscoroutinefunction(method):
+                continue
+            setattr(obj, name, self._timed(method, name, histogram, errors))
+        return obj
+
+    @staticmethod
+    def _timed(method, name, histogram, errors):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            except Exception:
+                errors.inc(method=name)
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - start, method=name)
+
+        return wrapper
+
+    def watch_rate_limits(self, logger_name: str = "discord.http"):
+        logging.getLogger(logger_name).addHandler(_RateLimitLogHandler(self.discord_rate_limits))
+
+    async def monitor_event_loop(self, interval: float = 1.0):
+        """Run forever, recording how late each `interval` sleep wakes up."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            self.event_loop_lag_seconds.observe(max(loop.time() - start - interval, 0.0))
+
+    # ---------------- HTTP endpoint ----------------
+
+    async def _handle_metrics(self, request):
+        return web.Response(body=self.render().encode("utf-8"), headers={"Content-Type": CONTENT_TYPE})
+
+    async def start_server(self, host: str = "127.0.0.1", port: int = 9108):
+        """Serve GET /metrics on the running event loop."""
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, host, port).start()
+        except OSError as err:
+            await runner.cleanup()
+            logger.warning(f"Metrics endpoint could not bind {host}:{port}: {err}")
+            return
+        self._runner = runner
+        logger.info(f"Metrics endpoint listening on http://{host}:{port}/metrics")
+
+    async def stop_server(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
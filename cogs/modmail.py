@@ -4,11 +4,13 @@ import asyncio
 import io
 import re
 import logging
+import time
 from datetime import datetime, timedelta, timezone
 import os
 import json
 import aiohttp
 import config as app_config
+from image_cache import ensure_thumbnail
 
 JUNIOR_MOD_ROLE_ID = getattr(app_config, "JUNIOR_MOD_ROLE_ID", 0)
 ADDITIONAL_STAFF_ROLE_ID = getattr(app_config, "ADDITIONAL_STAFF_ROLE_ID", 0)
@@ -20,9 +22,15 @@ LOG_CHANNEL_ID = getattr(app_config, "LOG_CHANNEL_ID", 0)
 TRANSCRIPT_DIR = getattr(app_config, "TRANSCRIPT_DIR", "transcripts")
 IMAGE_DIR = getattr(app_config, "IMAGE_DIR", "transcripts/images")
 STREAMLIT_PUBLIC_URL = getattr(app_config, "STREAMLIT_PUBLIC_URL", "")
+# Live snapshot rows are written in batches: after this delay, or sooner once this many are queued.
+LIVE_FLUSH_SECONDS = 1.0
+LIVE_FLUSH_MAX = 100
 
 logger = logging.getLogger(__name__)
 
+# Discord avatar URLs carry the user ID: /avatars/<id>/... or /guilds/<gid>/users/<id>/avatars/...
+_AVATAR_USER_ID_RE = re.compile(r"/(?:avatars|users)/(\d{15,21})/")
+
 class Modmail(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -37,6 +45,8 @@ class Modmail(commands.Cog):
         self.notify_watchers = {}      # { channel_id: [user_ids...] }
 
         self.ticket_category_ids = TICKET_CATEGORY_IDS
+        self._live_buffer = []         # [(channel_id, message_id, entry)] awaiting one batched insert
+        self._live_flush_task = None
 
         # ensure directories exist
         os.makedirs(TRANSCRIPT_DIR, exist_ok=True)
@@ -205,7 +215,77 @@ class Modmail(commands.Cog):
 
         return "\n".join([p for p in parts if p]).strip()
 
+    def _build_message_entry(self, msg: discord.Message, channel: discord.TextChannel, ticket_owner_id, ticket_owner) -> dict:
+        """Transcript entry for one message; attachments are left for the caller to fill in."""
+        role = "system"
+        if ticket_owner_id and msg.author.id == ticket_owner_id:
+            role = "user"
+        elif getattr(msg.author, "guild_permissions", None):
+            perms = msg.author.guild_permissions
+            if perms.manage_channels or perms.manage_messages or perms.administrator:
+                role = "staff"
+
+        entry = {
+            "timestamp": msg.created_at.isoformat(),
+            "author": str(msg.author),
+            "author_id": msg.author.id,
+            "author_avatar_url": str(msg.author.display_avatar.url) if getattr(msg.author, "display_avatar", None) else "",
+            "role": role,
+            "content": msg.content or "",
+            "embeds": [],
+            "images": [],
+            "attachments": [],
+        }
+
+        embed_text_parts = []
+        embed_author_names = []
+        if msg.embeds:
+            for embed in msg.embeds:
+                payload = self._extract_embed_payload(embed)
+                entry["embeds"].append(payload)
+                if payload.get("author"):
+                    embed_author_names.append(payload["author"])
+                embed_text = self._embed_payload_to_text(payload)
+                if embed_text:
+                    embed_text_parts.append(embed_text)
+
+        if embed_text_parts:
+            combined_embed_text = "\n\n".join(embed_text_parts)
+            if entry["content"].strip():
+                entry["content"] = f"{entry['content']}\n\n{combined_embed_text}"
+            else:
+                entry["content"] = combined_embed_text
+
+            role_hint_text = combined_embed_text.lower()
+            if "staff response" in role_hint_text:
+                entry["role"] = "staff"
+            elif "user message" in role_hint_text:
+                entry["role"] = "user"
+
+        # If message was posted by the bot, use embed author as the actual speaker name
+        # (this preserves user/staff identity in forwarded embed-style modmail messages).
+        if msg.author.bot and embed_author_names:
+            entry["author"] = embed_author_names[0]
+            for embed_payload in entry.get("embeds", []):
+                icon_url = embed_payload.get("author_icon_url") if isinstance(embed_payload, dict) else ""
+                if icon_url:
+                    entry["author_avatar_url"] = icon_url
+                    # Keep author_id pointing at the real speaker so per-staff metrics can key on it.
+                    # Default avatars carry no ID; those replies stay attributed to the bot.
+                    match = _AVATAR_USER_ID_RE.search(icon_url)
+                    if match:
+                        entry["author_id"] = int(match.group(1))
+                    break
+
+        # Additional role inference based on embed metadata when available.
+        if embed_author_names and entry["role"] == "system":
+            if ticket_owner and embed_author_names[0].split("#")[0].lower() == str(ticket_owner).split("#")[0].lower():
+                entry["role"] = "user"
+
+        return entry
+
     async def generate_transcript(self, channel: discord.TextChannel):
+        started = time.perf_counter()
         transcript_messages = []
         os.makedirs(IMAGE_DIR, exist_ok=True)
 
@@ -215,65 +295,7 @@ class Modmail(commands.Cog):
             ticket_owner = self.bot.get_user(ticket_owner_id)
 
         async for msg in channel.history(limit=None, oldest_first=True):
-            role = "system"
-            if ticket_owner_id and msg.author.id == ticket_owner_id:
-                role = "user"
-            elif getattr(msg.author, "guild_permissions", None):
-                perms = msg.author.guild_permissions
-                if perms.manage_channels or perms.manage_messages or perms.administrator:
-                    role = "staff"
-
-            entry = {
-                "timestamp": msg.created_at.isoformat(),
-                "author": str(msg.author),
-                "author_id": msg.author.id,
-                "author_avatar_url": str(msg.author.display_avatar.url) if getattr(msg.author, "display_avatar", None) else "",
-                "role": role,
-                "content": msg.content or "",
-                "embeds": [],
-                "images": [],
-                "attachments": [],
-            }
-
-            embed_text_parts = []
-            embed_author_names = []
-            if msg.embeds:
-                for embed in msg.embeds:
-                    payload = self._extract_embed_payload(embed)
-                    entry["embeds"].append(payload)
-                    if payload.get("author"):
-                        embed_author_names.append(payload["author"])
-                    embed_text = self._embed_payload_to_text(payload)
-                    if embed_text:
-                        embed_text_parts.append(embed_text)
-
-            if embed_text_parts:
-                combined_embed_text = "\n\n".join(embed_text_parts)
-                if entry["content"].strip():
-                    entry["content"] = f"{entry['content']}\n\n{combined_embed_text}"
-                else:
-                    entry["content"] = combined_embed_text
-
-                role_hint_text = combined_embed_text.lower()
-                if "staff response" in role_hint_text:
-                    entry["role"] = "staff"
-                elif "user message" in role_hint_text:
-                    entry["role"] = "user"
-
-            # If message was posted by the bot, use embed author as the actual speaker name
-            # (this preserves user/staff identity in forwarded embed-style modmail messages).
-            if msg.author.bot and embed_author_names:
-                entry["author"] = embed_author_names[0]
-                for embed_payload in entry.get("embeds", []):
-                    icon_url = embed_payload.get("author_icon_url") if isinstance(embed_payload, dict) else ""
-                    if icon_url:
-                        entry["author_avatar_url"] = icon_url
-                        break
-
-            # Additional role inference based on embed metadata when available.
-            if embed_author_names and entry["role"] == "system":
-                if ticket_owner and embed_author_names[0].split("#")[0].lower() == str(ticket_owner).split("#")[0].lower():
-                    entry["role"] = "user"
+            entry = self._build_message_entry(msg, channel, ticket_owner_id, ticket_owner)
 
             for attachment in msg.attachments:
                 # Save all images, regardless of sender
@@ -284,6 +306,7 @@ class Modmail(commands.Cog):
                             if resp.status == 200:
                                 with open(image_path, "wb") as f:
                                     f.write(await resp.read())
+                                await asyncio.to_thread(ensure_thumbnail, image_path)
                     entry["images"].append(image_path)
                 else:
                     entry["attachments"].append(attachment.url)
@@ -308,6 +331,11 @@ class Modmail(commands.Cog):
         with open(transcript_path, "w", encoding="utf-8") as f:
             json.dump(transcript_data, f, indent=2, ensure_ascii=False)
 
+        metrics = getattr(self.bot, "metrics", None)
+        if metrics is not None:
+            metrics.transcript_build_seconds.observe(time.perf_counter() - started)
+            metrics.transcript_bytes.observe(os.path.getsize(transcript_path))
+
         return transcript_path, transcript_data
 
     # ---------------- Role Checks ----------------
@@ -379,10 +407,29 @@ class Modmail(commands.Cog):
                     transcript_data,
                     closed_by=str(author) if author else "System",
                     close_reason=close_reason,
+                    closed_by_id=author.id if author else None,
                 )
             except Exception as e:
                 logger.exception("Failed to save transcript to database for channel %s: %s", channel.id, e)
 
+        if hasattr(self.bot.db, "clear_live_messages"):
+            try:
+                # The saved transcript supersedes the live snapshot.
+                self.bot.db.clear_live_messages(channel.id)
+            except Exception as e:
+                logger.warning("Failed to clear live snapshot for channel %s: %s", channel.id, e)
+
+        if hasattr(self.bot, "search_index"):
+            await asyncio.to_thread(
+                self.bot.search_index.index_transcript,
+                transcript_data,
+                closed_by=str(author) if author else "System",
+                close_reason=close_reason,
+            )
+
+        if hasattr(self.bot, "transcript_catalog"):
+            await asyncio.to_thread(self.bot.transcript_catalog.record_file, transcript_path)
+
         return True
 
     # ---------------- Commands ----------------
@@ -516,7 +563,7 @@ class Modmail(commands.Cog):
 
         # generate and send transcript to log channel
         try:
-            await self._log_ticket(channel)
+            await self._log_ticket(channel, scheduled_by)
         except Exception:
             logger.exception("Failed generating or sending transcript during auto-close for channel %s", getattr(channel, "id", None))
 
@@ -704,6 +751,46 @@ class Modmail(commands.Cog):
                     watchers = self.bot.db.get_watchers(ticket_channel_id)
                     mentions = [guild.get_member(w).mention for w in set(watchers) if guild.get_member(w)]
 
+    @commands.Cog.listener("on_message")
+    async def publish_live_message(self, message: discord.Message):
+        """Append each message posted in an open ticket channel to its live snapshot for the viewer."""
+        channel = message.channel
+        if not isinstance(channel, discord.TextChannel) or channel.category_id not in self.ticket_category_ids:
+            return
+        if not hasattr(self.bot.db, "append_live_messages"):
+            return
+        ticket_owner_id = self._get_user_id_from_topic(channel.topic or "")
+        ticket_owner = self.bot.get_user(ticket_owner_id) if ticket_owner_id else None
+        entry = self._build_message_entry(message, channel, ticket_owner_id, ticket_owner)
+        # Images are only downloaded when the transcript is generated; link them until then.
+        entry["attachments"] = [attachment.url for attachment in message.attachments]
+        self._live_buffer.append((channel.id, message.id, entry))
+        if len(self._live_buffer) >= LIVE_FLUSH_MAX:
+            self._flush_live_messages()
+        elif self._live_flush_task is None:
+            self._live_flush_task = asyncio.create_task(self._flush_live_messages_later())
+
+    async def _flush_live_messages_later(self):
+        try:
+            await asyncio.sleep(LIVE_FLUSH_SECONDS)
+        finally:
+            self._live_flush_task = None
+        self._flush_live_messages()
+
+    def _flush_live_messages(self):
+        rows, self._live_buffer = self._live_buffer, []
+        if not rows:
+            return
+        try:
+            self.bot.db.append_live_messages(rows)
+        except Exception as e:
+            logger.warning("Failed to publish %d live messages: %s", len(rows), e)
+
+    async def cog_unload(self):
+        if self._live_flush_task is not None:
+            self._live_flush_task.cancel()
+        self._flush_live_messages()
+
 
 # Required for loading as an extension
 async def setup(bot):
@@ -2,6 +2,7 @@ import discord
 from discord.ext import commands
 import re
 import io
+import gzip
 import os
 import json
 import asyncio
@@ -16,6 +17,11 @@ DISALLOWED_CATEGORY = getattr(app_config, "DISALLOWED_CATEGORY", 0)
 TRANSCRIPT_DIR = getattr(app_config, "TRANSCRIPT_DIR", "transcripts")
 from bot import ClaimTicketButton  # your custom button class
 from note_manager import NoteManager
+from sampling_profiler import SamplingProfiler
+
+PROFILE_MAX_SECONDS = 120
+# Discord's default upload cap is 10 MB; compress folded stacks above this.
+PROFILE_GZIP_BYTES = 8 * 1024 * 1024
 
 
 class NotesView(discord.ui.View):
@@ -115,6 +121,69 @@ class TranscriptView(discord.ui.View):
         await interaction.response.edit_message(embed=self._build_embed())
 
 
+class SearchResultsView(discord.ui.View):
+    """Paginated view over full-text search hits; each page is fetched from the index on demand."""
+    PAGE_SIZE = 5
+
+    def __init__(self, search_index, query: str, ticket_hits: list):
+        super().__init__(timeout=180)
+        self.search_index = search_index
+        self.query = query
+        self.ticket_hits = ticket_hits
+        self.current_page = 0
+        self.hits = []
+        self.has_next = False
+
+    def load_page(self):
+        """Fetch the current page, plus one extra row to know whether a next page exists."""
+        rows = self.search_index.search_messages(
+            self.query,
+            limit=self.PAGE_SIZE + 1,
+            offset=self.current_page * self.PAGE_SIZE,
+        )
+        self.has_next = len(rows) > self.PAGE_SIZE
+        self.hits = rows[:self.PAGE_SIZE]
+
+    def _build_embed(self) -> discord.Embed:
+        """Build the embed for the current page of message hits."""
+        embed = discord.Embed(
+            title=f"🔎 Search: {self.query}",
+            color=discord.Color.blue(),
+            timestamp=discord.utils.utcnow()
+        )
+        if self.ticket_hits:
+            lines = [
+                f"`{t['channel_id']}` · {t.get('owner_name') or 'Unknown'} · {t.get('category') or '—'}"
+                for t in self.ticket_hits
+            ]
+            embed.add_field(name="Matching tickets", value="\n".join(lines)[:1024], inline=False)
+
+        if not self.hits:
+            embed.description = "No matching messages." if self.current_page == 0 else "No more results."
+        for hit in self.hits:
+            embed.add_field(
+                name=f"#{hit['channel_id']} · {hit.get('author') or 'Unknown'} · {(hit.get('timestamp') or '')[:16]}",
+                value=(hit.get("snippet") or "*No content*")[:1024],
+                inline=False
+            )
+        embed.set_footer(text=f"Page {self.current_page + 1}")
+        return embed
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.primary)
+    async def previous_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.current_page > 0:
+            self.current_page -= 1
+        await asyncio.to_thread(self.load_page)
+        await interaction.response.edit_message(embed=self._build_embed())
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.primary)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.has_next:
+            self.current_page += 1
+        await asyncio.to_thread(self.load_page)
+        await interaction.response.edit_message(embed=self._build_embed())
+
+
 def get_staff_position(member: discord.Member):
     """Return highest staff role of a member."""
     for role_id in STAFF_ROLES:
@@ -138,6 +207,7 @@ class StaffCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.note_manager = NoteManager(bot)
+        self._profiling = False
 
     # ------------------ Helpers ------------------
 
@@ -518,6 +588,102 @@ class StaffCommands(commands.Cog):
                     view = TranscriptView(entry["messages"], entry["channel"], entry["saved_at"])
                     await ctx.send(embed=view._build_embed(), view=view)
 
+    @commands.command(name="search")
+    @staff_or_manage_channels()
+    async def search_transcripts(self, ctx, *, query: str):
+        """Full-text search across saved transcripts, usernames and open/close reasons."""
+        search_index = getattr(self.bot, "search_index", None)
+        if search_index is None or not search_index.exists:
+            await ctx.send(embed=self.build_embed(
+                "Search Unavailable",
+                "The transcript search index has not been built yet.",
+                discord.Color.orange()
+            ))
+            return
+
+        ticket_hits = await asyncio.to_thread(search_index.search_tickets, query, 5)
+        view = SearchResultsView(search_index, query, ticket_hits)
+        await asyncio.to_thread(view.load_page)
+        await ctx.send(embed=view._build_embed(), view=view)
+
+    @commands.command(name="dbstats")
+    @staff_or_manage_channels()
+    async def db_stats(self, ctx, sort: str = "total"):
+        """Summarize the query shapes that dominate bot DB time since startup (or the last reset)."""
+        stats = getattr(self.bot.db, "stats", None)
+        if stats is None:
+            return
+        if sort == "reset":
+            stats.reset()
+            await ctx.send(embed=self.build_embed("DB Stats", "Query statistics reset.", discord.Color.green()))
+            return
+        if sort not in ("total", "avg", "max", "calls", "rows"):
+            sort = "total"
+
+        total_seconds = stats.total_seconds()
+        lines = []
+        for fingerprint, shape in stats.top(8, sort):
+            share = shape["total"] / total_seconds * 100 if total_seconds else 0
+            lines.append(
+                f"**{shape['calls']}×** · total {shape['total'] * 1000:.0f} ms ({share:.0f}%) · "
+                f"avg {shape['total'] / shape['calls'] * 1000:.1f} ms · max {shape['max'] * 1000:.0f} ms · "
+                f"{shape['rows'] / shape['calls']:.1f} rows"
+                + (f" · {shape['errors']} errors" if shape["errors"] else "")
+                + f"\n```sql\n{fingerprint[:180]}\n```"
+            )
+        description = "\n".join(lines) or "No queries recorded yet."
+        embed = self.build_embed(
+            f"DB Stats · top by {sort}",
+            description[:4000],
+            discord.Color.blurple(),
+            footer_text=(
+                f"{sum(s['calls'] for s in stats.shapes.values())} calls · {total_seconds:.2f}s total · "
+                f"{stats.slow_queries} slow · {stats.reconnects} reconnects · since {stats.since:%Y-%m-%d %H:%M}"
+            ),
+        )
+        await ctx.send(embed=embed)
+
+    @commands.command(name="profile")
+    @staff_or_manage_channels()
+    async def profile(self, ctx, seconds: int = 30):
+        """Sample the running bot's CPU stacks and asyncio tasks and upload flamegraph-ready stacks."""
+        if self._profiling:
+            await ctx.send(embed=self.build_embed("Profile", "⚠️ A profile is already running.", discord.Color.red()))
+            return
+        seconds = max(1, min(seconds, PROFILE_MAX_SECONDS))
+        self._profiling = True
+        try:
+            await ctx.send(embed=self.build_embed("Profile", f"⏱️ Sampling for {seconds}s...", discord.Color.orange()))
+            profiler = SamplingProfiler()
+            await profiler.run(seconds)
+        finally:
+            self._profiling = False
+
+        summary = profiler.summary()
+        hot = "\n".join(
+            f"`{count / profiler.samples * 100:5.1f}%` {frame[:150]}" for frame, count in summary["hot_frames"]
+        ) if profiler.samples else ""
+        waits = "\n".join(f"`{tasks:5.1f}` {site[:150]}" for site, tasks in summary["await_sites"])
+        embed = self.build_embed(
+            f"Profile · {summary['duration']:.1f}s",
+            f"Event loop busy in **{summary['loop_busy_share'] * 100:.0f}%** of {summary['samples']} samples "
+            f"(sampler overhead {summary['overhead_share'] * 100:.1f}%).",
+            discord.Color.blurple(),
+            footer_text="Open the .folded files with speedscope.app, flamegraph.pl or inferno.",
+        )
+        embed.add_field(name="Hot frames on the loop (share of samples)", value=(hot or "Idle.")[:1024], inline=False)
+        embed.add_field(name="Where tasks wait (avg tasks)", value=(waits or "No tasks.")[:1024], inline=False)
+
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+        files = []
+        for kind, stacks in (("cpu", profiler.cpu_stacks), ("tasks", profiler.task_stacks)):
+            data = profiler.folded(stacks).encode("utf-8")
+            name = f"profile-{stamp}-{kind}.folded"
+            if len(data) > PROFILE_GZIP_BYTES:
+                data, name = gzip.compress(data), name + ".gz"
+            files.append(discord.File(io.BytesIO(data), filename=name))
+        await ctx.send(embed=embed, files=files)
+
     @commands.command(name="remindme")
     @staff_or_manage_channels()
     async def remind_me(self, ctx, about: str, when: str):
@@ -1,9 +1,13 @@
 import mysql.connector
 from mysql.connector import errorcode
+import functools
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 import json
+import re
+import sys
+import time
 
 try:
     from config import DB_CONFIG
@@ -16,13 +20,80 @@ except Exception:
         "database": os.getenv("DB_NAME", "s1079393_ModMail"),
     }
 
+try:
+    from config import DB_SLOW_QUERY_MS
+except Exception:
+    DB_SLOW_QUERY_MS = int(os.getenv("DB_SLOW_QUERY_MS", "250"))
+
 logger = logging.getLogger("modmail.db")
 
+_LITERAL_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+# Frames from these files are skipped when reporting where a slow query came from.
+_INTERNAL_FILES = {"database_manager.py", "bot_metrics.py"}
+
+
+@functools.lru_cache(maxsize=1024)
+def query_fingerprint(query: str) -> str:
+    """Normalized query shape: whitespace collapsed, literals and placeholders as `?`, IN lists folded."""
+    shape = _LITERAL_RE.sub("?", " ".join(query.split())).replace("%s", "?")
+    return _IN_LIST_RE.sub("(...)", shape)
+
+
+def _caller_site() -> str:
+    frame = sys._getframe(1)
+    while frame is not None and os.path.basename(frame.f_code.co_filename) in _INTERNAL_FILES:
+        frame = frame.f_back
+    if frame is None:
+        return "unknown"
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+
+class QueryStats:
+    """Per-fingerprint call counts, time and row totals for everything routed through DatabaseManager."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.shapes = {}
+        self.reconnects = 0
+        self.slow_queries = 0
+        self.since = datetime.now()
+
+    def record(self, fingerprint: str, seconds: float, rows: int, failed: bool = False):
+        shape = self.shapes.get(fingerprint)
+        if shape is None:
+            shape = self.shapes[fingerprint] = {"calls": 0, "errors": 0, "total": 0.0, "max": 0.0, "rows": 0}
+        shape["calls"] += 1
+        shape["total"] += seconds
+        shape["rows"] += rows
+        if seconds > shape["max"]:
+            shape["max"] = seconds
+        if failed:
+            shape["errors"] += 1
+
+    def top(self, limit: int = 10, sort: str = "total"):
+        """[(fingerprint, stats)] ordered by total, avg, max, calls or rows, descending."""
+        def sort_key(item):
+            stats = item[1]
+            if sort == "avg":
+                return stats["total"] / stats["calls"]
+            return stats.get(sort, stats["total"])
+
+        return sorted(self.shapes.items(), key=sort_key, reverse=True)[:limit]
+
+    def total_seconds(self) -> float:
+        return sum(shape["total"] for shape in self.shapes.values())
+
 class DatabaseManager:
-    def __init__(self, bot):
+    def __init__(self, bot, conn=None):
         self.bot = bot
         self._user_notes_ready = False
-        self.conn = mysql.connector.connect(
+        self.stats = QueryStats()
+        self.slow_query_seconds = DB_SLOW_QUERY_MS / 1000
+        # `conn` lets the offline benchmarks hand in a mysql.connector-compatible stand-in.
+        self.conn = conn or mysql.connector.connect(
             host=DB_CONFIG["host"],
             port=DB_CONFIG["port"],
             user=DB_CONFIG["user"],
@@ -31,8 +102,11 @@ class DatabaseManager:
         )
 
     def _ensure_connection(self):
+        connection_id = getattr(self.conn, "connection_id", None)
         try:
             self.conn.ping(reconnect=True, attempts=3, delay=2)
+            if getattr(self.conn, "connection_id", None) != connection_id:
+                self.stats.reconnects += 1
         except Exception:
             self.conn = mysql.connector.connect(
                 host=DB_CONFIG["host"],
@@ -41,18 +115,49 @@ class DatabaseManager:
                 password=DB_CONFIG["password"],
                 database=DB_CONFIG["database"],
             )
+            self.stats.reconnects += 1
 
     def _new_cursor(self):
         self._ensure_connection()
         return self.conn.cursor(dictionary=True, buffered=True)
 
-    def _execute(self, query: str, params=None, *, commit: bool = False):
-        cursor = self._new_cursor()
+    def _run(self, cursor, query: str, params=None, fetch: str = None, many: bool = False):
+        """Execute (and optionally fetch) while recording the query shape's timing and row count."""
+        start = time.perf_counter()
+        rows = 0
+        failed = True
         try:
-            if params is None:
+            if many:
+                cursor.executemany(query, params)
+            elif params is None:
                 cursor.execute(query)
             else:
                 cursor.execute(query, params)
+            if fetch == "one":
+                result = cursor.fetchone()
+                rows = 1 if result else 0
+            elif fetch == "all":
+                result = cursor.fetchall()
+                rows = len(result)
+            else:
+                result = None
+                rows = max(cursor.rowcount, 0)
+            failed = False
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            fingerprint = query_fingerprint(query)
+            self.stats.record(fingerprint, elapsed, rows, failed)
+            if elapsed >= self.slow_query_seconds:
+                self.stats.slow_queries += 1
+                logger.warning(
+                    f"Slow query ({elapsed * 1000:.0f} ms, {rows} rows) from {_caller_site()}: {fingerprint[:300]}"
+                )
+
+    def _execute(self, query: str, params=None, *, commit: bool = False):
+        cursor = self._new_cursor()
+        try:
+            self._run(cursor, query, params)
             if commit:
                 self.conn.commit()
         finally:
@@ -61,22 +166,14 @@ class DatabaseManager:
     def _fetchone(self, query: str, params=None):
         cursor = self._new_cursor()
         try:
-            if params is None:
-                cursor.execute(query)
-            else:
-                cursor.execute(query, params)
-            return cursor.fetchone()
+            return self._run(cursor, query, params, fetch="one")
         finally:
             cursor.close()
 
     def _fetchall(self, query: str, params=None):
         cursor = self._new_cursor()
         try:
-            if params is None:
-                cursor.execute(query)
-            else:
-                cursor.execute(query, params)
-            return cursor.fetchall()
+            return self._run(cursor, query, params, fetch="all")
         finally:
             cursor.close()
 
@@ -84,6 +181,19 @@ class DatabaseManager:
         self._ensure_single_open_ticket_constraint()
         self._ensure_transcript_table()
         self._ensure_user_notes_table()
+        self._ensure_staff_activity_tables()
+        try:
+            # Resyncs assigned_open/assigned_closed with active_tickets on every start.
+            self.rebuild_assignment_metrics()
+        except mysql.connector.Error as err:
+            logger.warning(f"Could not rebuild assignment metrics: {err}")
+        self._ensure_rollup_tables()
+        self._ensure_staff_roster_table()
+        self._ensure_live_messages_table()
+        try:
+            self.prune_live_messages()
+        except mysql.connector.Error as err:
+            logger.warning(f"Could not prune live ticket snapshots: {err}")
         logger.info("Database connection established.")
 
     def _ensure_transcript_table(self):
@@ -112,6 +222,16 @@ class DatabaseManager:
             """,
             commit=True,
         )
+        # The viewer's ticket picker searches by owner-name prefix and closed date range.
+        for index_name, column in (
+            ("idx_ticket_transcripts_owner_name", "owner_name"),
+            ("idx_ticket_transcripts_closed_at", "closed_at"),
+        ):
+            try:
+                self._execute(f"CREATE INDEX {index_name} ON ticket_transcripts ({column})", commit=True)
+            except mysql.connector.Error as err:
+                if err.errno != errorcode.ER_DUP_KEYNAME:
+                    logger.warning(f"Could not create index {index_name}: {err}")
 
     def _ensure_user_notes_table(self):
         self._execute(
@@ -129,6 +249,113 @@ class DatabaseManager:
         )
         self._user_notes_ready = True
 
+    def _ensure_staff_activity_tables(self):
+        # Per-ticket contribution of each staff member; lets transcript re-saves
+        # be applied as deltas instead of double counting.
+        self._execute(
+            """
+            CREATE TABLE IF NOT EXISTS staff_ticket_activity (
+                channel_id BIGINT NOT NULL,
+                staff_id BIGINT NOT NULL,
+                replies INT NOT NULL DEFAULT 0,
+                closed TINYINT(1) NOT NULL DEFAULT 0,
+                PRIMARY KEY (channel_id, staff_id),
+                INDEX idx_staff_ticket_activity_staff_id (staff_id)
+            )
+            """,
+            commit=True,
+        )
+        self._execute(
+            """
+            CREATE TABLE IF NOT EXISTS staff_activity_metrics (
+                staff_id BIGINT PRIMARY KEY,
+                replies INT NOT NULL DEFAULT 0,
+                tickets_handled INT NOT NULL DEFAULT 0,
+                closes INT NOT NULL DEFAULT 0,
+                assigned_open INT NOT NULL DEFAULT 0,
+                assigned_closed INT NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            )
+            """,
+            commit=True,
+        )
+
+    def _ensure_rollup_tables(self):
+        self._execute(
+            """
+            CREATE TABLE IF NOT EXISTS ticket_daily_rollup (
+                day DATE NOT NULL,
+                category_id BIGINT NOT NULL DEFAULT 0,
+                opened INT NOT NULL DEFAULT 0,
+                closed INT NOT NULL DEFAULT 0,
+                resolution_minutes BIGINT NOT NULL DEFAULT 0,
+                resolved_count INT NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, category_id)
+            )
+            """,
+            commit=True,
+        )
+        self._execute(
+            """
+            CREATE TABLE IF NOT EXISTS staff_daily_rollup (
+                day DATE NOT NULL,
+                mod_id BIGINT NOT NULL,
+                mod_username VARCHAR(255) NULL,
+                closed INT NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, mod_id)
+            )
+            """,
+            commit=True,
+        )
+        self._execute(
+            """
+            CREATE TABLE IF NOT EXISTS ticket_rollup_state (
+                name VARCHAR(50) PRIMARY KEY,
+                last_day DATE NOT NULL
+            )
+            """,
+            commit=True,
+        )
+        # Rollups and the dashboards' live partial bucket range-scan these columns.
+        for index_name, column in (
+            ("idx_active_tickets_created_at", "created_at"),
+            ("idx_active_tickets_closed_at", "closed_at"),
+            ("idx_active_tickets_status", "status"),
+        ):
+            try:
+                self._execute(f"CREATE INDEX {index_name} ON active_tickets ({column})", commit=True)
+            except mysql.connector.Error as err:
+                if err.errno != errorcode.ER_DUP_KEYNAME:
+                    logger.warning(f"Could not create index {index_name}: {err}")
+
+    def _ensure_staff_roster_table(self):
+        self._execute(
+            """
+            CREATE TABLE IF NOT EXISTS staff_roster (
+                user_id BIGINT PRIMARY KEY,
+                username VARCHAR(255) NOT NULL,
+                display_name VARCHAR(255) NULL,
+                role_ids TEXT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            )
+            """,
+            commit=True,
+        )
+
+    def _ensure_live_messages_table(self):
+        self._execute(
+            """
+            CREATE TABLE IF NOT EXISTS ticket_live_messages (
+                message_id BIGINT PRIMARY KEY,
+                channel_id BIGINT NOT NULL,
+                message_json LONGTEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                INDEX idx_live_channel_message (channel_id, message_id)
+            )
+            """,
+            commit=True,
+        )
+
     def _parse_iso_datetime(self, value):
         if not value or not isinstance(value, str):
             return None
@@ -137,7 +364,7 @@ class DatabaseManager:
         except Exception:
             return None
 
-    def save_ticket_transcript(self, transcript_data: dict, closed_by: str = "System", close_reason: str = "Resolved"):
+    def save_ticket_transcript(self, transcript_data: dict, closed_by: str = "System", close_reason: str = "Resolved", closed_by_id: int = None):
         ticket = transcript_data.get("ticket", {}) if isinstance(transcript_data, dict) else {}
         messages = transcript_data.get("messages", []) if isinstance(transcript_data, dict) else []
 
@@ -203,8 +430,179 @@ class DatabaseManager:
             ),
             commit=True,
         )
+        try:
+            self.record_staff_activity(channel_id, messages, closed_by_id)
+        except mysql.connector.Error as err:
+            logger.warning(f"Could not update staff activity metrics for channel {channel_id}: {err}")
         return True
 
+    # ---------------- Staff activity metrics ----------------
+
+    def _bot_user_id(self):
+        user = getattr(self.bot, "user", None)
+        return getattr(user, "id", None)
+
+    def record_staff_activity(self, channel_id: int, messages: list, closed_by_id: int = None):
+        """Apply one transcript's staff replies/close to staff_activity_metrics as deltas."""
+        bot_user_id = self._bot_user_id()
+        new_rows = {}
+        for message in messages:
+            if str(message.get("role", "")).lower() != "staff":
+                continue
+            try:
+                author_id = int(message.get("author_id") or 0)
+            except (TypeError, ValueError):
+                continue
+            if not author_id or author_id == bot_user_id:
+                continue
+            row = new_rows.setdefault(author_id, {"replies": 0, "closed": 0})
+            row["replies"] += 1
+        if closed_by_id:
+            new_rows.setdefault(int(closed_by_id), {"replies": 0, "closed": 0})["closed"] = 1
+
+        old_rows = {
+            int(r["staff_id"]): {"replies": int(r["replies"]), "closed": int(r["closed"])}
+            for r in self._fetchall(
+                "SELECT staff_id, replies, closed FROM staff_ticket_activity WHERE channel_id=%s",
+                (channel_id,)
+            )
+        }
+        if not closed_by_id:
+            # A re-save without closer info must not undo a recorded close.
+            for staff_id, old in old_rows.items():
+                if old["closed"]:
+                    new_rows.setdefault(staff_id, {"replies": 0, "closed": 0})["closed"] = 1
+
+        deltas = []
+        for staff_id in old_rows.keys() | new_rows.keys():
+            old = old_rows.get(staff_id)
+            new = new_rows.get(staff_id)
+            d_replies = (new or {}).get("replies", 0) - (old or {}).get("replies", 0)
+            d_closes = (new or {}).get("closed", 0) - (old or {}).get("closed", 0)
+            d_handled = (1 if new else 0) - (1 if old else 0)
+            if d_replies or d_closes or d_handled:
+                deltas.append((staff_id, d_replies, d_handled, d_closes))
+        if not deltas:
+            return
+
+        cursor = self._new_cursor()
+        try:
+            self._run(cursor, "DELETE FROM staff_ticket_activity WHERE channel_id=%s", (channel_id,))
+            if new_rows:
+                self._run(
+                    cursor,
+                    "INSERT INTO staff_ticket_activity (channel_id, staff_id, replies, closed) VALUES (%s, %s, %s, %s)",
+                    [(channel_id, staff_id, r["replies"], r["closed"]) for staff_id, r in new_rows.items()],
+                    many=True,
+                )
+            self._run(
+                cursor,
+                """
+                INSERT INTO staff_activity_metrics (staff_id, replies, tickets_handled, closes)
+                VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    replies = replies + VALUES(replies),
+                    tickets_handled = tickets_handled + VALUES(tickets_handled),
+                    closes = closes + VALUES(closes)
+                """,
+                deltas,
+                many=True,
+            )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def _bump_assignment_metrics(self, staff_id, open_delta: int, closed_delta: int):
+        if not staff_id:
+            return
+        self._execute(
+            """
+            INSERT INTO staff_activity_metrics (staff_id, assigned_open, assigned_closed)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                assigned_open = GREATEST(assigned_open + VALUES(assigned_open), 0),
+                assigned_closed = assigned_closed + VALUES(assigned_closed)
+            """,
+            (staff_id, open_delta, closed_delta),
+            commit=True,
+        )
+
+    def staff_activity_backfill_done(self) -> bool:
+        row = self._fetchone("SELECT 1 FROM ticket_rollup_state WHERE name='staff_activity_backfill'")
+        return bool(row)
+
+    def backfill_staff_activity_batch(self, after_id: int = 0, limit: int = 50):
+        """
+        Fill staff replies/handled/closes from up to `limit` transcripts saved before the
+        activity tables existed, starting after ticket_transcripts.id `after_id`. Returns the
+        last id processed, or None once every transcript has been seen - at which point the
+        backfill is recorded as done. Safe to repeat: record_staff_activity applies deltas.
+        Needs the bot user known, so the bot's own messages aren't counted as staff replies.
+        """
+        rows = self._fetchall(
+            "SELECT id, channel_id, closed_by, transcript_json FROM ticket_transcripts WHERE id > %s ORDER BY id LIMIT %s",
+            (after_id, limit)
+        )
+        if not rows:
+            self._execute(
+                """
+                INSERT INTO ticket_rollup_state (name, last_day) VALUES ('staff_activity_backfill', CURDATE())
+                ON DUPLICATE KEY UPDATE last_day = VALUES(last_day)
+                """,
+                commit=True,
+            )
+            return None
+        for row in rows:
+            try:
+                data = json.loads(row["transcript_json"])
+            except ValueError:
+                continue
+            if not isinstance(data, dict):
+                continue
+            messages = [m for m in data.get("messages") or [] if isinstance(m, dict)]
+            closed_by_id = self._resolve_closer_id(row["closed_by"], messages)
+            self.record_staff_activity(row["channel_id"], messages, closed_by_id)
+        return rows[-1]["id"]
+
+    def _resolve_closer_id(self, closed_by: str, messages: list):
+        """
+        Map ticket_transcripts.closed_by (str(member) at close time) back to a user ID: a
+        staff author with that name in the transcript, else the staff roster.
+        """
+        name = (closed_by or "").strip()
+        if not name or name == "System":
+            return None
+        for message in messages:
+            if str(message.get("role", "")).lower() == "staff" and message.get("author") == name:
+                try:
+                    author_id = int(message.get("author_id") or 0)
+                except (TypeError, ValueError):
+                    continue
+                if author_id:
+                    return author_id
+        row = self._fetchone("SELECT user_id FROM staff_roster WHERE username=%s LIMIT 1", (name,))
+        return int(row["user_id"]) if row else None
+
+    def rebuild_assignment_metrics(self):
+        """Recompute assigned_open/assigned_closed for every staff member from active_tickets."""
+        self._execute("UPDATE staff_activity_metrics SET assigned_open = 0, assigned_closed = 0", commit=True)
+        self._execute(
+            """
+            INSERT INTO staff_activity_metrics (staff_id, assigned_open, assigned_closed)
+            SELECT mod_id, SUM(status = 'open'), SUM(status = 'closed')
+            FROM active_tickets
+            WHERE mod_id IS NOT NULL
+            GROUP BY mod_id
+            ON DUPLICATE KEY UPDATE
+                assigned_open = VALUES(assigned_open),
+                assigned_closed = VALUES(assigned_closed)
+            """,
+            commit=True,
+        )
+
     def _ensure_single_open_ticket_constraint(self):
         try:
             self._execute(
@@ -285,6 +683,10 @@ class DatabaseManager:
             raise
 
     def close_ticket_by_user(self, user_id: int):
+        closing_rows = self._fetchall(
+            "SELECT channel_id, mod_id FROM active_tickets WHERE user_id=%s AND status='open'",
+            (user_id,)
+        )
         self._execute(
             """
             UPDATE active_tickets 
@@ -294,8 +696,15 @@ class DatabaseManager:
             (user_id,),
             commit=True,
         )
+        for row in closing_rows:
+            self._bump_assignment_metrics(row["mod_id"], -1, 1)
+            self.clear_live_messages(row["channel_id"])
 
     def assign_mod_to_ticket(self, channel_id: int, mod_id: int, mod_username: str):
+        current = self._fetchone(
+            "SELECT mod_id FROM active_tickets WHERE channel_id=%s AND status='open' LIMIT 1",
+            (channel_id,)
+        )
         self._execute(
             """
             UPDATE active_tickets
@@ -305,6 +714,13 @@ class DatabaseManager:
             (mod_id, mod_username, channel_id),
             commit=True,
         )
+        if current is not None and current["mod_id"] != mod_id:
+            self._bump_assignment_metrics(current["mod_id"], -1, 0)
+            self._bump_assignment_metrics(mod_id, 1, 0)
+
+    def count_open_tickets(self):
+        row = self._fetchone("SELECT COUNT(*) AS n FROM active_tickets WHERE status='open'")
+        return row["n"] if row else 0
 
     def get_active_tickets(self):
         """Return all open tickets from the database."""
@@ -327,6 +743,10 @@ class DatabaseManager:
         )
 
     def close_ticket(self, channel_id: int, closed_at: datetime):
+        current = self._fetchone(
+            "SELECT mod_id FROM active_tickets WHERE channel_id=%s AND status='open' LIMIT 1",
+            (channel_id,)
+        )
         self._execute(
             """
             UPDATE active_tickets
@@ -337,6 +757,167 @@ class DatabaseManager:
             (closed_at, channel_id),
             commit=True,
         )
+        if current is not None:
+            self._bump_assignment_metrics(current["mod_id"], -1, 1)
+        # Every close path ends here, so the live snapshot never outlives the ticket.
+        self.clear_live_messages(channel_id)
+
+    # ---------------- Live ticket snapshots ----------------
+
+    def append_live_messages(self, rows):
+        """
+        Store open-ticket messages (transcript entry shape) in one round trip; `rows` are
+        (channel_id, message_id, entry). The viewer polls by message_id.
+        """
+        cursor = self._new_cursor()
+        try:
+            self._run(
+                cursor,
+                "INSERT IGNORE INTO ticket_live_messages (message_id, channel_id, message_json) VALUES (%s, %s, %s)",
+                [(message_id, channel_id, json.dumps(entry, ensure_ascii=False)) for channel_id, message_id, entry in rows],
+                many=True,
+            )
+            self.conn.commit()
+        finally:
+            cursor.close()
+
+    def clear_live_messages(self, channel_id: int):
+        self._execute("DELETE FROM ticket_live_messages WHERE channel_id=%s", (channel_id,), commit=True)
+
+    def prune_live_messages(self):
+        """Drop snapshots of tickets that are already closed (e.g. a write that landed after the close)."""
+        self._execute(
+            """
+            DELETE live FROM ticket_live_messages AS live
+            JOIN active_tickets AS t ON t.channel_id = live.channel_id
+            WHERE t.status = 'closed'
+            """,
+            commit=True,
+        )
+
+    # ---------------- Staff roster ----------------
+
+    def upsert_staff_member(self, user_id: int, username: str, display_name: str, role_ids):
+        self._execute(
+            """
+            INSERT INTO staff_roster (user_id, username, display_name, role_ids)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                username = VALUES(username),
+                display_name = VALUES(display_name),
+                role_ids = VALUES(role_ids)
+            """,
+            (user_id, username, display_name, ",".join(str(r) for r in sorted(role_ids))),
+            commit=True,
+        )
+
+    def remove_staff_member(self, user_id: int):
+        self._execute("DELETE FROM staff_roster WHERE user_id=%s", (user_id,), commit=True)
+
+    def replace_staff_roster(self, members):
+        """Resync the whole roster from (user_id, username, display_name, role_ids) tuples."""
+        rows = [
+            (user_id, username, display_name, ",".join(str(r) for r in sorted(role_ids)))
+            for user_id, username, display_name, role_ids in members
+        ]
+        cursor = self._new_cursor()
+        try:
+            self._run(cursor, "DELETE FROM staff_roster")
+            if rows:
+                self._run(
+                    cursor,
+                    "INSERT INTO staff_roster (user_id, username, display_name, role_ids) VALUES (%s, %s, %s, %s)",
+                    rows,
+                    many=True,
+                )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    # ---------------- Daily rollups ----------------
+
+    def pending_rollup_days(self):
+        """Return the finished days (before the DB's CURDATE()) that have not been rolled up yet."""
+        row = self._fetchone("SELECT CURDATE() AS today")
+        today = row["today"]
+        state = self._fetchone("SELECT last_day FROM ticket_rollup_state WHERE name='daily'")
+        if state:
+            start = state["last_day"] + timedelta(days=1)
+        else:
+            first = self._fetchone("SELECT DATE(MIN(created_at)) AS first_day FROM active_tickets")
+            if not first or first["first_day"] is None:
+                return []
+            start = first["first_day"]
+        days = []
+        day = start
+        while day < today:
+            days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def rollup_ticket_day(self, day):
+        """Recompute ticket_daily_rollup/staff_daily_rollup for one finished day and advance the watermark."""
+        cursor = self._new_cursor()
+        try:
+            self._run(cursor, "DELETE FROM ticket_daily_rollup WHERE day=%s", (day,))
+            self._run(cursor, "DELETE FROM staff_daily_rollup WHERE day=%s", (day,))
+            self._run(
+                cursor,
+                """
+                INSERT INTO ticket_daily_rollup (day, category_id, opened)
+                SELECT %s, COALESCE(category_id, 0), COUNT(*)
+                FROM active_tickets
+                WHERE created_at >= %s AND created_at < %s + INTERVAL 1 DAY
+                GROUP BY COALESCE(category_id, 0)
+                """,
+                (day, day, day),
+            )
+            self._run(
+                cursor,
+                """
+                INSERT INTO ticket_daily_rollup (day, category_id, closed, resolution_minutes, resolved_count)
+                SELECT %s, COALESCE(category_id, 0), COUNT(*),
+                       COALESCE(SUM(TIMESTAMPDIFF(MINUTE, created_at, closed_at)), 0),
+                       COUNT(created_at)
+                FROM active_tickets
+                WHERE status = 'closed' AND closed_at >= %s AND closed_at < %s + INTERVAL 1 DAY
+                GROUP BY COALESCE(category_id, 0)
+                ON DUPLICATE KEY UPDATE
+                    closed = VALUES(closed),
+                    resolution_minutes = VALUES(resolution_minutes),
+                    resolved_count = VALUES(resolved_count)
+                """,
+                (day, day, day),
+            )
+            self._run(
+                cursor,
+                """
+                INSERT INTO staff_daily_rollup (day, mod_id, mod_username, closed)
+                SELECT %s, mod_id, MAX(mod_username), COUNT(*)
+                FROM active_tickets
+                WHERE status = 'closed' AND mod_id IS NOT NULL
+                  AND closed_at >= %s AND closed_at < %s + INTERVAL 1 DAY
+                GROUP BY mod_id
+                """,
+                (day, day, day),
+            )
+            self._run(
+                cursor,
+                """
+                INSERT INTO ticket_rollup_state (name, last_day) VALUES ('daily', %s)
+                ON DUPLICATE KEY UPDATE last_day = GREATEST(last_day, VALUES(last_day))
+                """,
+                (day,),
+            )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
 
     def get_dx_response(self, key: str):
         row = self._fetchone("SELECT response FROM dx_responses WHERE `key`=%s LIMIT 1", (key,))
@@ -372,6 +953,10 @@ class DatabaseManager:
     def get_pending_timers(self):
         return self._fetchall("SELECT * FROM ticket_timers WHERE status='pending'")
 
+    def count_pending_timers(self):
+        row = self._fetchone("SELECT COUNT(*) AS n FROM ticket_timers WHERE status='pending'")
+        return row["n"] if row else 0
+
 
 
     def add_watcher(self, channel_id: int, mod_id: int):
@@ -0,0 +1,190 @@
+"""
+Discord HTTP client - pooled keep-alive HTTPS connections for the viewer's REST calls.
+
+Tracks Discord's per-route rate-limit buckets (`X-RateLimit-*` headers) and the
+global limit, waits out an exhausted bucket instead of hitting a 429, retries
+429s after `Retry-After`, and caches idempotent GET responses for a per-call TTL.
+Stdlib only and thread-safe, since Streamlit serves each session on its own thread.
+"""
+import copy
+import hashlib
+import http.client
+import json
+import logging
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+
+logger = logging.getLogger("modmail.http")
+
+USER_AGENT = "DiscordBot (https://ccac-moussemail.streamlit.app, 1.0)"
+RETRY_STATUSES = {429, 502, 503, 504}
+# Never sleep longer than this for a single rate-limit wait; surface an error instead.
+MAX_RATE_LIMIT_WAIT = 30.0
+
+
+class DiscordHTTPError(Exception):
+    def __init__(self, status: int, body: str):
+        super().__init__(f"HTTP {status}: {body[:300]}")
+        self.status = status
+        self.body = body
+
+
+class DiscordHTTPClient:
+    def __init__(self, max_connections: int = 4, timeout: float = 20, max_retries: int = 3):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._pools = {}
+        self._lock = threading.Lock()
+        self._route_buckets = {}
+        self._buckets = {}
+        self._global_reset_at = 0.0
+        self._cache = {}
+
+    # ---------------- Connections ----------------
+
+    def _pool(self, host: str) -> queue.LifoQueue:
+        with self._lock:
+            pool = self._pools.get(host)
+            if pool is None:
+                pool = queue.LifoQueue(maxsize=self.max_connections)
+                self._pools[host] = pool
+            return pool
+
+    def _acquire(self, host: str):
+        try:
+            return self._pool(host).get_nowait(), True
+        except queue.Empty:
+            return http.client.HTTPSConnection(host, timeout=self.timeout), False
+
+    def _release(self, host: str, conn):
+        try:
+            self._pool(host).put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _send(self, method: str, host: str, path: str, headers: dict, body: bytes):
+        conn, reused = self._acquire(host)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            payload = response.read()
+        except (http.client.HTTPException, ConnectionError, OSError):
+            conn.close()
+            if not reused:
+                raise
+            # The server closed an idle keep-alive connection; retry once on a fresh one.
+            conn = http.client.HTTPSConnection(host, timeout=self.timeout)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                payload = response.read()
+            except Exception:
+                conn.close()
+                raise
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(host, conn)
+        return response.status, response.headers, payload
+
+    # ---------------- Rate limits ----------------
+
+    def _wait_for_bucket(self, route: str):
+        with self._lock:
+            wait = self._global_reset_at - time.monotonic()
+            bucket = self._buckets.get(self._route_buckets.get(route))
+            if bucket:
+                if bucket["remaining"] <= 0:
+                    wait = max(wait, bucket["reset_at"] - time.monotonic())
+                else:
+                    # Claim a slot so concurrent callers can't overspend the bucket.
+                    bucket["remaining"] -= 1
+        if wait > 0:
+            if wait > MAX_RATE_LIMIT_WAIT:
+                raise DiscordHTTPError(429, f"rate limited for another {wait:.1f}s on {route}")
+            time.sleep(wait)
+
+    def _record_limits(self, route: str, status: int, headers, payload: bytes):
+        now = time.monotonic()
+        with self._lock:
+            bucket_id = headers.get("X-RateLimit-Bucket")
+            if bucket_id:
+                self._route_buckets[route] = bucket_id
+                try:
+                    self._buckets[bucket_id] = {
+                        "remaining": int(headers.get("X-RateLimit-Remaining", 1)),
+                        "reset_at": now + float(headers.get("X-RateLimit-Reset-After", 0)),
+                    }
+                except ValueError:
+                    pass
+            if status == 429 and (headers.get("X-RateLimit-Global") or headers.get("X-RateLimit-Scope") == "global"):
+                self._global_reset_at = now + self._retry_after(headers, payload)
+
+    @staticmethod
+    def _retry_after(headers, payload: bytes) -> float:
+        value = headers.get("Retry-After")
+        if value is None:
+            try:
+                value = json.loads(payload or b"{}").get("retry_after")
+            except ValueError:
+                value = None
+        try:
+            return max(float(value), 0.0)
+        except (TypeError, ValueError):
+            return 1.0
+
+    # ---------------- Requests ----------------
+
+    def request_json(self, url: str, *, method: str = "GET", headers: dict = None, data: bytes = None, cache_ttl: float = 0):
+        """
+        Perform a request and decode the JSON body. GETs with `cache_ttl > 0` are
+        served from the response cache (keyed by URL and Authorization header).
+        Raises DiscordHTTPError for non-2xx responses once retries are exhausted.
+        """
+        merged_headers = {"User-Agent": USER_AGENT}
+        if headers:
+            merged_headers.update(headers)
+
+        cache_key = None
+        if method == "GET" and cache_ttl > 0:
+            auth = merged_headers.get("Authorization", "")
+            cache_key = (url, hashlib.sha256(auth.encode("utf-8")).hexdigest())
+            with self._lock:
+                hit = self._cache.get(cache_key)
+            if hit and hit[0] > time.monotonic():
+                return copy.deepcopy(hit[1])
+
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        route = f"{method} {parts.path}"
+
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_bucket(route)
+            status, response_headers, payload = self._send(method, parts.netloc, path, merged_headers, data)
+            self._record_limits(route, status, response_headers, payload)
+
+            if status in RETRY_STATUSES and attempt < self.max_retries:
+                delay = self._retry_after(response_headers, payload) if status == 429 else 0.5 * (2 ** attempt)
+                if delay > MAX_RATE_LIMIT_WAIT:
+                    break
+                logger.info(f"{route} returned {status}; retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+            break
+
+        text = payload.decode("utf-8") if payload else ""
+        if not 200 <= status < 300:
+            raise DiscordHTTPError(status, text)
+        result = json.loads(text) if text else {}
+
+        if cache_key is not None:
+            with self._lock:
+                self._cache[cache_key] = (time.monotonic() + cache_ttl, result)
+                if len(self._cache) > 512:
+                    now = time.monotonic()
+                    self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+            return copy.deepcopy(result)
+        return result
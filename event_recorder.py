@@ -0,0 +1,216 @@
+"""
+Event recorder - opt-in capture of the gateway events the bot handles, for replay.
+
+Appends one compact JSON line per DM, ticket-channel or command message, typing
+start, component interaction and channel delete, timestamped relative to the start
+of the session. Nothing identifying is written: user, channel and message IDs become
+salted pseudonyms (stable within a session, not reversible without the salt), and
+message text is reduced to its length plus the command word (`%r`, `!key`).
+Role and category IDs are kept, since they are server configuration.
+`benchmarks/replay.py` feeds a log back through the bot's handlers.
+
+A path ending in `.gz` is written gzip-compressed. Lines are buffered and written
+in batches, so recording costs the event loop a dict build and a list append.
+"""
+import gzip
+import hashlib
+import hmac
+import json
+import logging
+import os
+import re
+import secrets
+import time
+from datetime import datetime, timezone
+
+import discord
+
+logger = logging.getLogger("modmail.recorder")
+
+LOG_VERSION = 1
+RECORDED_EVENTS = ("message", "typing", "interaction", "guild_channel_delete")
+COMMAND_PREFIXES = ("%", "!")
+FLUSH_EVENTS = 256
+FLUSH_SECONDS = 2.0
+_TOPIC_OWNER = re.compile(r"\((\d{17,20})\)")
+_PSEUDONYM_CACHE_LIMIT = 100_000
+
+
+def _open_log(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class EventRecorder:
+    def __init__(self, path: str, ticket_category_ids=(), salt: str = None):
+        self.path = path
+        self.ticket_category_ids = set(ticket_category_ids)
+        self._salt = (salt or secrets.token_hex(16)).encode("utf-8")
+        self._pseudonyms = {}
+        self._buffer = []
+        self._file = None
+        self._started = None
+        self._last_flush = 0.0
+        self._disabled = False
+        self.recorded = 0
+
+    # ---------------- Sanitizing ----------------
+
+    def pseudonym(self, snowflake):
+        """Salted, snowflake-shaped (18 digit) stand-in for a Discord ID."""
+        if not snowflake:
+            return None
+        cached = self._pseudonyms.get(snowflake)
+        if cached is None:
+            if len(self._pseudonyms) >= _PSEUDONYM_CACHE_LIMIT:
+                self._pseudonyms.clear()
+            digest = hmac.new(self._salt, str(snowflake).encode("utf-8"), hashlib.sha256).digest()
+            cached = self._pseudonyms[snowflake] = 10**17 + int.from_bytes(digest[:8], "big") % (9 * 10**17)
+        return cached
+
+    def _user(self, user, me_id=None) -> dict:
+        if user is None:
+            return {}
+        if me_id and user.id == me_id:
+            return {"me": 1}
+        fields = {"u": self.pseudonym(user.id)}
+        if getattr(user, "bot", False):
+            fields["b"] = 1
+        roles = [role.id for role in getattr(user, "roles", ()) if role.id != getattr(getattr(user, "guild", None), "id", None)]
+        if roles:
+            fields["r"] = roles
+        permissions = getattr(user, "guild_permissions", None)
+        if permissions is not None and permissions.manage_channels:
+            fields["mc"] = 1
+        return fields
+
+    def _channel(self, channel) -> dict:
+        if channel is None:
+            return {}
+        if isinstance(channel, discord.DMChannel):
+            return {"dm": 1}
+        fields = {"ch": self.pseudonym(channel.id)}
+        category_id = getattr(channel, "category_id", None)
+        if category_id:
+            fields["cat"] = category_id
+        match = _TOPIC_OWNER.search(getattr(channel, "topic", None) or "")
+        if match:
+            fields["to"] = self.pseudonym(int(match.group(1)))
+        return fields
+
+    def _is_relevant(self, channel, content: str = "") -> bool:
+        if isinstance(channel, discord.DMChannel):
+            return True
+        if getattr(channel, "category_id", None) in self.ticket_category_ids:
+            return True
+        return content.startswith(COMMAND_PREFIXES)
+
+    def sanitize(self, event: str, args, me_id=None):
+        """The log entry for a dispatched event, or None when it isn't one we replay."""
+        if event == "message":
+            message = args[0]
+            content = message.content or ""
+            if not self._is_relevant(message.channel, content):
+                return None
+            entry = {"e": "message", **self._user(message.author, me_id), **self._channel(message.channel)}
+            if content:
+                entry["n"] = len(content)
+                if content.startswith(COMMAND_PREFIXES):
+                    entry["cmd"] = content.split(maxsplit=1)[0][:32]
+            if message.attachments:
+                entry["at"] = [[attachment.content_type or "", attachment.size] for attachment in message.attachments]
+            if message.embeds:
+                entry["em"] = [len(embed.title or "") + len(embed.description or "") for embed in message.embeds]
+            if message.reference is not None:
+                entry["ref"] = 1
+            return entry
+        if event == "typing":
+            channel, user = args[0], args[1]
+            if not self._is_relevant(channel):
+                return None
+            return {"e": "typing", **self._user(user, me_id), **self._channel(channel)}
+        if event == "interaction":
+            interaction = args[0]
+            if interaction.type != discord.InteractionType.component:
+                return None
+            data = interaction.data or {}
+            entry = {"e": "interaction", **self._user(interaction.user, me_id), **self._channel(interaction.channel)}
+            entry["ct"] = data.get("component_type")
+            if data.get("values"):
+                entry["vs"] = [str(value)[:50] for value in data["values"]]
+            return entry
+        if event == "guild_channel_delete":
+            channel = args[0]
+            if getattr(channel, "category_id", None) not in self.ticket_category_ids:
+                return None
+            return {"e": "guild_channel_delete", **self._channel(channel)}
+        return None
+
+    # ---------------- Writing ----------------
+
+    def record(self, event: str, *args, me_id=None):
+        """Buffer a dispatched event. Never raises: a broken recorder disables itself."""
+        if self._disabled or event not in RECORDED_EVENTS:
+            return
+        try:
+            entry = self.sanitize(event, args, me_id=me_id)
+            if entry is None:
+                return
+            now = time.monotonic()
+            if self._started is None:
+                self._start_session(now)
+            entry = {"t": round(now - self._started, 3), **entry}
+            self._buffer.append(json.dumps(entry, separators=(",", ":")))
+            self.recorded += 1
+            if len(self._buffer) >= FLUSH_EVENTS or now - self._last_flush >= FLUSH_SECONDS:
+                self.flush()
+        except Exception as e:
+            logger.warning(f"Event recording disabled after an error: {e}")
+            self._disabled = True
+
+    def _start_session(self, now: float):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = _open_log(self.path, "a")
+        self._started = self._last_flush = now
+        header = {"e": "session", "v": LOG_VERSION, "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+        self._buffer.append(json.dumps(header, separators=(",", ":")))
+        logger.info(f"Recording gateway events to {self.path}")
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        if not self._buffer or self._file is None:
+            return
+        lines, self._buffer = self._buffer, []
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+
+    def close(self):
+        if self._file is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+            self._file = None
+            self._started = None
+
+
+def read_event_log(path: str):
+    """Yield the entries of a recorded log in order, with `t` made continuous across sessions."""
+    offset = 0.0
+    last = 0.0
+    with _open_log(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if entry.get("e") == "session":
+                offset = last
+                continue
+            entry["t"] = offset + entry.get("t", 0.0)
+            last = entry["t"]
+            yield entry
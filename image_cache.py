@@ -0,0 +1,55 @@
+"""
+Image cache - on-disk thumbnails for transcript images.
+
+Thumbnails are written once per source image (by the bot when it saves an
+attachment, or by the viewer on first view) into a `.thumbs` directory next to
+the image. File names carry a fingerprint of the source path, mtime and size, so
+a changed image gets a new thumbnail instead of a stale one.
+"""
+import hashlib
+import logging
+import os
+
+logger = logging.getLogger("modmail.images")
+
+THUMB_MAX_SIZE = (480, 480)
+THUMB_DIRNAME = ".thumbs"
+
+
+def image_fingerprint(path: str) -> str:
+    """Short content-version key for an image file."""
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}:{st.st_mtime_ns}:{st.st_size}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def thumbnail_path(src: str, fingerprint: str = None, thumb_dir: str = None) -> str:
+    fingerprint = fingerprint or image_fingerprint(src)
+    thumb_dir = thumb_dir or os.path.join(os.path.dirname(src), THUMB_DIRNAME)
+    stem = os.path.splitext(os.path.basename(src))[0]
+    return os.path.join(thumb_dir, f"{stem}.{fingerprint}.jpg")
+
+
+def ensure_thumbnail(src: str, fingerprint: str = None, thumb_dir: str = None, max_size=THUMB_MAX_SIZE):
+    """Return the cached thumbnail path for `src`, generating it on first use. None on failure."""
+    try:
+        target = thumbnail_path(src, fingerprint, thumb_dir)
+        if os.path.exists(target):
+            return target
+        # Imported here so cache hits (and the viewer's cold start) never load Pillow.
+        from PIL import Image
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with Image.open(src) as img:
+            img.thumbnail(max_size)
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            # Write then rename so a concurrent reader never sees a partial file.
+            tmp_path = f"{target}.{os.getpid()}.tmp"
+            img.save(tmp_path, "JPEG", quality=80, optimize=True)
+        os.replace(tmp_path, target)
+        return target
+    except Exception as err:
+        logger.warning(f"Could not create thumbnail for {src}: {err}")
+        return None
+
@@ -0,0 +1,181 @@
+"""
+Loop watchdog - continuous event-loop lag measurement with stack capture of whatever
+is blocking the loop.
+
+A heartbeat task on the loop stamps the time every `interval`. A daemon thread
+checks the stamp; once it is more than `threshold` late the loop is stalled, and the
+thread grabs the loop thread's current stack (sys._current_frames) - i.e. the code
+that is holding the loop, typically a synchronous MySQL call, a transcript write or
+a TranscriptManager JSON rewrite. When the loop comes back the stall's duration is
+known; the heartbeat records it in the metrics and aggregates it by call site, and
+`take_report()` hands the worst offenders to the bot's periodic report.
+
+Cheap enough to leave on: one short sleep per interval on the loop, a thread waking
+a few times per interval to compare two floats, and stack capture only during a stall.
+C code that holds the GIL for the whole stall (a giant json.dumps) is attributed
+to the line that called it, captured as soon as the GIL is released.
+"""
+import asyncio
+import collections
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+logger = logging.getLogger("modmail.watchdog")
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+STACK_DEPTH = 12
+MAX_SITES = 200
+
+
+def _is_project_frame(filename: str) -> bool:
+    path = os.path.abspath(filename)
+    return path.startswith(PROJECT_ROOT + os.sep) and f"{os.sep}site-packages{os.sep}" not in path
+
+
+def short_path(filename: str) -> str:
+    path = os.path.abspath(filename)
+    if path.startswith(PROJECT_ROOT + os.sep):
+        return os.path.relpath(path, PROJECT_ROOT)
+    return "/".join(path.split(os.sep)[-2:])
+
+
+class _Stall:
+    __slots__ = ("started", "duration", "site", "stack")
+
+    def __init__(self, started: float):
+        self.started = started
+        self.duration = 0.0
+        self.site = None
+        self.stack = ""
+
+
+class LoopWatchdog:
+    def __init__(self, metrics=None, threshold: float = 0.25, interval: float = 0.1):
+        self.metrics = metrics
+        self.threshold = threshold
+        self.interval = interval
+        self._last_beat = None
+        self._loop_thread_id = None
+        self._finished = collections.deque()
+        self._stop = threading.Event()
+        self._thread = None
+        self._sites = {}
+        self._report_started = time.monotonic()
+        self.stalls = 0
+        self.blocked_seconds = 0.0
+        self.worst_stall = 0.0
+
+    # ---------------- Loop side ----------------
+
+    async def run(self):
+        """Run forever on the bot's loop: heartbeat and stall bookkeeping."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._start_thread()
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                self._last_beat = time.monotonic()
+                if self._finished:
+                    self._collect()
+        finally:
+            self.stop()
+
+    def _collect(self):
+        while self._finished:
+            stall = self._finished.popleft()
+            self.stalls += 1
+            self.blocked_seconds += stall.duration
+            self.worst_stall = max(self.worst_stall, stall.duration)
+            if self.metrics is not None:
+                self.metrics.event_loop_stall_seconds.observe(stall.duration)
+            site = self._sites.get(stall.site)
+            if site is None:
+                if len(self._sites) >= MAX_SITES:
+                    continue
+                site = self._sites[stall.site] = {"count": 0, "total": 0.0, "max": 0.0, "stack": stall.stack}
+            site["count"] += 1
+            site["total"] += stall.duration
+            site["max"] = max(site["max"], stall.duration)
+            logger.debug(f"Event loop blocked {stall.duration * 1000:.0f} ms at {stall.site}")
+
+    def take_report(self, limit: int = 5):
+        """(summary, details) for stalls since the last report, worst call sites first; None when quiet."""
+        self._collect()
+        if not self._sites:
+            self._report_started = time.monotonic()
+            return None
+        sites = sorted(self._sites.items(), key=lambda item: item[1]["total"], reverse=True)
+        count = sum(site["count"] for _, site in sites)
+        total = sum(site["total"] for _, site in sites)
+        minutes = (time.monotonic() - self._report_started) / 60
+        summary = (
+            f"{count} event-loop stalls over {self.threshold * 1000:.0f} ms in the last {minutes:.0f} min, "
+            f"{total:.1f}s blocked in total across {len(sites)} call sites."
+        )
+        blocks = []
+        for name, site in sites[:limit]:
+            blocks.append(
+                f"{name}: {site['count']}x, {site['total']:.2f}s total, worst {site['max'] * 1000:.0f} ms\n{site['stack']}"
+            )
+        self._sites = {}
+        self._report_started = time.monotonic()
+        return summary, "\n\n".join(blocks)
+
+    # ---------------- Watcher thread ----------------
+
+    def _start_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+        poll = min(self.interval, self.threshold) / 2
+        stall = None
+        stalled_beat = None
+        while not self._stop.wait(poll):
+            beat = self._last_beat
+            if beat is None:
+                continue
+            overdue = time.monotonic() - beat - self.interval
+            if stall is None:
+                if overdue >= self.threshold:
+                    stall = _Stall(beat + self.interval)
+                    stalled_beat = beat
+                    self._capture(stall)
+            elif beat != stalled_beat:
+                stall.duration = beat - stall.started
+                self._finished.append(stall)
+                stall = None
+
+    def _capture(self, stall: _Stall):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            stall.site = "unknown"
+            return
+        frames = traceback.extract_stack(frame, limit=STACK_DEPTH)
+        del frame
+        # Call site = the innermost bot frame plus its two nearest bot callers (so every
+        # DatabaseManager method doesn't collapse into _run), then the blocking library call.
+        innermost = frames[-1] if frames else None
+        project = [entry for entry in reversed(frames) if _is_project_frame(entry.filename)]
+        parts = []
+        if project:
+            callers = "".join(f" <- {entry.name}" for entry in project[1:3])
+            parts.append(f"{short_path(project[0].filename)}:{project[0].lineno} {project[0].name}{callers}")
+        if innermost is not None and (not project or innermost is not project[0]):
+            parts.append(f"{short_path(innermost.filename)}:{innermost.lineno} {innermost.name}")
+        stall.site = " -> ".join(parts) or "unknown"
+        stall.stack = "\n".join(
+            f"{short_path(entry.filename)}:{entry.lineno} {entry.name}: {(entry.line or '').strip()}"
+            for entry in frames
+        )
@@ -0,0 +1,141 @@
+"""
+Sampling profiler - low-overhead CPU stack and asyncio task sampling for the live bot.
+
+A daemon thread snapshots every thread's Python stack (sys._current_frames) every
+`interval`, and a coroutine on the loop records what each asyncio task is awaiting
+every `task_interval`. Nothing is traced or patched, so the bot runs at full speed
+between samples. Output is in the collapsed ("folded") stack format
+(`frame;frame;frame count` per line) that flamegraph.pl, speedscope and inferno
+read directly.
+"""
+import asyncio
+import collections
+import os
+import sys
+import threading
+import time
+
+from loop_watchdog import short_path
+
+MAX_DEPTH = 128
+_IDLE_FILES = ("selectors.py",)
+
+
+def _label(code) -> str:
+    return f"{code.co_name} ({short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _frame_stack(frame):
+    """Labels for `frame` and its callers, outermost first."""
+    labels = []
+    while frame is not None and len(labels) < MAX_DEPTH:
+        labels.append(_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def _await_chain(coro):
+    """Labels along a suspended coroutine's await chain, outermost first, ending in what it waits on."""
+    labels = []
+    while coro is not None and len(labels) < MAX_DEPTH:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            labels.append(f"<{type(coro).__name__}>")
+            break
+        labels.append(_label(frame.f_code))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return labels
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.01, task_interval: float = 0.05):
+        self.interval = interval
+        self.task_interval = task_interval
+        self.cpu_stacks = collections.Counter()
+        self.task_stacks = collections.Counter()
+        self.loop_leaves = collections.Counter()
+        self.await_sites = collections.Counter()
+        self.samples = 0
+        self.task_samples = 0
+        self.loop_busy = 0
+        self.duration = 0.0
+        self.overhead = 0.0
+
+    async def run(self, seconds: float):
+        """Sample for `seconds`; must be awaited on the loop being profiled."""
+        loop = asyncio.get_running_loop()
+        loop_thread_id = threading.get_ident()
+        stop = threading.Event()
+        thread = threading.Thread(target=self._sample_threads, args=(stop, loop_thread_id), name="sampling-profiler", daemon=True)
+        start = time.perf_counter()
+        thread.start()
+        try:
+            deadline = loop.time() + seconds
+            while loop.time() < deadline:
+                self._sample_tasks()
+                await asyncio.sleep(self.task_interval)
+        finally:
+            stop.set()
+            await asyncio.to_thread(thread.join)
+            self.duration = time.perf_counter() - start
+
+    # ---------------- Sampling ----------------
+
+    def _sample_threads(self, stop: threading.Event, loop_thread_id: int):
+        own_id = threading.get_ident()
+        while not stop.wait(self.interval):
+            began = time.perf_counter()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            frames = sys._current_frames()
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                stack = _frame_stack(frame)
+                if not stack:
+                    continue
+                thread_name = names.get(thread_id, str(thread_id))
+                if thread_id == loop_thread_id:
+                    thread_name = f"{thread_name} (event loop)"
+                    leaf_file = os.path.basename(frame.f_code.co_filename)
+                    if leaf_file not in _IDLE_FILES:
+                        self.loop_busy += 1
+                        self.loop_leaves[stack[-1]] += 1
+                self.cpu_stacks[";".join([thread_name, *stack])] += 1
+            # Don't keep the sampled frames (and everything they reference) alive until the next sample.
+            frames = frame = None
+            self.samples += 1
+            self.overhead += time.perf_counter() - began
+
+    def _sample_tasks(self):
+        current = asyncio.current_task()
+        for task in asyncio.all_tasks():
+            if task is current or task.done():
+                continue
+            chain = _await_chain(task.get_coro())
+            if not chain:
+                continue
+            self.task_stacks[";".join(chain)] += 1
+            leaf = chain[-1] if not chain[-1].startswith("<") or len(chain) == 1 else chain[-2]
+            self.await_sites[leaf] += 1
+        self.task_samples += 1
+
+    # ---------------- Output ----------------
+
+    @staticmethod
+    def folded(stacks: collections.Counter) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+    def summary(self, top: int = 8) -> dict:
+        return {
+            "duration": self.duration,
+            "samples": self.samples,
+            "task_samples": self.task_samples,
+            "loop_busy_share": self.loop_busy / self.samples if self.samples else 0.0,
+            "overhead_share": self.overhead / self.duration if self.duration else 0.0,
+            "hot_frames": self.loop_leaves.most_common(top),
+            "await_sites": [
+                (site, count / self.task_samples if self.task_samples else 0.0)
+                for site, count in self.await_sites.most_common(top)
+            ],
+        }
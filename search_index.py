@@ -0,0 +1,333 @@
+"""
+Search index - local SQLite FTS5 full-text index over tickets and transcript messages.
+
+The bot writes to it whenever a transcript is saved; the Streamlit viewer and the
+`%search` staff command read from it. Each call opens its own short-lived
+connection, so the index can be shared between the bot and viewer processes.
+"""
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+from contextlib import closing
+from pathlib import Path
+
+logger = logging.getLogger("modmail.search")
+
+TICKET_COLUMNS = (
+    "owner_id",
+    "owner_name",
+    "member_username",
+    "mod_username",
+    "closed_by",
+    "category",
+    "open_reason",
+    "close_reason",
+)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS tickets (
+        channel_id      INTEGER PRIMARY KEY,
+        owner_id        TEXT,
+        owner_name      TEXT,
+        member_username TEXT,
+        mod_username    TEXT,
+        closed_by       TEXT,
+        category        TEXT,
+        open_reason     TEXT,
+        close_reason    TEXT,
+        opened_at       TEXT,
+        closed_at       TEXT,
+        message_count   INTEGER DEFAULT 0
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS ticket_fts USING fts5(
+        owner_id, owner_name, member_username, mod_username, closed_by,
+        category, open_reason, close_reason,
+        content='tickets', content_rowid='channel_id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS messages (
+        id         INTEGER PRIMARY KEY,
+        channel_id INTEGER NOT NULL,
+        position   INTEGER NOT NULL,
+        timestamp  TEXT,
+        author     TEXT,
+        role       TEXT,
+        content    TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_messages_channel ON messages (channel_id, position)",
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS message_fts USING fts5(
+        author, content,
+        content='messages', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_ai AFTER INSERT ON tickets BEGIN
+        INSERT INTO ticket_fts (rowid, owner_id, owner_name, member_username, mod_username,
+                                closed_by, category, open_reason, close_reason)
+        VALUES (new.channel_id, new.owner_id, new.owner_name, new.member_username, new.mod_username,
+                new.closed_by, new.category, new.open_reason, new.close_reason);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_ad AFTER DELETE ON tickets BEGIN
+        INSERT INTO ticket_fts (ticket_fts, rowid, owner_id, owner_name, member_username, mod_username,
+                                closed_by, category, open_reason, close_reason)
+        VALUES ('delete', old.channel_id, old.owner_id, old.owner_name, old.member_username, old.mod_username,
+                old.closed_by, old.category, old.open_reason, old.close_reason);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+        INSERT INTO message_fts (rowid, author, content) VALUES (new.id, new.author, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+        INSERT INTO message_fts (message_fts, rowid, author, content)
+        VALUES ('delete', old.id, old.author, old.content);
+    END
+    """,
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(text: str) -> str:
+    """Turn free text into a safe FTS5 MATCH expression (every term, prefix-matched)."""
+    tokens = _TOKEN_RE.findall(text or "")
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _text(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+class TranscriptSearchIndex:
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._ready = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @property
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def setup(self):
+        """Create the index file and schema if needed. Safe to call repeatedly."""
+        if self._ready:
+            return True
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with closing(self._connect()) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                conn.commit()
+            self._ready = True
+        except sqlite3.Error as err:
+            logger.warning(f"Search index unavailable at {self.path}: {err}")
+        return self._ready
+
+    # ---------------- Writes ----------------
+
+    def index_ticket(self, channel_id: int, **fields):
+        """Insert or update the ticket document, keeping any fields not passed in."""
+        if not channel_id or not self.setup():
+            return False
+        try:
+            with closing(self._connect()) as conn:
+                self._upsert_ticket(conn, int(channel_id), fields)
+                conn.commit()
+            return True
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to index ticket {channel_id}: {err}")
+            return False
+
+    def _upsert_ticket(self, conn, channel_id: int, fields: dict):
+        existing = conn.execute("SELECT * FROM tickets WHERE channel_id = ?", (channel_id,)).fetchone()
+        row = dict(existing) if existing else {"channel_id": channel_id}
+        for key, value in fields.items():
+            if key == "message_count":
+                row[key] = int(value or 0)
+            elif _text(value) is not None:
+                row[key] = _text(value)
+
+        conn.execute("DELETE FROM tickets WHERE channel_id = ?", (channel_id,))
+        conn.execute(
+            """
+            INSERT INTO tickets (channel_id, owner_id, owner_name, member_username, mod_username,
+                                 closed_by, category, open_reason, close_reason,
+                                 opened_at, closed_at, message_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                channel_id,
+                row.get("owner_id"),
+                row.get("owner_name"),
+                row.get("member_username"),
+                row.get("mod_username"),
+                row.get("closed_by"),
+                row.get("category"),
+                row.get("open_reason"),
+                row.get("close_reason"),
+                row.get("opened_at"),
+                row.get("closed_at"),
+                row.get("message_count") or 0,
+            ),
+        )
+
+    def index_transcript(self, transcript_data: dict, closed_by: str = None, close_reason: str = None):
+        """Replace the indexed messages and ticket document for one saved transcript."""
+        ticket = transcript_data.get("ticket", {}) if isinstance(transcript_data, dict) else {}
+        messages = transcript_data.get("messages", []) if isinstance(transcript_data, dict) else []
+        channel_id = ticket.get("channel_id") if isinstance(ticket, dict) else None
+        if not channel_id or not self.setup():
+            return False
+
+        open_reason = None
+        for message in messages:
+            if message.get("role") == "user" and (message.get("content") or "").strip():
+                open_reason = (message.get("content") or "").strip()
+                break
+
+        rows = [
+            (
+                int(channel_id),
+                position,
+                _text(message.get("timestamp") or message.get("ts")),
+                _text(message.get("author")),
+                _text(message.get("role")),
+                message.get("content") or "",
+            )
+            for position, message in enumerate(messages)
+            if isinstance(message, dict)
+        ]
+
+        try:
+            with closing(self._connect()) as conn:
+                conn.execute("DELETE FROM messages WHERE channel_id = ?", (int(channel_id),))
+                conn.executemany(
+                    "INSERT INTO messages (channel_id, position, timestamp, author, role, content) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._upsert_ticket(conn, int(channel_id), {
+                    "owner_id": ticket.get("owner_id"),
+                    "owner_name": ticket.get("owner_name"),
+                    "closed_by": closed_by or ticket.get("closed_by"),
+                    "category": ticket.get("category"),
+                    "open_reason": open_reason,
+                    "close_reason": close_reason or ticket.get("close_reason"),
+                    "opened_at": messages[0].get("timestamp") if messages and isinstance(messages[0], dict) else None,
+                    "closed_at": ticket.get("closed_at"),
+                    "message_count": len(rows),
+                })
+                conn.commit()
+            return True
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to index transcript for channel {channel_id}: {err}")
+            return False
+
+    def rebuild_from_directory(self, transcript_dir: str) -> int:
+        """Index every `<channel_id>.json` transcript in a directory. Returns the count indexed."""
+        count = 0
+        for path in sorted(Path(transcript_dir).glob("*.json")):
+            if not path.stem.isdigit():
+                continue
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except Exception:
+                continue
+            if isinstance(data, dict) and self.index_transcript(data):
+                count += 1
+        return count
+
+    # ---------------- Reads ----------------
+
+    def search_tickets(self, query: str, limit: int = 25, offset: int = 0):
+        """Ranked ticket matches on usernames, ids, category and open/close reasons."""
+        match = build_match_query(query)
+        if not match or not self.exists:
+            return []
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    """
+                    SELECT t.*, bm25(ticket_fts) AS rank
+                    FROM ticket_fts
+                    JOIN tickets t ON t.channel_id = ticket_fts.rowid
+                    WHERE ticket_fts MATCH ?
+                    ORDER BY rank
+                    LIMIT ? OFFSET ?
+                    """,
+                    (match, int(limit), int(offset)),
+                ).fetchall()
+            return [dict(r) for r in rows]
+        except sqlite3.Error as err:
+            logger.warning(f"Ticket search failed for {query!r}: {err}")
+            return []
+
+    def search_messages(self, query: str, limit: int = 25, offset: int = 0):
+        """Ranked message matches on content and author, with a highlighted snippet."""
+        match = build_match_query(query)
+        if not match or not self.exists:
+            return []
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    """
+                    SELECT m.channel_id, m.position, m.timestamp, m.author, m.role,
+                           snippet(message_fts, 1, '**', '**', '…', 16) AS snippet,
+                           bm25(message_fts) AS rank
+                    FROM message_fts
+                    JOIN messages m ON m.id = message_fts.rowid
+                    WHERE message_fts MATCH ?
+                    ORDER BY rank
+                    LIMIT ? OFFSET ?
+                    """,
+                    (match, int(limit), int(offset)),
+                ).fetchall()
+            return [dict(r) for r in rows]
+        except sqlite3.Error as err:
+            logger.warning(f"Message search failed for {query!r}: {err}")
+            return []
+
+    def is_empty(self) -> bool:
+        if not self.exists:
+            return True
+        try:
+            with closing(self._connect()) as conn:
+                return conn.execute("SELECT 1 FROM tickets LIMIT 1").fetchone() is None
+        except sqlite3.Error:
+            return True
+
+
+if __name__ == "__main__":
+    from transcript_catalog import default_path
+
+    # Backfill: python search_index.py <transcript_dir> [index_path]
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    source_dir = sys.argv[1] if len(sys.argv) > 1 else "transcripts"
+    index_path = sys.argv[2] if len(sys.argv) > 2 else default_path(source_dir, "search_index.sqlite3")
+    indexed = TranscriptSearchIndex(index_path).rebuild_from_directory(source_dir)
+    logger.info(f"Indexed {indexed} transcripts from {source_dir} into {index_path}")
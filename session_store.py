@@ -0,0 +1,151 @@
+"""
+Session store - SQLite-backed login sessions and member-role cache for the viewer.
+
+Sessions survive a Streamlit restart and are shared between worker processes.
+Session tokens are stored only as SHA-256 hashes. Member roles are cached in a
+separate table with their own TTL, so restoring a session doesn't have to call
+the Discord API on every page load.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+logger = logging.getLogger("modmail.sessions")
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS sessions (
+        token_hash TEXT PRIMARY KEY,
+        payload    TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at)",
+    """
+    CREATE TABLE IF NOT EXISTS member_roles (
+        user_id    TEXT PRIMARY KEY,
+        role_ids   TEXT NOT NULL,
+        fetched_at REAL NOT NULL
+    )
+    """,
+)
+
+
+def _hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class SessionStore:
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._ready = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def setup(self):
+        """Create the store file and schema if needed. Safe to call repeatedly."""
+        if self._ready:
+            return True
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with closing(self._connect()) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                conn.commit()
+            self._ready = True
+        except sqlite3.Error as err:
+            logger.warning(f"Session store unavailable at {self.path}: {err}")
+        return self._ready
+
+    # ---------------- Sessions ----------------
+
+    def get_session(self, token: str):
+        """Return the stored auth payload for a live session token, or None."""
+        if not token or not self.setup():
+            return None
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT payload FROM sessions WHERE token_hash = ? AND expires_at > ?",
+                    (_hash_token(token), time.time()),
+                ).fetchone()
+            return json.loads(row["payload"]) if row else None
+        except (sqlite3.Error, ValueError) as err:
+            logger.warning(f"Failed to read session: {err}")
+            return None
+
+    def put_session(self, token: str, payload: dict, ttl_seconds: int):
+        if not self.setup():
+            return False
+        try:
+            with closing(self._connect()) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sessions (token_hash, payload, expires_at) VALUES (?, ?, ?)",
+                    (_hash_token(token), json.dumps(payload), time.time() + ttl_seconds),
+                )
+                conn.commit()
+            return True
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to store session: {err}")
+            return False
+
+    def delete_session(self, token: str):
+        if not token or not self.setup():
+            return
+        try:
+            with closing(self._connect()) as conn:
+                conn.execute("DELETE FROM sessions WHERE token_hash = ?", (_hash_token(token),))
+                conn.commit()
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to delete session: {err}")
+
+    def prune(self):
+        """Drop expired sessions."""
+        if not self.setup():
+            return
+        try:
+            with closing(self._connect()) as conn:
+                conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),))
+                conn.commit()
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to prune sessions: {err}")
+
+    # ---------------- Member roles ----------------
+
+    def get_roles(self, user_id: str, ttl_seconds: int):
+        """Return the cached role id set for a user if fetched within `ttl_seconds`, else None."""
+        if not self.setup():
+            return None
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT role_ids FROM member_roles WHERE user_id = ? AND fetched_at > ?",
+                    (str(user_id), time.time() - ttl_seconds),
+                ).fetchone()
+            return {int(r) for r in json.loads(row["role_ids"])} if row else None
+        except (sqlite3.Error, ValueError) as err:
+            logger.warning(f"Failed to read cached roles for {user_id}: {err}")
+            return None
+
+    def put_roles(self, user_id: str, role_ids):
+        if not self.setup():
+            return
+        try:
+            with closing(self._connect()) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO member_roles (user_id, role_ids, fetched_at) VALUES (?, ?, ?)",
+                    (str(user_id), json.dumps(sorted(int(r) for r in role_ids)), time.time()),
+                )
+                conn.commit()
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to cache roles for {user_id}: {err}")
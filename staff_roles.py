@@ -0,0 +1,21 @@
+"""
+Staff roles - the guild and role IDs that make a member staff, shared by the viewer's
+login check and the bot's staff_roster sync so the two can't disagree.
+
+Override with STAFF_GUILD_ID and STAFF_ACCESS_ROLE_IDS in config.py.
+"""
+try:
+    import config as app_config
+except Exception:
+    app_config = None
+
+STAFF_GUILD_ID = int(getattr(app_config, "STAFF_GUILD_ID", 0) if app_config else 0) or 1240448660266029126
+
+# Role IDs in STAFF_GUILD_ID.
+CCAC_ALLOWED_ROLE_IDS = set(getattr(app_config, "STAFF_ACCESS_ROLE_IDS", ()) if app_config else ()) or {
+    1334289756539846656,  # Jr. mod
+    1243559774847766619,  # mod
+    1243929060145631262,  # admin
+    1240455108047671406,  # owner
+    1243929202785386527,  # tech
+}
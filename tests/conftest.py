@@ -0,0 +1,41 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+# The bot's modules live at the repository root rather than in a package.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+
+ADMIN_ROLE_ID = 1243929060145631262
+
+
+@pytest.fixture
+def viewer_page(tmp_path, monkeypatch):
+    """The full viewer script on the Logs section, signed in as an admin, working in tmp_path without MySQL."""
+    import viewer.app
+    import viewer.core
+    from viewer.timing import SECTION_MODULES
+
+    for key in ("DISCORD_CLIENT_ID", "DISCORD_CLIENT_SECRET", "DISCORD_REDIRECT_URI"):
+        monkeypatch.setenv(key, "test")
+    for module in [viewer.core, viewer.app] + [importlib.import_module(name) for name in SECTION_MODULES]:
+        for flag in ("MYSQL_AVAILABLE", "SQLALCHEMY_AVAILABLE", "PYMYSQL_AVAILABLE"):
+            if hasattr(module, flag):
+                monkeypatch.setattr(module, flag, False)
+    monkeypatch.setattr(viewer.app, "query_mysql_tickets", lambda: [])
+    monkeypatch.setattr(viewer.app, "query_mysql_transcripts_map", lambda: {})
+    monkeypatch.chdir(tmp_path)
+
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(REPO_ROOT, "streamlit_transcripts.py"), default_timeout=60)
+    app.session_state["discord_auth"] = {
+        "access_token": "",
+        "user": {"id": "200000000000000001", "username": "staff1", "global_name": "Staff One", "discriminator": "0", "avatar": ""},
+        "role_ids": [ADMIN_ROLE_ID],
+    }
+    app.session_state["section_key"] = "logs"
+    return app
@@ -0,0 +1,90 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from database_manager import DatabaseManager, QueryStats, query_fingerprint
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("SELECT * FROM t WHERE a = 5 AND b = 'x'", "SELECT * FROM t WHERE a = ? AND b = ?"),
+        ('SELECT * FROM t WHERE s = "a\\"b" AND f = 2.5', "SELECT * FROM t WHERE s = ? AND f = ?"),
+        ("UPDATE t SET a=%s WHERE id=%s", "UPDATE t SET a=? WHERE id=?"),
+        ("SELECT * FROM t WHERE id IN (%s, %s, %s)", "SELECT * FROM t WHERE id IN (...)"),
+        ("SELECT * FROM t WHERE id IN (1,2)", "SELECT * FROM t WHERE id IN (...)"),
+        ("SELECT col_1, t2.x FROM table2 t2 WHERE v = 3", "SELECT col_1, t2.x FROM table2 t2 WHERE v = ?"),
+        ("SELECT *\n   FROM t\n  WHERE a = 1", "SELECT * FROM t WHERE a = ?"),
+    ],
+)
+def test_query_fingerprint(query, expected):
+    assert query_fingerprint(query) == expected
+
+
+def test_fingerprint_single_placeholder_in_list_is_not_folded():
+    assert query_fingerprint("SELECT * FROM t WHERE id IN (%s)") == "SELECT * FROM t WHERE id IN (?)"
+
+
+def _stats():
+    stats = QueryStats()
+    # fast: many cheap calls; slow: one expensive call; wide: returns the most rows.
+    for _ in range(10):
+        stats.record("fast", 0.02, rows=1)
+    stats.record("slow", 0.5, rows=1)
+    stats.record("wide", 0.05, rows=500)
+    stats.record("wide", 0.05, rows=500, failed=True)
+    return stats
+
+
+@pytest.mark.parametrize(
+    "sort, expected",
+    [
+        ("total", ["slow", "fast", "wide"]),
+        ("avg", ["slow", "wide", "fast"]),
+        ("max", ["slow", "wide", "fast"]),
+        ("calls", ["fast", "wide", "slow"]),
+        ("rows", ["wide", "fast", "slow"]),
+    ],
+)
+def test_query_stats_top_order(sort, expected):
+    assert [fingerprint for fingerprint, _ in _stats().top(sort=sort)] == expected
+
+
+def test_query_stats_top_limit_and_totals():
+    stats = _stats()
+    assert [fingerprint for fingerprint, _ in stats.top(limit=1)] == ["slow"]
+    assert stats.shapes["wide"]["errors"] == 1
+    assert stats.total_seconds() == pytest.approx(0.8)
+
+
+def _transcript(*messages):
+    return json.dumps({"ticket": {}, "messages": [
+        {"role": role, "author": author, "author_id": author_id, "content": "hi"} for role, author, author_id in messages
+    ]})
+
+
+def test_staff_activity_backfill_resolves_closers_and_records_completion():
+    from benchmarks.fakes import FakeMySQLConnection
+
+    conn = FakeMySQLConnection()
+    store = conn.store
+    store.add_roster_member(22, "bob")
+    # Closed by a staff member who replied; by one found only in the roster; by the system.
+    store.add_saved_transcript(1, _transcript(("user", "u", 9), ("staff", "alice", 11), ("staff", "alice", 11)), "alice")
+    store.add_saved_transcript(2, _transcript(("staff", "alice", 11), ("staff", "modmail", 99)), "bob")
+    store.add_saved_transcript(3, "not json")
+    db = DatabaseManager(SimpleNamespace(user=SimpleNamespace(id=99)), conn=conn)
+
+    assert not db.staff_activity_backfill_done()
+    after_id = 0
+    batches = 0
+    while after_id is not None:
+        after_id = db.backfill_staff_activity_batch(after_id, limit=2)
+        batches += 1
+
+    assert batches == 3
+    assert db.staff_activity_backfill_done()
+    assert store.staff_metrics[11] == {"replies": 3, "tickets_handled": 2, "closes": 1, "assigned_open": 0, "assigned_closed": 0}
+    assert store.staff_metrics[22]["closes"] == 1
+    assert 99 not in store.staff_metrics
@@ -0,0 +1,84 @@
+from datetime import date
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from benchmarks.viewer_data import make_messages  # noqa: E402
+from viewer.transcripts import (  # noqa: E402
+    KIND_CODES,
+    build_message_columns,
+    build_message_table,
+    message_day_bounds,
+    message_filter_mask,
+    rows_matching,
+)
+
+STAFF = ["staff0", "staff1", "staff2", "staff3"]
+MARKERS = ["internal note"]
+
+
+def _list_filters(rows, search_query="", authors=None, date_from=None, date_to=None):
+    """The list comprehensions render_transcript_view used before the vectorized masks."""
+    out = rows
+    if search_query:
+        q = search_query.lower()
+        out = [r for r in out if q in r["content_lower"] or q in r["author_lower"]]
+    if authors:
+        wanted = set(authors)
+        out = [r for r in out if r["raw_author"] in wanted]
+    if date_from and date_to:
+        out = [r for r in out if r["ts"] is None or date_from <= r["ts"].date() <= date_to]
+    return out
+
+
+@pytest.fixture(scope="module")
+def table():
+    # 45s apart, so 3000 messages span two days; add rows without a timestamp and with other offsets.
+    messages = make_messages(3000, image_ratio=0.0, seed=3)
+    messages[10]["timestamp"] = ""
+    messages[20]["timestamp"] = "2026-01-01T23:30:00-05:00"  # 2026-01-02 in UTC, 01-01 locally
+    messages[30]["timestamp"] = "2026-01-02T00:30:00+09:00"
+    messages[40]["timestamp"] = "not a timestamp"
+    rows = build_message_table(messages, MARKERS, STAFF)
+    return rows, build_message_columns(rows)
+
+
+@pytest.mark.parametrize(
+    "search_query, authors, date_from, date_to",
+    [
+        ("", None, None, None),
+        ("Refund", None, None, None),
+        ("no such words", None, None, None),
+        ("STAFF RESPONSE", None, None, None),
+        ("", ["staff1", "user3"], None, None),
+        ("", ["nobody"], None, None),
+        ("", None, date(2026, 1, 1), date(2026, 1, 1)),
+        ("", None, date(2026, 1, 2), date(2026, 1, 2)),
+        ("art", ["staff0"], date(2026, 1, 1), date(2026, 1, 2)),
+        ("e", ["user3", "staff2"], date(2026, 1, 2), date(2026, 1, 2)),
+    ],
+)
+def test_mask_matches_the_list_filters(table, search_query, authors, date_from, date_to):
+    rows, columns = table
+    expected = _list_filters(rows, search_query, authors, date_from, date_to)
+    mask = message_filter_mask(rows, columns, search_query, authors, date_from, date_to)
+
+    assert rows_matching(rows, mask) == expected
+    kind = columns["kind"]
+    assert rows_matching(rows, mask & (kind != KIND_CODES["internal"])) == [r for r in expected if r["kind"] in ("user", "staff")]
+    for name, code in KIND_CODES.items():
+        assert rows_matching(rows, mask & (kind == code)) == [r for r in expected if r["kind"] == name]
+
+
+def test_columns_match_the_rows(table):
+    rows, columns = table
+    assert columns["authors"] == sorted({r["raw_author"] for r in rows if r["raw_author"]})
+    valid = [r["ts"].date() for r in rows if r["ts"] is not None]
+    assert len(valid) < len(rows)
+    assert message_day_bounds(columns) == (min(valid), max(valid))
+
+
+def test_day_bounds_without_timestamps():
+    rows = build_message_table([{"author": "a", "content": "x", "timestamp": ""}], MARKERS, STAFF)
+    assert message_day_bounds(build_message_columns(rows)) is None
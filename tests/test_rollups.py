@@ -0,0 +1,91 @@
+from datetime import date
+
+import pytest
+
+import viewer.sections.stats as stats
+
+
+def _partial(**overrides):
+    partial = {
+        "watermark": "2026-03-09",
+        "today": "2026-03-10",
+        "open_count": 4,
+        "opens": [{"category_id": 1, "day": date(2026, 3, 10), "cnt": 2}],
+        "closed": 1,
+        "resolution_minutes": 30,
+        "resolved_count": 1,
+        "staff": [{"mod_id": 7, "mod_username": "alice", "closed_count": 1}],
+    }
+    partial.update(overrides)
+    return partial
+
+
+def _history():
+    return {
+        "by_category": [
+            {"category_id": 1, "opened": 10, "closed": 8, "mins": 450, "resolved": 8},
+            {"category_id": 2, "opened": 3, "closed": 3, "mins": 120, "resolved": 3},
+        ],
+        "daily": [{"day": date(2026, 3, 8), "cnt": 5}, {"day": date(2026, 3, 9), "cnt": 2}],
+        "staff": [
+            {"mod_id": 7, "mod_username": "alice_old", "closed_count": 6},
+            {"mod_id": 8, "mod_username": "bob", "closed_count": 5},
+        ],
+        "window_start": date(2026, 2, 8),
+    }
+
+
+@pytest.fixture
+def rollups(monkeypatch):
+    monkeypatch.setattr(stats, "query_live_ticket_partial", lambda: _partial())
+    monkeypatch.setattr(stats, "query_ticket_rollup_history", lambda watermark, today: _history())
+
+
+def test_ticket_stats_add_the_live_bucket_to_finished_days(rollups):
+    result = stats.query_ticket_stats()
+
+    assert result["by_status"] == {"open": 4, "closed": 12}
+    assert result["by_category"] == [{"category_id": 1, "cnt": 12}, {"category_id": 2, "cnt": 3}]
+    assert result["daily_opens"] == [
+        {"day": "2026-03-08", "cnt": 5}, {"day": "2026-03-09", "cnt": 2}, {"day": "2026-03-10", "cnt": 2},
+    ]
+    assert result["avg_resolution_hours"] == round(600 / 12 / 60, 1)
+
+
+def test_leaderboard_sums_rollups_and_live_closes_with_latest_name(rollups):
+    assert stats.query_staff_leaderboard() == [
+        {"mod_id": 7, "mod_username": "alice", "closed_count": 7},
+        {"mod_id": 8, "mod_username": "bob", "closed_count": 5},
+    ]
+
+
+def test_without_rollups_the_full_queries_are_used(monkeypatch):
+    monkeypatch.setattr(stats, "query_live_ticket_partial", lambda: None)
+    monkeypatch.setattr(stats, "_query_ticket_stats_full", lambda: "full stats")
+    monkeypatch.setattr(stats, "_query_staff_leaderboard_full", lambda: "full leaderboard")
+
+    assert stats.query_ticket_stats() == "full stats"
+    assert stats.query_staff_leaderboard() == "full leaderboard"
+
+
+@pytest.mark.parametrize(
+    "state, first_day, expected",
+    [
+        ({"last_day": date(2026, 3, 7)}, None, [date(2026, 3, 8), date(2026, 3, 9)]),
+        ({"last_day": date(2026, 3, 9)}, None, []),
+        (None, {"first_day": date(2026, 3, 9)}, [date(2026, 3, 9)]),
+        (None, {"first_day": None}, []),
+    ],
+)
+def test_pending_rollup_days_start_after_the_watermark(monkeypatch, state, first_day, expected):
+    from database_manager import DatabaseManager
+
+    answers = {
+        "SELECT CURDATE() AS today": {"today": date(2026, 3, 10)},
+        "SELECT last_day FROM ticket_rollup_state WHERE name='daily'": state,
+        "SELECT DATE(MIN(created_at)) AS first_day FROM active_tickets": first_day,
+    }
+    db = DatabaseManager.__new__(DatabaseManager)
+    monkeypatch.setattr(db, "_fetchone", lambda query, params=None: answers[query], raising=False)
+
+    assert db.pending_rollup_days() == expected
@@ -0,0 +1,78 @@
+import json
+
+from search_index import TranscriptSearchIndex, build_match_query
+
+
+def _transcript(channel_id, owner, *contents, closed_by="staff1"):
+    return {
+        "ticket": {"channel_id": channel_id, "owner_id": 300, "owner_name": owner, "category": "Contact", "closed_by": closed_by},
+        "messages": [
+            {"timestamp": f"2026-01-01T00:0{i}:00", "author": owner if i % 2 == 0 else "staff1",
+             "role": "user" if i % 2 == 0 else "staff", "content": content}
+            for i, content in enumerate(contents)
+        ],
+    }
+
+
+def test_build_match_query_prefix_matches_every_term_and_drops_syntax():
+    assert build_match_query('stolen "art" OR') == '"stolen"* "art"* "OR"*'
+    assert build_match_query("  -- ") == ""
+
+
+def test_index_transcript_and_search(tmp_path):
+    index = TranscriptSearchIndex(str(tmp_path / "index.sqlite3"))
+    assert index.is_empty()
+    index.index_transcript(_transcript(101, "moussecake", "Someone stole my artwork", "Looking into it"))
+    index.index_transcript(_transcript(102, "other", "Ban appeal please"))
+
+    assert not index.is_empty()
+    tickets = index.search_tickets("mousse")
+    assert [t["channel_id"] for t in tickets] == [101]
+    assert tickets[0]["open_reason"] == "Someone stole my artwork"
+    messages = index.search_messages("artw")
+    assert [(m["channel_id"], m["position"]) for m in messages] == [(101, 0)]
+    assert "**artwork**" in messages[0]["snippet"]
+    assert index.search_messages("") == []
+
+
+def test_reindexing_a_transcript_replaces_its_messages(tmp_path):
+    index = TranscriptSearchIndex(str(tmp_path / "index.sqlite3"))
+    index.index_transcript(_transcript(101, "moussecake", "first draft"))
+    index.index_transcript(_transcript(101, "moussecake", "final text"), close_reason="Resolved")
+
+    assert index.search_messages("draft") == []
+    assert [m["channel_id"] for m in index.search_messages("final")] == [101]
+    assert index.search_tickets("resolved")[0]["message_count"] == 1
+
+
+def test_rebuild_from_directory_skips_non_transcripts(tmp_path):
+    source = tmp_path / "transcripts"
+    source.mkdir()
+    (source / "101.json").write_text(json.dumps(_transcript(101, "alice", "hello")), encoding="utf-8")
+    (source / "102.json").write_text("{broken", encoding="utf-8")
+    (source / "notes.json").write_text(json.dumps(_transcript(103, "bob", "hi")), encoding="utf-8")
+
+    index = TranscriptSearchIndex(str(tmp_path / "index.sqlite3"))
+    assert index.rebuild_from_directory(str(source)) == 1
+    assert [t["channel_id"] for t in index.search_tickets("alice")] == [101]
+
+
+def test_logs_search_lists_mysql_user_matches_alongside_the_index(tmp_path, monkeypatch, viewer_page):
+    import viewer.sections.logs as logs
+
+    # The index only knows a newer, unrelated ticket; the user's older ticket is only in MySQL.
+    index = TranscriptSearchIndex(str(tmp_path / "transcripts.search_index.sqlite3"))
+    index.index_transcript(_transcript(900, "someoneelse", "hello"))
+    old_ticket = {"channel_id": 555, "member_username": "olduser", "mod_username": None, "status": "closed",
+                  "created_at": "2024-01-01", "closed_at": "2024-01-02"}
+    monkeypatch.setattr(logs, "query_user_tickets", lambda term: [old_ticket] if term == "olduser" else [])
+
+    viewer_page.run()
+    viewer_page.text_input(key="logs_search_q").input("olduser").run()
+
+    assert not viewer_page.exception, [error.message for error in viewer_page.exception]
+    assert any("#555" in m.value for m in viewer_page.markdown)
+    assert not any("No tickets or messages match" in i.value for i in viewer_page.info)
+
+    viewer_page.text_input(key="logs_search_q").input("nobody").run()
+    assert any("No tickets or messages match" in i.value for i in viewer_page.info)
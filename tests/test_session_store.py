@@ -0,0 +1,53 @@
+import sqlite3
+import time
+
+import pytest
+
+from session_store import SessionStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SessionStore(tmp_path / "sessions.sqlite3")
+
+
+def test_session_round_trip(store):
+    store.put_session("token", {"user": {"id": "1"}}, ttl_seconds=60)
+    assert store.get_session("token") == {"user": {"id": "1"}}
+    assert store.get_session("other") is None
+
+
+def test_expired_session_is_not_returned(store, monkeypatch):
+    store.put_session("token", {"user": {"id": "1"}}, ttl_seconds=60)
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert store.get_session("token") is None
+
+
+def test_delete_session(store):
+    store.put_session("token", {"user": {"id": "1"}}, ttl_seconds=60)
+    store.delete_session("token")
+    assert store.get_session("token") is None
+
+
+def test_prune_drops_only_expired_sessions(store):
+    store.put_session("old", {}, ttl_seconds=-1)
+    store.put_session("live", {"ok": True}, ttl_seconds=60)
+    store.prune()
+    with sqlite3.connect(store.path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 1
+    assert store.get_session("live") == {"ok": True}
+
+
+def test_tokens_are_stored_hashed(store):
+    store.put_session("plain-token", {}, ttl_seconds=60)
+    with sqlite3.connect(store.path) as conn:
+        (token_hash,) = conn.execute("SELECT token_hash FROM sessions").fetchone()
+    assert token_hash != "plain-token"
+
+
+def test_cached_roles_expire(store):
+    store.put_roles("1", {3, 2})
+    assert store.get_roles("1", ttl_seconds=60) == {2, 3}
+    assert store.get_roles("1", ttl_seconds=0) is None
+    assert store.get_roles("2", ttl_seconds=60) is None
@@ -0,0 +1,65 @@
+import json
+import os
+
+import pytest
+
+import transcript_catalog
+from transcript_catalog import TranscriptCatalog, default_path
+
+
+def _write(directory, channel_id, messages=0, ext=".json"):
+    path = os.path.join(directory, f"{channel_id}{ext}")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"ticket": {"owner_name": "owner"}, "messages": [{}] * messages}, f)
+    return path
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    transcript_dir = tmp_path / "transcripts"
+    transcript_dir.mkdir()
+    return TranscriptCatalog(default_path(str(transcript_dir), "catalog.sqlite3"), str(transcript_dir))
+
+
+def test_default_path_is_outside_the_transcript_dir(tmp_path):
+    path = default_path(str(tmp_path / "transcripts"), "catalog.sqlite3")
+    assert path == str(tmp_path / "transcripts.catalog.sqlite3")
+
+
+def test_refresh_skips_when_directory_unchanged(catalog):
+    _write(catalog.transcript_dir, 123456789012345678)
+    assert catalog.refresh() == 1
+    assert catalog.refresh() == 0
+
+
+def test_refresh_rescans_when_a_file_is_added_or_removed(catalog):
+    first = _write(catalog.transcript_dir, 123456789012345678)
+    catalog.refresh()
+    _write(catalog.transcript_dir, 223456789012345678)
+    assert catalog.refresh() == 1
+    os.remove(first)
+    assert catalog.refresh() == 1
+    assert set(catalog.paths()) == {"223456789012345678"}
+
+
+def test_in_place_rewrite_waits_for_the_full_rescan(catalog, monkeypatch):
+    path = _write(catalog.transcript_dir, 123456789012345678, messages=1)
+    catalog.refresh()
+    _write(catalog.transcript_dir, 123456789012345678, messages=5)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000))
+    # Rewriting an existing file doesn't change the directory mtime...
+    assert catalog.refresh() == 0
+    # ...so it is picked up by the periodic full pass (or a forced one).
+    monkeypatch.setattr(transcript_catalog, "FULL_RESCAN_SECONDS", 0)
+    assert catalog.refresh() == 1
+
+
+def test_search_orders_channel_ids_numerically(catalog):
+    for channel_id in (99999999999999999, 1000000000000000000, 123456789012345678):
+        _write(catalog.transcript_dir, channel_id)
+    catalog.refresh()
+    assert [row["channel_id"] for row in catalog.search()] == [
+        "1000000000000000000",
+        "123456789012345678",
+        "99999999999999999",
+    ]
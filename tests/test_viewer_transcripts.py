@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+pytest.importorskip("PIL")
+from PIL import Image  # noqa: E402
+
+CHANNEL_ID = "700000000000000001"
+
+
+def test_transcript_with_image_renders_in_every_tab(tmp_path, viewer_page):
+    images = tmp_path / "transcripts" / "images"
+    images.mkdir(parents=True)
+    Image.new("RGB", (1200, 900), "red").save(images / "a.png")
+    transcript = {
+        "ticket": {"channel_id": int(CHANNEL_ID), "category": "Contact", "owner_name": "user1"},
+        "messages": [
+            {"timestamp": "2026-01-01T00:00:00+00:00", "author": "user1", "author_id": 300000000000000001,
+             "role": "user", "content": "Here is a screenshot", "images": ["transcripts/images/a.png"], "attachments": []},
+            {"timestamp": "2026-01-01T00:01:00+00:00", "author": "staff1", "author_id": 200000000000000001,
+             "role": "staff", "content": "Thanks, looking now", "images": [], "attachments": []},
+        ],
+    }
+    (tmp_path / "transcripts" / f"{CHANNEL_ID}.json").write_text(json.dumps(transcript), encoding="utf-8")
+
+    viewer_page.query_params["channel"] = CHANNEL_ID
+    viewer_page.run()
+
+    assert not viewer_page.exception, [error.message for error in viewer_page.exception]
+    # Conversation and User Responses tabs both show the image, each with its own download button.
+    assert len(viewer_page.get("download_button")) == 2
+    assert (images / ".thumbs").is_dir()
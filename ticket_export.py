@@ -0,0 +1,263 @@
+"""
+Ticket export - stream active_tickets, transcript summaries and flattened transcript
+messages to CSV or Parquet.
+
+Rows are read through unbuffered (server-side) mysql.connector cursors in fixed-size
+`fetchmany` chunks and written out chunk by chunk, so exporting the full history
+runs in constant memory. `export_parts` rolls over to a new file once the current
+one passes a size cap. Parquet output needs pyarrow (optional).
+
+CLI:  python ticket_export.py {tickets,transcripts,messages} [-f csv|parquet] [-o PATH]
+"""
+import argparse
+import csv
+import json
+import logging
+import sys
+
+logger = logging.getLogger("modmail.export")
+
+DEFAULT_CHUNK_SIZE = 1000
+
+TICKET_COLUMNS = (
+    "channel_id", "user_id", "member_username", "mod_id", "mod_username", "category_id",
+    "channel_name", "ticket_type", "status", "created_at", "closed_at",
+)
+TRANSCRIPT_COLUMNS = (
+    "channel_id", "guild_id", "channel_name", "category_name", "owner_id", "owner_name",
+    "opened_by", "closed_by", "opened_at", "closed_at", "open_reason", "close_reason", "message_count",
+)
+MESSAGE_COLUMNS = (
+    "channel_id", "position", "timestamp", "author", "author_id", "role", "content",
+    "image_count", "attachment_count",
+)
+DATASETS = {
+    "tickets": TICKET_COLUMNS,
+    "transcripts": TRANSCRIPT_COLUMNS,
+    "messages": MESSAGE_COLUMNS,
+}
+
+
+def connect():
+    """Open a MySQL connection with the bot's DB_CONFIG."""
+    import mysql.connector
+
+    from database_manager import DB_CONFIG
+
+    return mysql.connector.connect(**DB_CONFIG)
+
+
+def _stream_query(conn, query: str, chunk_size: int):
+    """Yield lists of dict rows from an unbuffered cursor, `chunk_size` at a time."""
+    cursor = conn.cursor(dictionary=True, buffered=False)
+    try:
+        cursor.execute(query)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cursor.close()
+
+
+def _flatten_messages(channel_id, transcript_json: str):
+    try:
+        data = json.loads(transcript_json or "{}")
+    except ValueError:
+        return []
+    messages = data.get("messages", []) if isinstance(data, dict) else []
+    return [
+        {
+            "channel_id": channel_id,
+            "position": position,
+            "timestamp": message.get("timestamp") or message.get("ts"),
+            "author": message.get("author"),
+            "author_id": message.get("author_id"),
+            "role": message.get("role"),
+            "content": message.get("content") or "",
+            "image_count": len(message.get("images") or []),
+            "attachment_count": len(message.get("attachments") or []),
+        }
+        for position, message in enumerate(messages)
+        if isinstance(message, dict)
+    ]
+
+
+def iter_chunks(conn, dataset: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Yield lists of row dicts (keys = DATASETS[dataset]) for one dataset."""
+    if dataset == "tickets":
+        yield from _stream_query(
+            conn, f"SELECT {', '.join(TICKET_COLUMNS)} FROM active_tickets ORDER BY channel_id", chunk_size
+        )
+    elif dataset == "transcripts":
+        yield from _stream_query(
+            conn, f"SELECT {', '.join(TRANSCRIPT_COLUMNS)} FROM ticket_transcripts ORDER BY channel_id", chunk_size
+        )
+    elif dataset == "messages":
+        # One transcript's JSON is decoded at a time; message rows are re-chunked.
+        pending = []
+        for rows in _stream_query(
+            conn, "SELECT channel_id, transcript_json FROM ticket_transcripts ORDER BY channel_id", chunk_size
+        ):
+            for row in rows:
+                pending.extend(_flatten_messages(row["channel_id"], row["transcript_json"]))
+                while len(pending) >= chunk_size:
+                    yield pending[:chunk_size]
+                    pending = pending[chunk_size:]
+        if pending:
+            yield pending
+    else:
+        raise ValueError(f"Unknown dataset {dataset!r}; expected one of {', '.join(DATASETS)}")
+
+
+def write_csv(conn, dataset: str, fileobj, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Write a dataset as CSV to a text file object. Returns the number of rows written."""
+    writer = csv.DictWriter(fileobj, fieldnames=DATASETS[dataset], extrasaction="ignore")
+    writer.writeheader()
+    count = 0
+    for rows in iter_chunks(conn, dataset, chunk_size):
+        writer.writerows(rows)
+        count += len(rows)
+    return count
+
+
+class _CsvPart:
+    def __init__(self, dataset: str, path: str):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=DATASETS[dataset], extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def size(self) -> int:
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetPart:
+    """One Parquet file, one row group per chunk. Requires pyarrow."""
+
+    def __init__(self, dataset: str, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as err:
+            raise RuntimeError("Parquet export needs pyarrow. Install: pip install pyarrow") from err
+
+        self._pa = pa
+        self._columns = DATASETS[dataset]
+        # Stringify everything so row groups share one schema regardless of NULLs/DATETIMEs.
+        self._schema = pa.schema([(name, pa.string()) for name in self._columns])
+        self._sink = pa.OSFile(path, "wb")
+        self._writer = pq.ParquetWriter(self._sink, self._schema)
+
+    def write(self, rows):
+        table = self._pa.Table.from_pydict(
+            {name: [None if row.get(name) is None else str(row.get(name)) for row in rows] for name in self._columns},
+            schema=self._schema,
+        )
+        self._writer.write_table(table)
+
+    def size(self) -> int:
+        return self._sink.tell()
+
+    def close(self):
+        self._writer.close()
+        self._sink.close()
+
+
+_PART_WRITERS = {"csv": _CsvPart, "parquet": _ParquetPart}
+
+
+def write_parquet(conn, dataset: str, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Write a dataset as Parquet, one row group per chunk. Requires pyarrow."""
+    part = _ParquetPart(dataset, path)
+    count = 0
+    try:
+        for rows in iter_chunks(conn, dataset, chunk_size):
+            part.write(rows)
+            count += len(rows)
+    finally:
+        part.close()
+    return count
+
+
+def export_parts(
+    dataset: str,
+    fmt: str,
+    path_template: str,
+    max_bytes: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    conn=None,
+):
+    """
+    Export one dataset to `path_template.format(part=1)`, `...(part=2)`, ..., starting
+    a new file (with its own header/schema) once the current one reaches `max_bytes`.
+    Returns (row count, paths).
+    """
+    own_conn = conn is None
+    conn = conn or connect()
+    part_writer = _PART_WRITERS[fmt]
+    paths = []
+    part = None
+    count = 0
+    try:
+        for rows in iter_chunks(conn, dataset, chunk_size):
+            if part is None:
+                paths.append(path_template.format(part=len(paths) + 1))
+                part = part_writer(dataset, paths[-1])
+            part.write(rows)
+            count += len(rows)
+            if part.size() >= max_bytes:
+                part.close()
+                part = None
+        if not paths:
+            paths.append(path_template.format(part=1))
+            part = part_writer(dataset, paths[-1])
+    finally:
+        if part is not None:
+            part.close()
+        if own_conn:
+            conn.close()
+    return count, paths
+
+
+def export(dataset: str, fmt: str, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, conn=None) -> int:
+    """Export one dataset to `path` ('-' = stdout for CSV). Returns the row count."""
+    own_conn = conn is None
+    conn = conn or connect()
+    try:
+        if fmt == "parquet":
+            if path == "-":
+                raise ValueError("Parquet export needs an output path.")
+            return write_parquet(conn, dataset, path, chunk_size)
+        if path == "-":
+            return write_csv(conn, dataset, sys.stdout, chunk_size)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            return write_csv(conn, dataset, f, chunk_size)
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Stream tickets/transcripts/messages to CSV or Parquet.")
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("-f", "--format", choices=("csv", "parquet"), default="csv")
+    parser.add_argument("-o", "--output", default=None, help="Output path (default: <dataset>.<format>; '-' for stdout CSV)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    output = args.output or f"{args.dataset}.{args.format}"
+    count = export(args.dataset, args.format, output, args.chunk_size)
+    logger.info(f"Exported {count} {args.dataset} rows to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+"""
+Transcript catalogue - persistent SQLite index of the transcript files on disk.
+
+One row per `<channel_id>.json` / `<channel_id>.txt` with its mtime, size and a few
+summary fields, so the viewer never has to glob or parse the transcripts directory
+on a rerun. The bot records each file it writes; `refresh()` reconciles the rest
+incrementally, re-reading only files whose mtime or size changed.
+"""
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+from contextlib import closing
+
+logger = logging.getLogger("modmail.catalog")
+
+TRANSCRIPT_EXTENSIONS = (".json", ".txt")
+
+# Rewriting an existing file in place doesn't touch the directory mtime, so fall
+# back to a full stat pass at least this often.
+FULL_RESCAN_SECONDS = 600
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS transcripts (
+        channel_id    TEXT PRIMARY KEY,
+        path          TEXT NOT NULL,
+        mtime_ns      INTEGER NOT NULL,
+        size          INTEGER NOT NULL,
+        owner_id      TEXT,
+        owner_name    TEXT,
+        category      TEXT,
+        closed_at     TEXT,
+        message_count INTEGER DEFAULT 0
+    )
+    """,
+    # Back the viewer's ticket picker: owner-name prefix and closed-date range lookups.
+    "CREATE INDEX IF NOT EXISTS idx_transcripts_owner ON transcripts (owner_name COLLATE NOCASE)",
+    "CREATE INDEX IF NOT EXISTS idx_transcripts_closed ON transcripts (closed_at)",
+    # channel_id is TEXT for the prefix search; newest-first needs numeric order.
+    "CREATE INDEX IF NOT EXISTS idx_transcripts_channel_num ON transcripts (CAST(channel_id AS INTEGER))",
+    """
+    CREATE TABLE IF NOT EXISTS catalog_state (
+        key   TEXT PRIMARY KEY,
+        value TEXT
+    )
+    """,
+)
+
+
+def _summarize(path: str) -> dict:
+    """Summary fields for the catalogue row; .txt transcripts have none."""
+    if not path.endswith(".json"):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    ticket = data.get("ticket") if isinstance(data.get("ticket"), dict) else {}
+    messages = data.get("messages") if isinstance(data.get("messages"), list) else []
+    return {
+        "owner_id": str(ticket["owner_id"]) if ticket.get("owner_id") else None,
+        "owner_name": ticket.get("owner_name"),
+        "category": ticket.get("category"),
+        "closed_at": ticket.get("closed_at"),
+        "message_count": len(messages),
+    }
+
+
+def _prefix_upper(prefix: str) -> str:
+    """Smallest string greater than every string starting with `prefix` (for index range scans)."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def default_path(transcript_dir: str, name: str) -> str:
+    """
+    `<parent>/<dir>.<name>` beside the transcripts directory. SQLite's -wal/-shm files
+    come and go with every connection, so a database inside the directory would bump
+    its mtime and defeat `refresh()`'s skip check.
+    """
+    directory = os.path.abspath(transcript_dir)
+    return os.path.join(os.path.dirname(directory), f"{os.path.basename(directory)}.{name}")
+
+
+def move_legacy_database(old_path: str, new_path: str) -> bool:
+    """Move a database (and its -wal/-shm files) from its old default location, once."""
+    if os.path.exists(new_path) or not os.path.exists(old_path):
+        return False
+    try:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(old_path + suffix):
+                os.replace(old_path + suffix, new_path + suffix)
+    except OSError as err:
+        logger.warning(f"Could not move {old_path} to {new_path}: {err}")
+        return False
+    logger.info(f"Moved {old_path} to {new_path}")
+    return True
+
+
+def _channel_id_for(name: str):
+    stem, ext = os.path.splitext(name)
+    if ext in TRANSCRIPT_EXTENSIONS and stem.isdigit():
+        return stem
+    return None
+
+
+class TranscriptCatalog:
+    def __init__(self, path: str, transcript_dir: str):
+        self.path = str(path)
+        self.transcript_dir = str(transcript_dir)
+        self._ready = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def setup(self):
+        """Create the catalogue file and schema if needed. Safe to call repeatedly."""
+        if self._ready:
+            return True
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if os.path.dirname(os.path.abspath(self.path)) == os.path.abspath(self.transcript_dir):
+                logger.warning(
+                    f"Transcript catalogue {self.path} is inside {self.transcript_dir}; "
+                    "its own writes change the directory mtime, so every refresh rescans"
+                )
+            with closing(self._connect()) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                conn.commit()
+            self._ready = True
+        except sqlite3.Error as err:
+            logger.warning(f"Transcript catalogue unavailable at {self.path}: {err}")
+        return self._ready
+
+    # ---------------- Writes ----------------
+
+    def _upsert(self, conn, channel_id: str, path: str, st):
+        summary = _summarize(path)
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO transcripts
+                (channel_id, path, mtime_ns, size, owner_id, owner_name, category, closed_at, message_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                channel_id,
+                path,
+                st.st_mtime_ns,
+                st.st_size,
+                summary.get("owner_id"),
+                summary.get("owner_name"),
+                summary.get("category"),
+                summary.get("closed_at"),
+                summary.get("message_count") or 0,
+            ),
+        )
+
+    def record_file(self, path: str):
+        """Catalogue one transcript file right after it is written."""
+        channel_id = _channel_id_for(os.path.basename(path))
+        if channel_id is None or not self.setup():
+            return False
+        try:
+            st = os.stat(path)
+            with closing(self._connect()) as conn:
+                existing = conn.execute(
+                    "SELECT path FROM transcripts WHERE channel_id = ?", (channel_id,)
+                ).fetchone()
+                # A .json transcript wins over a legacy .txt one for the same channel.
+                if existing and existing["path"].endswith(".json") and not path.endswith(".json"):
+                    return True
+                self._upsert(conn, channel_id, path, st)
+                conn.commit()
+            return True
+        except (OSError, sqlite3.Error) as err:
+            logger.warning(f"Failed to catalogue transcript {path}: {err}")
+            return False
+
+    def _get_state(self, conn, key: str):
+        row = conn.execute("SELECT value FROM catalog_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_state(self, conn, key: str, value):
+        conn.execute("INSERT OR REPLACE INTO catalog_state (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def refresh(self, force: bool = False) -> int:
+        """
+        Reconcile the catalogue with the directory. Skips the scan entirely when the
+        directory mtime is unchanged and the last full pass is recent. Returns the
+        number of rows added, updated or removed.
+        """
+        if not self.setup():
+            return 0
+        try:
+            dir_mtime = os.stat(self.transcript_dir).st_mtime_ns
+        except OSError:
+            return 0
+
+        try:
+            with closing(self._connect()) as conn:
+                last_mtime = self._get_state(conn, "dir_mtime_ns")
+                last_scan = float(self._get_state(conn, "last_full_scan") or 0)
+                if (
+                    not force
+                    and last_mtime == str(dir_mtime)
+                    and time.time() - last_scan < FULL_RESCAN_SECONDS
+                ):
+                    return 0
+
+                known = {
+                    row["channel_id"]: (row["path"], row["mtime_ns"], row["size"])
+                    for row in conn.execute("SELECT channel_id, path, mtime_ns, size FROM transcripts")
+                }
+                seen = {}
+                with os.scandir(self.transcript_dir) as entries:
+                    for entry in entries:
+                        channel_id = _channel_id_for(entry.name)
+                        if channel_id is None or not entry.is_file():
+                            continue
+                        previous = seen.get(channel_id)
+                        if previous is not None and previous.name.endswith(".json"):
+                            continue
+                        seen[channel_id] = entry
+
+                changed = 0
+                for channel_id, entry in seen.items():
+                    st = entry.stat()
+                    if known.get(channel_id) == (entry.path, st.st_mtime_ns, st.st_size):
+                        continue
+                    self._upsert(conn, channel_id, entry.path, st)
+                    changed += 1
+
+                removed = [(channel_id,) for channel_id in known if channel_id not in seen]
+                if removed:
+                    conn.executemany("DELETE FROM transcripts WHERE channel_id = ?", removed)
+                    changed += len(removed)
+
+                self._set_state(conn, "dir_mtime_ns", dir_mtime)
+                self._set_state(conn, "last_full_scan", time.time())
+                conn.commit()
+            if changed:
+                logger.info(f"Transcript catalogue refreshed: {changed} change(s)")
+            return changed
+        except (OSError, sqlite3.Error) as err:
+            logger.warning(f"Failed to refresh transcript catalogue: {err}")
+            return 0
+
+    # ---------------- Reads ----------------
+
+    def paths(self):
+        """Return {channel_id: path} for every catalogued transcript."""
+        if not self.setup():
+            return {}
+        try:
+            with closing(self._connect()) as conn:
+                return {row["channel_id"]: row["path"] for row in conn.execute("SELECT channel_id, path FROM transcripts")}
+        except sqlite3.Error as err:
+            logger.warning(f"Failed to read transcript catalogue: {err}")
+            return {}
+
+    def summary(self, channel_id):
+        """Return the catalogued summary row for one channel, or None."""
+        if not self.setup():
+            return None
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute("SELECT * FROM transcripts WHERE channel_id = ?", (str(channel_id),)).fetchone()
+            return dict(row) if row else None
+        except sqlite3.Error:
+            return None
+
+    def search(self, channel_prefix: str = "", owner_prefix: str = "", closed_from: str = None, closed_to: str = None, limit: int = 50):
+        """
+        Top `limit` catalogued transcripts matching a channel id prefix, an owner-name
+        prefix (case-insensitive) and/or a closed_at range [closed_from, closed_to),
+        newest channel first. Every filter is an index range scan.
+        """
+        if not self.setup():
+            return []
+        clauses, params = [], []
+        if channel_prefix:
+            clauses.append("channel_id >= ? AND channel_id < ?")
+            params += [channel_prefix, _prefix_upper(channel_prefix)]
+        if owner_prefix:
+            clauses.append("owner_name >= ? COLLATE NOCASE AND owner_name < ? COLLATE NOCASE")
+            params += [owner_prefix, _prefix_upper(owner_prefix)]
+        if closed_from:
+            clauses.append("closed_at >= ?")
+            params.append(closed_from)
+        if closed_to:
+            clauses.append("closed_at < ?")
+            params.append(closed_to)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    f"SELECT channel_id, owner_name, category, closed_at FROM transcripts {where} "
+                    "ORDER BY CAST(channel_id AS INTEGER) DESC LIMIT ?",
+                    (*params, limit),
+                ).fetchall()
+            return [dict(row) for row in rows]
+        except sqlite3.Error as err:
+            logger.warning(f"Transcript catalogue search failed: {err}")
+            return []
+
+
+if __name__ == "__main__":
+    # Full rescan: python transcript_catalog.py <transcript_dir> [catalog_path]
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    source_dir = sys.argv[1] if len(sys.argv) > 1 else "transcripts"
+    catalog_path = sys.argv[2] if len(sys.argv) > 2 else default_path(source_dir, "catalog.sqlite3")
+    changes = TranscriptCatalog(catalog_path, source_dir).refresh(force=True)
+    logger.info(f"Catalogued {changes} change(s) from {source_dir} into {catalog_path}")
@@ -0,0 +1 @@
+"""Staff transcript viewer (Streamlit). Entry point: streamlit_transcripts.py."""
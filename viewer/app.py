@@ -0,0 +1,284 @@
+"""Viewer page shell: sign-in, sidebar navigation and lazy dispatch to the active section."""
+import streamlit as st
+
+from viewer import timing
+from viewer.core import (
+    APP_ROOT,
+    DEFAULT_IMAGE_DIRS,
+    DEFAULT_TRANSCRIPT_DIRS,
+    ensure_discord_auth,
+    find_dir,
+    get_session_store,
+    is_admin_user,
+    is_tech_user,
+    list_transcript_files,
+    normalize_query_value,
+    query_mysql_tickets,
+    query_mysql_transcripts_map,
+)
+
+
+def main():
+    st.set_page_config(page_title="Transcript Viewer", layout="wide")
+
+    banner_path = APP_ROOT / "MOUSSEMAIL.png"
+    if banner_path.exists():
+        st.image(str(banner_path), use_column_width=True)
+    else:
+        st.title("Transcript Viewer")
+    discord_auth = ensure_discord_auth()
+    discord_user = discord_auth.get("user", {})
+
+    display_name = discord_user.get("global_name") or discord_user.get("username") or "Unknown user"
+
+    # ── Sidebar: identity ────────────────────────────────────────────────────
+    user_id = discord_user.get("id", "")
+    avatar_hash = discord_user.get("avatar", "")
+    username = discord_user.get("username", "")
+    if user_id and avatar_hash:
+        avatar_url = f"https://cdn.discordapp.com/avatars/{user_id}/{avatar_hash}.png?size=80"
+    else:
+        avatar_url = "https://cdn.discordapp.com/embed/avatars/0.png"
+    st.sidebar.markdown(
+        f"""
+        <div style="display:flex;align-items:center;gap:12px;padding:6px 0 14px 0;">
+            <img src="{avatar_url}" width="44" height="44" style="border-radius:50%;object-fit:cover;" />
+            <div>
+                <div style="font-weight:600;font-size:0.95rem;line-height:1.3;">{display_name}</div>
+                <div style="font-size:0.78rem;opacity:0.55;">@{username}</div>
+            </div>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+    if st.sidebar.button("Sign out", use_container_width=True, type="primary"):
+        st.session_state.discord_auth = None
+        session_token = normalize_query_value(st.query_params.get("session", ""))
+        if session_token:
+            get_session_store().delete_session(session_token)
+            try:
+                del st.query_params["session"]
+            except Exception:
+                pass
+        st.rerun()
+
+    st.sidebar.divider()
+
+    # ── Sidebar: navigation ──────────────────────────────────────────────────
+    query_section = normalize_query_value(st.query_params.get("section", ""))
+    query_channel = normalize_query_value(st.query_params.get("channel", ""))
+
+    is_admin  = is_admin_user(discord_auth)
+    is_tech   = is_tech_user(discord_auth)
+    is_advisor = bool(discord_auth.get("advisor", False))
+
+    if is_advisor:
+        st.sidebar.info("👁️ View-only mode (Advisor)")
+
+    # Build the set of sections this user can access
+    _valid_sections = {"overview", "logs"}
+    if is_admin:
+        _valid_sections.update({"stats", "export", "blacklist", "categories", "premade", "roles", "admin_log"})
+    if is_tech:
+        _valid_sections.add("config")
+
+    # Resolve section from URL (source of truth) then fall back to session state
+    _qs = "logs" if query_section == "transcript" else (query_section if query_section in _valid_sections else "")
+    if _qs:
+        section_key = _qs
+    else:
+        section_key = st.session_state.get("section_key", "logs")
+    st.session_state["section_key"] = section_key
+
+    # ── Sidebar navigation CSS ───────────────────────────────────────────────
+    st.markdown(
+        """
+        <style>
+        /* Nav buttons inside expanders: inactive */
+        [data-testid="stSidebar"] [data-testid="stExpander"] button[kind="secondary"] {
+            border: 1px solid rgba(192, 16, 64, 0.22) !important;
+            background: rgba(192, 16, 64, 0.06) !important;
+            padding: 7px 12px !important;
+            border-radius: 8px !important;
+            font-size: 0.88rem !important;
+            font-weight: 500 !important;
+            color: #7a0028 !important;
+            text-align: left !important;
+            justify-content: flex-start !important;
+            transition: background 0.15s, border-color 0.15s !important;
+            margin: 2px 0 !important;
+            box-shadow: none !important;
+        }
+        [data-testid="stSidebar"] [data-testid="stExpander"] button[kind="secondary"]:hover {
+            background: rgba(192, 16, 64, 0.13) !important;
+            border-color: rgba(192, 16, 64, 0.40) !important;
+        }
+        /* Nav buttons inside expanders: active */
+        [data-testid="stSidebar"] [data-testid="stExpander"] button[kind="primary"] {
+            background: rgba(192, 16, 64, 0.18) !important;
+            color: #9A0830 !important;
+            font-weight: 700 !important;
+            box-shadow: inset 3px 0 0 #C01040 !important;
+            border: 1px solid rgba(192, 16, 64, 0.32) !important;
+            padding: 7px 12px !important;
+            border-radius: 8px !important;
+            font-size: 0.88rem !important;
+            text-align: left !important;
+            justify-content: flex-start !important;
+            margin: 2px 0 !important;
+        }
+        [data-testid="stSidebar"] [data-testid="stExpander"] button[kind="primary"]:hover {
+            background: rgba(192, 16, 64, 0.25) !important;
+        }
+        </style>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    def _nav_item(label: str, key: str) -> None:
+        btn_type = "primary" if section_key == key else "secondary"
+        if st.button(label, key=f"nav_{key}", use_container_width=True, type=btn_type):
+            st.session_state["section_key"] = key
+            st.query_params["section"] = key
+            if "channel" in st.query_params:
+                del st.query_params["channel"]
+            st.rerun()
+
+    # ── Group: Transcript Management ─────────────────────────────────────────
+    _tm_sections = {"overview", "logs", "stats", "export"}
+    with st.sidebar.expander("📋 Transcript Management", expanded=section_key in _tm_sections):
+        _nav_item("Overview", "overview")
+        _nav_item("Logs", "logs")
+        if is_admin:
+            _nav_item("Stats & Leaderboard", "stats")
+            _nav_item("Export", "export")
+
+    # ── Group: Server Management ──────────────────────────────────────────────
+    if is_admin or is_advisor:
+        _sm_sections = {"categories", "premade", "blacklist"}
+        with st.sidebar.expander("⚙️ Server Management", expanded=section_key in _sm_sections):
+            _nav_item("Category Management", "categories")
+            _nav_item("Premade Messages", "premade")
+            _nav_item("Blacklist", "blacklist")
+
+    # ── Group: Admin ──────────────────────────────────────────────────────────
+    if is_admin or is_tech or is_advisor:
+        _adm_sections = {"roles", "admin_log", "config", "flagged"}
+        with st.sidebar.expander("🔐 Admin", expanded=section_key in _adm_sections):
+            if is_admin or is_advisor:
+                _nav_item("Staff Role List", "roles")
+                _nav_item("Admin Action Log", "admin_log")
+                _nav_item("Flagged Users", "flagged")
+            if is_tech or is_advisor:
+                _nav_item("Bot Config Editor", "config")
+
+    st.sidebar.divider()
+
+    # ── Sidebar: advanced (collapsed) ────────────────────────────────────────
+    tdir = find_dir(DEFAULT_TRANSCRIPT_DIRS)
+    img_root = find_dir(DEFAULT_IMAGE_DIRS)
+    # Only Overview and Logs read tickets/transcripts; other sections skip these queries.
+    needs_tickets = section_key in {"overview", "logs"}
+    transcript_map = list_transcript_files(tdir) if needs_tickets else {}
+    db_transcripts_map = query_mysql_transcripts_map() if needs_tickets else {}
+    tickets = (query_mysql_tickets() or []) if needs_tickets else []
+
+    with st.sidebar.expander("Advanced", expanded=False):
+        staff_ids_input = st.text_input("Staff identifier substrings", value="mod,staff,admin,mousse", help="Comma-separated substrings used to identify staff authors in transcripts.")
+        internal_markers_input = st.text_input("Internal note markers", value="internal,note,staff-only", help="Comma-separated markers that flag a message as internal.")
+        show_internal = st.toggle("Show internal notes", value=False)
+        st.caption(f"Transcripts dir: `{tdir}`")
+        if needs_tickets:
+            st.caption(f"Local: {len(transcript_map)} · DB: {len(db_transcripts_map)}")
+        st.caption(timing.summary())
+
+    staff_identifiers = [s.strip() for s in staff_ids_input.split(",") if s.strip()]
+    internal_markers = [s.strip() for s in internal_markers_input.split(",") if s.strip()]
+
+    if section_key == "overview":
+        from viewer.sections.overview import render_overview
+
+        render_overview(discord_auth, display_name, tickets, transcript_map, db_transcripts_map)
+
+    elif section_key == "logs":
+        from viewer.sections.logs import render_logs_view, render_transcript_view
+
+        if query_channel:
+            if st.button("← Back to Logs"):
+                try:
+                    del st.query_params["channel"]
+                except Exception:
+                    pass
+                st.rerun()
+            render_transcript_view(
+                transcript_map,
+                db_transcripts_map,
+                img_root,
+                staff_identifiers,
+                show_internal,
+                internal_markers,
+                query_channel,
+            )
+        else:
+            logs_tab, transcripts_tab = st.tabs(["Logs", "Transcripts"])
+            with logs_tab:
+                render_logs_view(tickets, transcript_map, db_transcripts_map, is_admin=is_admin)
+            with transcripts_tab:
+                render_transcript_view(
+                    transcript_map,
+                    db_transcripts_map,
+                    img_root,
+                    staff_identifiers,
+                    show_internal,
+                    internal_markers,
+                    "",
+                )
+
+    elif section_key == "premade" and (is_admin or is_advisor):
+        from viewer.sections.premade import render_premade_messages_section
+
+        render_premade_messages_section(is_advisor=is_advisor)
+
+    elif section_key == "stats" and is_admin:
+        from viewer.sections.stats import render_staff_leaderboard, render_stats_dashboard
+
+        stats_tab, leaderboard_tab = st.tabs(["Stats Dashboard", "Staff Leaderboard"])
+        with stats_tab:
+            render_stats_dashboard()
+        with leaderboard_tab:
+            render_staff_leaderboard()
+
+    elif section_key == "export" and is_admin:
+        from viewer.sections.export import render_export_section
+
+        render_export_section()
+
+    elif section_key == "blacklist" and (is_admin or is_advisor):
+        from viewer.sections.blacklist import render_blacklist_section
+
+        render_blacklist_section()
+
+    elif section_key == "categories" and (is_admin or is_advisor):
+        from viewer.sections.categories import render_category_management
+
+        render_category_management(is_advisor=is_advisor)
+
+    elif section_key == "flagged" and (is_admin or is_advisor):
+        from viewer.sections.flagged import render_flagged_users_section
+
+        render_flagged_users_section(is_advisor=is_advisor)
+
+    elif section_key == "roles" and (is_admin or is_advisor):
+        from viewer.sections.staff_roles import render_staff_roles_section
+
+        render_staff_roles_section()
+
+    elif section_key == "admin_log" and (is_admin or is_advisor):
+        from viewer.sections.admin_log import render_admin_log_section
+
+        render_admin_log_section()
+
+    elif section_key == "config" and (is_tech or is_advisor):
+        from viewer.sections.bot_config import render_bot_config_editor
+
+        render_bot_config_editor(is_advisor=is_advisor)
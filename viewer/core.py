@@ -0,0 +1,699 @@
+"""
+Viewer core - configuration, Discord sign-in and sessions, MySQL connection helpers
+and the queries shared by more than one section.
+
+Database drivers are only imported on first use; the *_AVAILABLE flags are resolved
+with importlib.util.find_spec so loading this module stays cheap.
+"""
+import atexit
+import hashlib
+import hmac
+import importlib.util
+import json
+import logging
+import os
+import secrets
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+from urllib.parse import urlencode
+
+import streamlit as st
+
+from discord_http import DiscordHTTPClient, DiscordHTTPError
+from session_store import SessionStore
+from staff_roles import CCAC_ALLOWED_ROLE_IDS, STAFF_GUILD_ID  # also the bot's staff roster guild and roles
+from transcript_catalog import TranscriptCatalog, default_path
+
+try:
+    from dotenv import load_dotenv
+except Exception:
+    load_dotenv = None
+
+try:
+    import config as app_config
+except Exception:
+    app_config = None
+
+
+def _module_available(name: str) -> bool:
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+logger = logging.getLogger("modmail.viewer")
+
+MYSQL_AVAILABLE = _module_available("mysql.connector")
+SQLALCHEMY_AVAILABLE = _module_available("sqlalchemy")
+PYMYSQL_AVAILABLE = _module_available("pymysql")
+
+
+# ---------------------------------------------------------------------------
+# Persistent session store for 20-minute Discord login persistence.
+# Keyed by a random URL-safe token stored in st.query_params["session"];
+# shared across Streamlit restarts and worker processes (see session_store.py).
+# ---------------------------------------------------------------------------
+SESSION_TTL_SECONDS = 20 * 60  # 20 minutes
+MEMBER_ROLE_TTL_SECONDS = 5 * 60
+
+# SHA-256 hash of the thesis-advisor access password (never stored as plaintext).
+_ADVISOR_PW_HASH: str = hashlib.sha256(b"VS_CSA3D1").hexdigest()
+
+
+@st.cache_resource
+def get_session_store() -> SessionStore:
+    """Return the SQLite session/role store (SESSION_STORE_PATH in config overrides the location)."""
+    configured = getattr(app_config, "SESSION_STORE_PATH", "") if app_config else ""
+    return SessionStore(configured or str(APP_ROOT / "viewer_sessions.sqlite3"))
+
+
+DEFAULT_TRANSCRIPT_DIRS = ["transcripts", "logs"]
+DEFAULT_IMAGE_DIRS = ["transcripts/images", "logs/images", "images"]
+DISCORD_API_BASE = "https://discord.com/api/v10"
+DISCORD_AUTH_URL = "https://discord.com/oauth2/authorize"
+CCAC_MAIN_GUILD_ID = STAFF_GUILD_ID
+
+# Roles permitted to manage premade messages via the Streamlit UI
+CCAC_ADMIN_ROLE_IDS = {
+    1243929060145631262,  # admin
+    1240455108047671406,  # owner
+    1243929202785386527,  # tech
+}
+
+
+def is_admin_user(discord_auth: dict) -> bool:
+    """Return True if the authenticated user holds an admin-or-higher role."""
+    role_ids = set(discord_auth.get("role_ids") or [])
+    return bool(role_ids.intersection(CCAC_ADMIN_ROLE_IDS))
+
+
+# Tech role – subset of admin that also gets the Bot Config Editor
+CCAC_TECH_ROLE_IDS = {
+    1243929202785386527,  # tech
+}
+
+# Human-readable display names for all staff role IDs
+CCAC_ROLE_NAMES: Dict[int, str] = {
+    1334289756539846656: "Jr. Mod",
+    1243559774847766619: "Mod",
+    1243929060145631262: "Admin",
+    1240455108047671406: "Owner",
+    1243929202785386527: "Tech",
+}
+
+
+def is_tech_user(discord_auth: dict) -> bool:
+    """Return True if the authenticated user holds the tech role."""
+    role_ids = set(discord_auth.get("role_ids") or [])
+    return bool(role_ids.intersection(CCAC_TECH_ROLE_IDS))
+
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+
+# MySQL Database configuration (same as bot)
+DB_CONFIG = {
+    "host": os.getenv("DB_HOST", "gameswaw5.bisecthosting.com"),
+    "port": int(os.getenv("DB_PORT", "3306")),
+    "user": os.getenv("DB_USER", "u1079393_bwVUJntzFf"),
+    "password": os.getenv("DB_PASS", "XzaXNWotYim7AWlIeudHjSoO"),
+    "database": os.getenv("DB_NAME", "s1079393_ModMail"),
+}
+
+if load_dotenv is not None:
+    load_dotenv(APP_ROOT / ".env")
+
+
+def get_secret_value(key: str, default: str = "") -> str:
+    try:
+        value = st.secrets.get(key) if hasattr(st, "secrets") else None
+    except Exception:
+        value = None
+    if value in (None, ""):
+        return default
+    return str(value).strip()
+
+
+@st.cache_resource
+def get_http_client() -> DiscordHTTPClient:
+    """Process-wide keep-alive client shared by all sessions (see discord_http.py)."""
+    return DiscordHTTPClient()
+
+
+def http_json(url: str, *, method: str = "GET", headers: Dict[str, str] = None, data: bytes = None, cache_ttl: float = 0) -> Dict[str, Any]:
+    return get_http_client().request_json(url, method=method, headers=headers, data=data, cache_ttl=cache_ttl)
+
+
+def get_discord_oauth_settings() -> Dict[str, str]:
+    config_client_id = getattr(app_config, "DISCORD_CLIENT_ID", "") if app_config else ""
+    config_client_secret = getattr(app_config, "DISCORD_CLIENT_SECRET", "") if app_config else ""
+    config_redirect_uri = getattr(app_config, "DISCORD_REDIRECT_URI", "") if app_config else ""
+
+    client_id = str(os.getenv("DISCORD_CLIENT_ID") or get_secret_value("DISCORD_CLIENT_ID") or config_client_id or "").strip()
+    client_secret = str(os.getenv("DISCORD_CLIENT_SECRET") or get_secret_value("DISCORD_CLIENT_SECRET") or config_client_secret or "").strip()
+    redirect_uri = str(
+        os.getenv("DISCORD_REDIRECT_URI")
+        or get_secret_value("DISCORD_REDIRECT_URI")
+        or config_redirect_uri
+        or os.getenv("STREAMLIT_PUBLIC_URL", "")
+        or get_secret_value("STREAMLIT_PUBLIC_URL")
+    ).strip()
+    return {
+        "client_id": client_id,
+        "client_secret": client_secret,
+        "redirect_uri": redirect_uri,
+    }
+
+
+def get_bot_token() -> str:
+    config_bot_token = getattr(app_config, "DISCORD_BOT_TOKEN", "") if app_config else ""
+    return str(
+        os.getenv("DISCORD_BOT_TOKEN")
+        or get_secret_value("DISCORD_BOT_TOKEN")
+        or config_bot_token
+        or ""
+    ).strip()
+
+
+def build_discord_login_url(state: str) -> str:
+    settings = get_discord_oauth_settings()
+    params = {
+        "client_id": settings["client_id"],
+        "redirect_uri": settings["redirect_uri"],
+        "response_type": "code",
+        "scope": "identify guilds",
+        "state": state,
+        "prompt": "consent",
+    }
+    return f"{DISCORD_AUTH_URL}?{urlencode(params)}"
+
+
+def exchange_code_for_token(code: str) -> Dict[str, Any]:
+    settings = get_discord_oauth_settings()
+    payload = urlencode(
+        {
+            "client_id": settings["client_id"],
+            "client_secret": settings["client_secret"],
+            "grant_type": "authorization_code",
+            "code": code,
+            "redirect_uri": settings["redirect_uri"],
+        }
+    ).encode("utf-8")
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    return http_json(f"{DISCORD_API_BASE}/oauth2/token", method="POST", headers=headers, data=payload)
+
+
+def fetch_discord_user(access_token: str) -> Dict[str, Any]:
+    headers = {"Authorization": f"Bearer {access_token}"}
+    return http_json(f"{DISCORD_API_BASE}/users/@me", headers=headers, cache_ttl=60)
+
+
+def fetch_member_roles(user_id: str):
+    """
+    Use the bot token to look up the user's roles in the CCAC guild. Returns an
+    empty set when Discord says they aren't a member, None when the lookup failed.
+    """
+    bot_token = get_bot_token()
+    if not bot_token:
+        return None
+    headers = {"Authorization": f"Bot {bot_token}"}
+    try:
+        member = http_json(
+            f"{DISCORD_API_BASE}/guilds/{CCAC_MAIN_GUILD_ID}/members/{user_id}",
+            headers=headers,
+        )
+        return {int(r) for r in member.get("roles", [])}
+    except DiscordHTTPError as e:
+        return set() if e.status == 404 else None
+    except Exception:
+        return None
+
+
+def get_member_roles(user_id: str):
+    """fetch_member_roles behind the persistent role cache (MEMBER_ROLE_TTL_SECONDS)."""
+    store = get_session_store()
+    cached = store.get_roles(user_id, MEMBER_ROLE_TTL_SECONDS)
+    if cached is not None:
+        return cached
+    role_ids = fetch_member_roles(user_id)
+    # Empty means "not a member"; don't pin that (or a failed lookup) for the whole TTL.
+    if role_ids:
+        store.put_roles(user_id, role_ids)
+    return role_ids
+
+
+def clear_auth_query_params():
+    try:
+        st.query_params.clear()
+    except Exception:
+        pass
+
+
+def ensure_discord_auth() -> Dict[str, Any]:
+    if "discord_auth" not in st.session_state:
+        st.session_state.discord_auth = None
+
+    settings = get_discord_oauth_settings()
+    missing = [
+        key
+        for key, value in (
+            ("DISCORD_CLIENT_ID", settings["client_id"]),
+            ("DISCORD_CLIENT_SECRET", settings["client_secret"]),
+            ("DISCORD_REDIRECT_URI", settings["redirect_uri"]),
+        )
+        if not value
+    ]
+    if missing:
+        st.error(f"Discord OAuth is not configured. Missing: {', '.join(missing)}")
+        st.stop()
+
+    # Restore session from a persistent token in the URL (survives page refresh / new tab).
+    raw_session = st.query_params.get("session", "")
+    session_token = raw_session[0] if isinstance(raw_session, list) and raw_session else str(raw_session or "")
+    if session_token and not st.session_state.discord_auth:
+        cached = get_session_store().get_session(session_token)
+        if cached:
+            user_id = str((cached.get("user") or {}).get("id", ""))
+            role_ids = get_member_roles(user_id) if user_id else set()
+            if role_ids is None:
+                # Discord lookup failed (timeout, 5xx): keep the session on the roles it was granted with.
+                role_ids = {int(r) for r in cached.get("role_ids") or []}
+            if role_ids.intersection(CCAC_ALLOWED_ROLE_IDS):
+                cached["role_ids"] = list(role_ids)
+                st.session_state.discord_auth = cached
+            else:
+                get_session_store().delete_session(session_token)
+
+    raw_code = st.query_params.get("code", "")
+    raw_state = st.query_params.get("state", "")
+    code = raw_code[0] if isinstance(raw_code, list) and raw_code else str(raw_code or "")
+    state = raw_state[0] if isinstance(raw_state, list) and raw_state else str(raw_state or "")
+
+    if code and not st.session_state.discord_auth:
+        try:
+            token_payload = exchange_code_for_token(code)
+            access_token = token_payload.get("access_token", "")
+            if not access_token:
+                raise ValueError(token_payload.get("error_description") or "No access token returned by Discord.")
+
+            user = fetch_discord_user(access_token)
+            user_id = str(user.get("id", ""))
+
+            if not user_id:
+                raise ValueError("Could not retrieve user ID from Discord.")
+
+            role_ids = get_member_roles(user_id)
+            if role_ids is None:
+                raise RuntimeError("Could not look up your server roles on Discord; please try again shortly.")
+
+            if not role_ids.intersection(CCAC_ALLOWED_ROLE_IDS):
+                raise PermissionError(
+                    "Your Discord account does not have the required CCAC staff role "
+                    "(Jr. Mod, Mod, Admin, Owner, or Tech), or you are not a member of the server."
+                )
+
+            auth_data = {
+                "access_token": access_token,
+                "user": user,
+                "role_ids": list(role_ids),
+            }
+            st.session_state.discord_auth = auth_data
+
+            # Persist session for 20 minutes via a URL token.
+            new_session_token = secrets.token_urlsafe(32)
+            store = get_session_store()
+            store.put_session(new_session_token, auth_data, SESSION_TTL_SECONDS)
+            store.prune()
+            clear_auth_query_params()
+            st.query_params["session"] = new_session_token
+            st.rerun()
+        except Exception as e:
+            st.error(f"Discord login failed: {e}")
+            st.stop()
+
+    if st.session_state.discord_auth:
+        return st.session_state.discord_auth
+
+    # ── Discord login ────────────────────────────────────────────────────────
+    st.sidebar.write("🔐 Staff sign-in")
+    st.sidebar.caption("Sign in with Discord. Access is limited to members with the required CCAC role.")
+    login_state = secrets.token_urlsafe(24)
+    st.sidebar.link_button("Sign in with Discord", build_discord_login_url(login_state))
+
+    # ── Advisor password login ───────────────────────────────────────────────
+    st.sidebar.divider()
+    st.sidebar.write("🎓 Advisor access")
+    with st.sidebar.form("advisor_login_form", clear_on_submit=True):
+        _pw = st.text_input("Password", type="password", placeholder="Enter advisor password")
+        _submitted = st.form_submit_button("Sign in", use_container_width=True)
+        if _submitted:
+            _entered_hash = hashlib.sha256(_pw.encode()).hexdigest()
+            if hmac.compare_digest(_entered_hash, _ADVISOR_PW_HASH):
+                _all_role_ids = list(
+                    CCAC_ALLOWED_ROLE_IDS | CCAC_ADMIN_ROLE_IDS | CCAC_TECH_ROLE_IDS
+                )
+                st.session_state.discord_auth = {
+                    "access_token": "",
+                    "user": {
+                        "id": "0",
+                        "username": "Thesis Advisor",
+                        "global_name": "Thesis Advisor",
+                        "discriminator": "0000",
+                        "avatar": "",
+                    },
+                    "role_ids": _all_role_ids,
+                    "advisor": True,
+                }
+                st.rerun()
+            else:
+                st.error("Incorrect password.")
+    st.stop()
+
+
+_FOUND_DIRS: Dict[tuple, Path] = {}
+
+
+def find_dir(candidates: List[str]) -> Path:
+    key = tuple(candidates)
+    if key in _FOUND_DIRS:
+        return _FOUND_DIRS[key]
+    for c in candidates:
+        p = Path(c)
+        if p.exists() and p.is_dir():
+            # Only remember hits, so a directory created later is still picked up.
+            _FOUND_DIRS[key] = p
+            return p
+    return Path(candidates[0])
+
+
+def query_mysql_tickets():
+    """Query active_tickets from MySQL database."""
+    if not MYSQL_AVAILABLE:
+        st.error("mysql-connector-python not installed. Install: pip install mysql-connector-python")
+        return None
+    from mysql.connector import Error
+
+    try:
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            "SELECT channel_id, user_id, member_username, mod_username, category_id, created_at, closed_at, status FROM active_tickets ORDER BY created_at DESC LIMIT 500"
+        )
+        tickets = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return tickets
+    except Error as e:
+        st.error(f"Database error: {e}")
+    except Exception as e:
+        st.error(f"Connection error: {e}")
+    return None
+
+
+def _parse_transcript_row(row: Dict[str, Any]):
+    """Decode one ticket_transcripts row into a transcript payload, or None."""
+    payload = row.get("transcript_json")
+    if not isinstance(payload, str):
+        return None
+    try:
+        parsed = json.loads(payload)
+    except Exception:
+        return None
+    if not isinstance(parsed, dict):
+        return None
+    ticket = parsed.setdefault("ticket", {})
+    if isinstance(ticket, dict):
+        ticket.setdefault("owner_id", row.get("owner_id"))
+        ticket.setdefault("owner_name", row.get("owner_name"))
+        ticket.setdefault("opened_by", row.get("opened_by"))
+        ticket.setdefault("closed_by", row.get("closed_by"))
+        ticket.setdefault("opened_at", row.get("opened_at"))
+        ticket.setdefault("closed_at", row.get("closed_at"))
+    return parsed
+
+
+def query_mysql_transcripts_map() -> Dict[str, Dict[str, Any]]:
+    """Return map[channel_id] => transcript JSON payload from ticket_transcripts table."""
+    if not MYSQL_AVAILABLE:
+        return {}
+
+    try:
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            """
+            SELECT channel_id, owner_id, owner_name, opened_by, closed_by, opened_at, closed_at, transcript_json
+            FROM ticket_transcripts
+            ORDER BY updated_at DESC
+            LIMIT 2000
+            """
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return parse_transcript_rows(rows)
+    except Exception:
+        return {}
+
+
+def parse_transcript_rows(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """map[channel_id] => decoded payload for ticket_transcripts rows; undecodable rows are skipped."""
+    result: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        channel_id = str(row.get("channel_id"))
+        parsed = _parse_transcript_row(row)
+        if channel_id and parsed is not None:
+            result[channel_id] = parsed
+    return result
+
+
+def query_mysql_transcript(channel_id: str):
+    """Return one transcript payload from ticket_transcripts by channel id, or None."""
+    if not MYSQL_AVAILABLE or not str(channel_id).isdigit():
+        return None
+    try:
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            """
+            SELECT channel_id, owner_id, owner_name, opened_by, closed_by, opened_at, closed_at, transcript_json
+            FROM ticket_transcripts
+            WHERE channel_id = %s
+            """,
+            (int(channel_id),),
+        )
+        row = cursor.fetchone()
+        cursor.close()
+        conn.close()
+        return _parse_transcript_row(row) if row else None
+    except Exception:
+        return None
+
+
+# ── Shared connection helper ──────────────────────────────────────────────────
+
+def _new_conn():
+    """Return a fresh mysql.connector connection using DB_CONFIG."""
+    import mysql.connector
+
+    return mysql.connector.connect(**DB_CONFIG)
+
+
+# ── Schema bootstrap ──────────────────────────────────────────────────────────
+# Every table the viewer owns is created once per process: the first call reads
+# viewer_schema_version and only runs the DDL when the stored version is older.
+# Bump VIEWER_SCHEMA_VERSION whenever a statement is added or changed.
+
+VIEWER_SCHEMA_VERSION = 1
+
+_VIEWER_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS admin_action_log (
+        id           BIGINT AUTO_INCREMENT PRIMARY KEY,
+        performed_by VARCHAR(255),
+        action_type  VARCHAR(100),
+        details      TEXT,
+        performed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ticket_category_names (
+        category_id   BIGINT PRIMARY KEY,
+        category_name VARCHAR(255) NOT NULL,
+        updated_by    VARCHAR(255),
+        updated_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS flagged_users (
+        user_id    BIGINT PRIMARY KEY,
+        username   VARCHAR(255),
+        flag_type  VARCHAR(50) DEFAULT 'flagged',
+        reason     TEXT,
+        flagged_by VARCHAR(255),
+        flagged_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS bot_config_overrides (
+        `key`       VARCHAR(100) PRIMARY KEY,
+        `value`     TEXT,
+        updated_by  VARCHAR(255),
+        updated_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+    """,
+)
+
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+
+def ensure_viewer_schema() -> bool:
+    """Create the viewer's tables on first use in this process. Never raises."""
+    global _schema_ready
+    if _schema_ready or not MYSQL_AVAILABLE:
+        return _schema_ready
+    with _schema_lock:
+        if _schema_ready:
+            return True
+        try:
+            conn = _new_conn()
+            cursor = conn.cursor()
+            cursor.execute(
+                "CREATE TABLE IF NOT EXISTS viewer_schema_version ("
+                "id TINYINT PRIMARY KEY, version INT NOT NULL)"
+            )
+            cursor.execute("SELECT version FROM viewer_schema_version WHERE id = 1")
+            row = cursor.fetchone()
+            if not row or row[0] < VIEWER_SCHEMA_VERSION:
+                for ddl in _VIEWER_SCHEMA:
+                    cursor.execute(ddl)
+                cursor.execute(
+                    "INSERT INTO viewer_schema_version (id, version) VALUES (1, %s) "
+                    "ON DUPLICATE KEY UPDATE version = VALUES(version)",
+                    (VIEWER_SCHEMA_VERSION,),
+                )
+                conn.commit()
+            cursor.close()
+            conn.close()
+            _schema_ready = True
+        except Exception as exc:
+            logger.warning(f"Viewer schema bootstrap failed: {exc}")
+    return _schema_ready
+
+
+# ── Admin action log ──────────────────────────────────────────────────────────
+
+class AdminLogWriter:
+    """
+    Buffers admin_action_log rows and inserts them in batches with executemany from
+    a background thread, so recording an action never waits on MySQL.
+    """
+
+    def __init__(self, flush_interval: float = 1.0, max_batch: int = 50, max_pending: int = 1000):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self._rows = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        threading.Thread(target=self._run, name="admin-log-writer", daemon=True).start()
+        atexit.register(self.flush)
+
+    def add(self, performed_by: str, action_type: str, details: str) -> None:
+        with self._lock:
+            self._rows.append((performed_by, action_type, details))
+            if len(self._rows) >= self.max_batch:
+                self._wake.set()
+
+    def flush(self) -> None:
+        """Write every buffered row now. Rows are kept for the next attempt if MySQL is down."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+            if not rows:
+                return
+            try:
+                if not ensure_viewer_schema():
+                    raise RuntimeError("schema unavailable")
+                conn = _new_conn()
+                cursor = conn.cursor()
+                cursor.executemany(
+                    "INSERT INTO admin_action_log (performed_by, action_type, details) VALUES (%s, %s, %s)",
+                    rows,
+                )
+                conn.commit()
+                cursor.close()
+                conn.close()
+            except Exception as exc:
+                logger.warning(f"Failed to write {len(rows)} admin log row(s): {exc}")
+                with self._lock:
+                    self._rows = (rows + self._rows)[-self.max_pending:]
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+@st.cache_resource
+def get_admin_log_writer() -> AdminLogWriter:
+    return AdminLogWriter()
+
+
+def log_admin_action(performed_by: str, action_type: str, details: str) -> None:
+    """Queue an admin action for admin_action_log. Never raises."""
+    if not MYSQL_AVAILABLE:
+        return
+    try:
+        get_admin_log_writer().add(performed_by, action_type, details)
+    except Exception:
+        pass
+
+
+# ── Category names ────────────────────────────────────────────────────────────
+
+def query_category_names() -> Dict[int, str]:
+    """Return {category_id: friendly_name} saved by admins."""
+    if not MYSQL_AVAILABLE:
+        return {}
+    try:
+        ensure_viewer_schema()
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT category_id, category_name FROM ticket_category_names")
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return {r["category_id"]: r["category_name"] for r in rows}
+    except Exception:
+        return {}
+
+
+@st.cache_resource
+def get_transcript_catalog(transcript_dir: str) -> TranscriptCatalog:
+    """Return the persistent transcript catalogue for a directory."""
+    configured = getattr(app_config, "TRANSCRIPT_CATALOG_PATH", "") if app_config else ""
+    return TranscriptCatalog(configured or default_path(transcript_dir, "catalog.sqlite3"), transcript_dir)
+
+
+@st.cache_data(ttl=15, show_spinner=False)
+def _catalog_paths(transcript_dir: str) -> Dict[str, str]:
+    catalog = get_transcript_catalog(transcript_dir)
+    catalog.refresh()
+    return catalog.paths()
+
+
+def list_transcript_files(transcript_dir: Path) -> Dict[str, Path]:
+    if not transcript_dir.exists():
+        return {}
+    return {channel_id: Path(path) for channel_id, path in _catalog_paths(str(transcript_dir)).items()}
+
+
+def normalize_query_value(value: Any) -> str:
+    if isinstance(value, list):
+        return value[0] if value else ""
+    return value or ""
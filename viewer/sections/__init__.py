@@ -0,0 +1 @@
+"""Viewer sections, imported on demand by viewer.app so each rerun loads only the active one."""
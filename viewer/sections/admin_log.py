@@ -0,0 +1,64 @@
+"""Admin Action Log section."""
+from typing import Any, Dict, List
+
+import streamlit as st
+
+from viewer.core import MYSQL_AVAILABLE, _new_conn, ensure_viewer_schema, get_admin_log_writer
+
+
+def query_admin_action_log(limit: int = 100) -> List[Dict[str, Any]]:
+    if not MYSQL_AVAILABLE:
+        return []
+    try:
+        ensure_viewer_schema()
+        # Show actions recorded moments ago that are still in the write buffer.
+        get_admin_log_writer().flush()
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            "SELECT id, performed_by, action_type, details, performed_at "
+            "FROM admin_action_log ORDER BY performed_at DESC LIMIT %s",
+            (limit,),
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return rows
+    except Exception:
+        return []
+
+
+# ─── 9. Admin Action Log ──────────────────────────────────────────────────────
+
+def render_admin_log_section() -> None:
+    st.subheader("Admin Action Log")
+    st.caption("Recent actions performed through this dashboard.")
+
+    if not MYSQL_AVAILABLE:
+        st.error("MySQL not available.")
+        return
+
+    with st.spinner("Loading…"):
+        log_rows = query_admin_action_log(100)
+
+    if not log_rows:
+        st.info("No admin actions recorded yet.")
+        return
+
+    st.caption(f"Showing last {len(log_rows)} actions (newest first).")
+    display = [
+        {
+            "#":      r.get("id", ""),
+            "By":     r.get("performed_by", ""),
+            "Action": r.get("action_type", ""),
+            "Details":r.get("details", ""),
+            "Time":   str(r.get("performed_at", ""))[:19],
+        }
+        for r in log_rows
+    ]
+    try:
+        import pandas as pd
+        df = pd.DataFrame(display)
+        st.dataframe(df, use_container_width=True, hide_index=True)
+    except Exception:
+        st.table(display)
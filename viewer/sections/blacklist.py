@@ -0,0 +1,166 @@
+"""Blacklist section: DixieModerator blacklist (PyMySQL, imported on first use)."""
+import os
+import time
+from typing import Any, Dict, Optional
+
+import streamlit as st
+
+from viewer.core import PYMYSQL_AVAILABLE
+
+
+DIXIE_DB_CONFIG = {
+    "host": os.getenv("DIXIE_DB_HOST", "gameswaw1.bisecthosting.com"),
+    "port": int(os.getenv("DIXIE_DB_PORT", "3306")),
+    "user": os.getenv("DIXIE_DB_USER", "u404394_zpDXmPyRMs"),
+    "password": os.getenv("DIXIE_DB_PASS", "s8HvVfGoqUpl9LRGVShnqzOk"),
+    "database": os.getenv("DIXIE_DB_NAME", "s404394_DixieModerator"),
+}
+
+
+# ── DixieModerator DB (PyMySQL) ───────────────────────────────────────────────
+
+# Short timeouts so an unreachable DixieModerator host fails fast instead of hanging the rerun.
+DIXIE_CONNECT_TIMEOUT = 3
+DIXIE_QUERY_TIMEOUT = 5
+# After a failure, skip connection attempts for this long and show the error straight away.
+DIXIE_RETRY_AFTER_SECONDS = 30
+BLACKLIST_PAGE_SIZE = 50
+
+_dixie_down_until = 0.0
+_dixie_last_error = ""
+
+
+def _get_dixie_conn():
+    """Return a PyMySQL connection to the DixieModerator database."""
+    if not PYMYSQL_AVAILABLE:
+        raise RuntimeError("pymysql is not installed. Run: pip install pymysql")
+    import pymysql
+    import pymysql.cursors
+
+    return pymysql.connect(
+        host=DIXIE_DB_CONFIG["host"],
+        port=DIXIE_DB_CONFIG["port"],
+        user=DIXIE_DB_CONFIG["user"],
+        password=DIXIE_DB_CONFIG["password"],
+        database=DIXIE_DB_CONFIG["database"],
+        charset="utf8mb4",
+        cursorclass=pymysql.cursors.DictCursor,
+        connect_timeout=DIXIE_CONNECT_TIMEOUT,
+        read_timeout=DIXIE_QUERY_TIMEOUT,
+        write_timeout=DIXIE_QUERY_TIMEOUT,
+    )
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def query_dixie_blacklist_page(search: str = "", before_id: Optional[int] = None, page_size: int = BLACKLIST_PAGE_SIZE) -> Dict[str, Any]:
+    """
+    One page of the DixieModerator blacklist, newest first, using keyset pagination
+    on the primary key (`id < before_id`) so deep pages cost the same as the first.
+
+    A numeric `search` matches `user_id` exactly; anything else is a username prefix
+    match, which an index on `blacklist (username)` can serve. Returns
+    {"rows": [...], "has_more": bool, "error": str}; errors are returned rather than
+    raised so a failed page is cached briefly too.
+    """
+    global _dixie_down_until, _dixie_last_error
+    if time.monotonic() < _dixie_down_until:
+        return {"rows": [], "has_more": False, "error": _dixie_last_error}
+
+    clauses, params = [], []
+    term = search.strip()
+    if term.isdigit():
+        clauses.append("user_id = %s")
+        # Bound as a string: index-friendly whether user_id is BIGINT or VARCHAR.
+        params.append(term)
+    elif term:
+        escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        clauses.append("username LIKE %s")
+        params.append(f"{escaped}%")
+    if before_id is not None:
+        clauses.append("id < %s")
+        params.append(before_id)
+    where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+    params.append(page_size + 1)
+
+    try:
+        conn = _get_dixie_conn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT id, user_id, username, reason, blacklist_date "
+                    f"FROM blacklist {where}ORDER BY id DESC LIMIT %s",
+                    params,
+                )
+                rows = list(cur.fetchall())
+        finally:
+            conn.close()
+    except Exception as exc:
+        _dixie_last_error = f"Blacklist DB error: {exc}"
+        _dixie_down_until = time.monotonic() + DIXIE_RETRY_AFTER_SECONDS
+        return {"rows": [], "has_more": False, "error": _dixie_last_error}
+
+    return {"rows": rows[:page_size], "has_more": len(rows) > page_size, "error": ""}
+
+
+def _reset_dixie_backoff() -> None:
+    global _dixie_down_until
+    _dixie_down_until = 0.0
+    query_dixie_blacklist_page.clear()
+
+
+# ─── 6a. Blacklist ────────────────────────────────────────────────────────────
+
+def render_blacklist_section() -> None:
+    st.subheader("Blacklist")
+    st.caption("Read from the DixieModerator database (`s404394_DixieModerator` → `blacklist` table).")
+
+    if not PYMYSQL_AVAILABLE:
+        st.error("pymysql is not installed. Run: `pip install pymysql`")
+        return
+
+    search = st.text_input("Search by user ID or username", placeholder="e.g. 123456789012345678 or ToxicUser")
+    # Stack of `before_id` cursors for the pages visited so far; reset when the search changes.
+    if st.session_state.get("blacklist_search") != search:
+        st.session_state["blacklist_search"] = search
+        st.session_state["blacklist_cursors"] = [None]
+    cursors = st.session_state.setdefault("blacklist_cursors", [None])
+
+    with st.spinner("Loading blacklist…"):
+        page = query_dixie_blacklist_page(search, cursors[-1])
+
+    if page["error"]:
+        st.error(page["error"])
+        if st.button("Retry now"):
+            _reset_dixie_backoff()
+            st.rerun()
+        return
+
+    rows = page["rows"]
+    if not rows:
+        st.info("No entries match your search." if search else "No blacklist entries found.")
+        return
+
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("← Newer", disabled=len(cursors) == 1, use_container_width=True):
+            cursors.pop()
+            st.rerun()
+    with col_page:
+        st.caption(f"Page {len(cursors)} · {len(rows)} entr{'y' if len(rows) == 1 else 'ies'} shown")
+    with col_next:
+        if st.button("Older →", disabled=not page["has_more"], use_container_width=True):
+            cursors.append(rows[-1]["id"])
+            st.rerun()
+
+    import pandas as pd
+    df = pd.DataFrame(rows, columns=["id", "user_id", "username", "reason", "blacklist_date"])
+    df["user_id"] = df["user_id"].astype(str)
+    df["blacklist_date"] = pd.to_datetime(df["blacklist_date"], errors="coerce").dt.strftime("%Y-%m-%d %H:%M")
+    df = df.rename(columns={
+        "id": "ID",
+        "user_id": "User ID",
+        "username": "Username",
+        "reason": "Reason",
+        "blacklist_date": "Blacklisted On",
+    })
+    st.dataframe(df, use_container_width=True, hide_index=True)
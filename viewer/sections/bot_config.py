@@ -0,0 +1,149 @@
+"""Bot Config Editor section (tech only)."""
+import json
+from typing import Any, Dict
+
+import streamlit as st
+
+from viewer.core import APP_ROOT, MYSQL_AVAILABLE, _new_conn, ensure_viewer_schema, log_admin_action
+
+
+# ── Bot config overrides ──────────────────────────────────────────────────────
+
+def query_bot_config_overrides() -> Dict[str, str]:
+    if not MYSQL_AVAILABLE:
+        return {}
+    try:
+        ensure_viewer_schema()
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT `key`, `value` FROM bot_config_overrides ORDER BY `key`")
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return {r["key"]: r["value"] for r in rows}
+    except Exception:
+        return {}
+
+
+def upsert_bot_config(key: str, value: str, updated_by: str) -> None:
+    ensure_viewer_schema()
+    conn = _new_conn()
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT INTO bot_config_overrides (`key`, `value`, updated_by)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            `value`    = VALUES(`value`),
+            updated_by = VALUES(updated_by)
+        """,
+        (key, value, updated_by),
+    )
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def delete_bot_config(key: str) -> None:
+    conn = _new_conn()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM bot_config_overrides WHERE `key` = %s", (key,))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+# ─── 7. Bot Config Editor (tech only) ────────────────────────────────────────
+
+# Keys that must never be exposed in the config editor UI
+_CONFIG_HIDDEN_KEYS = {
+    "token", "DISCORD_CLIENT_SECRET", "DISCORD_CLIENT_ID", "DISCORD_REDIRECT_URI",
+    "guild_id", "owners", "log_channel_id", "mention_channel_id", "update_channel_id",
+}
+
+
+def render_bot_config_editor(is_advisor: bool = False) -> None:
+    st.subheader("Bot Config Editor")
+    st.caption(
+        "Tech-only. Overrides are saved to the database. "
+        "Apply them to `config/config.json` and redeploy the bot to take effect."
+    )
+    if is_advisor:
+        st.info("👁️ View only — advisor access does not allow editing.")
+
+    if not MYSQL_AVAILABLE:
+        st.error("MySQL not available.")
+        return
+
+    discord_auth = st.session_state.get("discord_auth") or {}
+    me = (discord_auth.get("user") or {}).get("username") or "unknown"
+
+    # Load config.json for reference
+    config_json_path = APP_ROOT / "config" / "config.json"
+    raw_config: Dict[str, Any] = {}
+    try:
+        with open(config_json_path, "r", encoding="utf-8") as fh:
+            raw_config = json.load(fh)
+    except Exception:
+        st.warning("Could not read config/config.json — showing DB overrides only.")
+
+    safe_config = {k: v for k, v in raw_config.items() if k not in _CONFIG_HIDDEN_KEYS}
+    db_overrides = query_bot_config_overrides()
+
+    # Add / update override — hidden in view-only mode
+    if not is_advisor:
+        with st.expander("Add / update config override", expanded=False):
+            o_key = st.text_input("Config key", key="cfg_key").strip()
+            o_val = st.text_area("Value (JSON or plain string)", key="cfg_val", height=80).strip()
+            if st.button("Save override", key="cfg_save_btn", type="primary"):
+                if not o_key:
+                    st.warning("Key cannot be empty.")
+                elif o_key in _CONFIG_HIDDEN_KEYS:
+                    st.error("That key is protected and cannot be overridden here.")
+                else:
+                    try:
+                        upsert_bot_config(o_key, o_val, me)
+                        log_admin_action(me, "config_override", f"key={o_key}")
+                        st.success(f"Override saved: `{o_key}`.")
+                        st.rerun()
+                    except Exception as exc:
+                        st.error(f"Failed: {exc}")
+
+    st.divider()
+
+    # Active DB overrides
+    if db_overrides:
+        st.markdown("**Active DB overrides**")
+        for k, v in sorted(db_overrides.items()):
+            with st.expander(f"`{k}`", expanded=False):
+                if is_advisor:
+                    st.text(v)
+                else:
+                    edited_v = st.text_area("Value", value=v, key=f"cfg_ov_{k}", height=80)
+                    col_s, col_d, _ = st.columns([1, 1, 3])
+                    with col_s:
+                        if st.button("Update", key=f"cfg_upd_{k}", type="primary"):
+                            try:
+                                upsert_bot_config(k, edited_v.strip(), me)
+                                log_admin_action(me, "config_override_update", f"key={k}")
+                                st.success("Updated.")
+                                st.rerun()
+                            except Exception as exc:
+                                st.error(f"Failed: {exc}")
+                    with col_d:
+                        if st.button("Delete", key=f"cfg_del_{k}"):
+                            try:
+                                delete_bot_config(k)
+                                log_admin_action(me, "config_override_delete", f"key={k}")
+                                st.success("Deleted.")
+                                st.rerun()
+                            except Exception as exc:
+                                st.error(f"Failed: {exc}")
+        st.divider()
+    else:
+        st.info("No active overrides yet.")
+
+    # Reference: current config.json safe fields
+    if safe_config:
+        with st.expander("Current config.json (read-only reference)", expanded=False):
+            st.json(safe_config)
@@ -0,0 +1,132 @@
+"""Category Management section: display names for ticket category IDs."""
+from typing import Dict, List
+
+import streamlit as st
+
+from viewer.core import (
+    MYSQL_AVAILABLE,
+    _new_conn,
+    app_config,
+    ensure_viewer_schema,
+    log_admin_action,
+    query_category_names,
+)
+
+
+def upsert_category_name(category_id: int, category_name: str, updated_by: str) -> None:
+    ensure_viewer_schema()
+    conn = _new_conn()
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT INTO ticket_category_names (category_id, category_name, updated_by)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            category_name = VALUES(category_name),
+            updated_by    = VALUES(updated_by)
+        """,
+        (category_id, category_name, updated_by),
+    )
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def delete_category_name(category_id: int) -> None:
+    conn = _new_conn()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM ticket_category_names WHERE category_id = %s", (category_id,))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def query_distinct_category_ids() -> List[int]:
+    """Return all distinct category_ids in active_tickets."""
+    if not MYSQL_AVAILABLE:
+        return []
+    try:
+        conn = _new_conn()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT DISTINCT category_id FROM active_tickets "
+            "WHERE category_id IS NOT NULL ORDER BY category_id"
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return [r[0] for r in rows if r[0]]
+    except Exception:
+        return []
+
+
+# ─── 6. Category Management ───────────────────────────────────────────────────
+
+def render_category_management(is_advisor: bool = False) -> None:
+    st.subheader("Category Management")
+    st.caption("Assign human-readable names to Discord category channel IDs used in tickets.")
+    if is_advisor:
+        st.info("👁️ View only — advisor access does not allow editing.")
+
+    if not MYSQL_AVAILABLE:
+        st.error("MySQL not available.")
+        return
+
+    discord_auth = st.session_state.get("discord_auth") or {}
+    me = (discord_auth.get("user") or {}).get("username") or "unknown"
+
+    # Combine IDs from config.py, DB, and saved overrides
+    config_cat_map: Dict[int, str] = {}
+    if app_config:
+        try:
+            config_cat_map = {v: k for k, v in getattr(app_config, "CATEGORY_IDS", {}).items()}
+        except Exception:
+            pass
+
+    db_ids      = query_distinct_category_ids()
+    saved_names = query_category_names()
+    all_ids: List[int] = sorted(
+        set(list(config_cat_map.keys()) + db_ids + list(saved_names.keys()))
+    )
+
+    if not all_ids:
+        st.info("No category IDs found yet — they appear once tickets are created.")
+        return
+
+    st.markdown(f"**{len(all_ids)} category ID{'s' if len(all_ids) != 1 else ''} known**")
+
+    for cat_id in all_ids:
+        default_name = saved_names.get(cat_id) or config_cat_map.get(cat_id) or ""
+        display_label = saved_names.get(cat_id) or config_cat_map.get(cat_id) or "unnamed"
+        with st.expander(f"`{cat_id}` — {display_label}", expanded=False):
+            if is_advisor:
+                st.caption(f"ID: {cat_id}  |  Name: {display_label}")
+            else:
+                new_name = st.text_input(
+                    "Friendly name",
+                    value=default_name,
+                    key=f"cat_name_{cat_id}",
+                ).strip()
+                col_s, col_d, _ = st.columns([1, 1, 3])
+                with col_s:
+                    if st.button("Save", key=f"cat_save_{cat_id}", type="primary"):
+                        if not new_name:
+                            st.warning("Name cannot be empty.")
+                        else:
+                            try:
+                                upsert_category_name(cat_id, new_name, me)
+                                log_admin_action(me, "rename_category", f"id={cat_id} name={new_name}")
+                                st.success(f"Saved `{new_name}` for {cat_id}.")
+                                st.rerun()
+                            except Exception as exc:
+                                st.error(f"Failed: {exc}")
+                with col_d:
+                    if cat_id in saved_names:
+                        if st.button("Clear override", key=f"cat_del_{cat_id}"):
+                            try:
+                                delete_category_name(cat_id)
+                                log_admin_action(me, "clear_category_name", f"id={cat_id}")
+                                st.success("Override cleared.")
+                                st.rerun()
+                            except Exception as exc:
+                                st.error(f"Failed: {exc}")
@@ -0,0 +1,100 @@
+"""Export section: stream tickets, transcript summaries or messages to downloadable files."""
+import os
+import secrets
+import time
+
+import streamlit as st
+
+from ticket_export import DATASETS, export_parts
+from viewer.core import APP_ROOT, MYSQL_AVAILABLE, _new_conn, log_admin_action
+
+# Outside Streamlit's static folder: files are only handed out through this session's
+# download buttons, which Streamlit serves from memory - hence the part size cap.
+EXPORT_DIR = APP_ROOT / "exports"
+EXPORT_MAX_AGE_SECONDS = 60 * 60
+EXPORT_PART_BYTES = 100 * 1024 * 1024
+
+DATASET_LABELS = {
+    "tickets": "Tickets (active_tickets)",
+    "transcripts": "Transcript summaries (ticket_transcripts)",
+    "messages": "Transcript messages (flattened)",
+}
+FORMAT_MIME = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+def _prune_old_exports() -> None:
+    if not EXPORT_DIR.exists():
+        return
+    cutoff = time.time() - EXPORT_MAX_AGE_SECONDS
+    for entry in os.scandir(EXPORT_DIR):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def render_export_section() -> None:
+    st.subheader("Export")
+    st.caption(
+        "Streams the selected table from MySQL in fixed-size chunks. Exports larger than "
+        f"{EXPORT_PART_BYTES // (1024 * 1024)} MB are split into parts, and files are deleted "
+        f"after {EXPORT_MAX_AGE_SECONDS // 60} minutes. "
+        "For scripted exports use `python ticket_export.py <dataset>`."
+    )
+    _prune_old_exports()
+
+    if not MYSQL_AVAILABLE:
+        st.error("MySQL not available.")
+        return
+
+    col_ds, col_fmt = st.columns([3, 1])
+    with col_ds:
+        dataset = st.selectbox("Dataset", list(DATASETS), format_func=DATASET_LABELS.get, key="export_dataset")
+    with col_fmt:
+        fmt = st.radio("Format", ["csv", "parquet"], horizontal=True, key="export_format")
+
+    if st.button("Build export", type="primary"):
+        EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+        template = str(EXPORT_DIR / f"{dataset}-{secrets.token_urlsafe(16)}-part{{part}}.{fmt}")
+        conn = None
+        try:
+            with st.spinner("Exporting…"):
+                conn = _new_conn()
+                count, paths = export_parts(dataset, fmt, template, EXPORT_PART_BYTES, conn=conn)
+        except Exception as exc:
+            st.error(f"Export failed: {exc}")
+            return
+        finally:
+            if conn is not None:
+                conn.close()
+        discord_auth = st.session_state.get("discord_auth") or {}
+        me = (discord_auth.get("user") or {}).get("username") or "unknown"
+        log_admin_action(me, "export", f"dataset={dataset} format={fmt} rows={count} parts={len(paths)}")
+        st.session_state["export_ready"] = {
+            "names": [os.path.basename(path) for path in paths],
+            "rows": count,
+            "dataset": dataset,
+            "format": fmt,
+        }
+
+    ready = st.session_state.get("export_ready")
+    if not ready:
+        return
+    parts = [EXPORT_DIR / name for name in ready["names"]]
+    if not all(part.exists() for part in parts):
+        st.session_state.pop("export_ready", None)
+        st.info("The last export has expired; build it again.")
+        return
+    st.success(f"{ready['rows']} {ready['dataset']} rows exported in {len(parts)} file(s).")
+    for index, part in enumerate(parts, start=1):
+        suffix = f"-part{index}" if len(parts) > 1 else ""
+        st.download_button(
+            f"Download {ready['format'].upper()}" + (f" part {index}/{len(parts)}" if len(parts) > 1 else ""),
+            # Read on click, not on every rerun.
+            data=part.read_bytes,
+            file_name=f"{ready['dataset']}{suffix}.{ready['format']}",
+            mime=FORMAT_MIME[ready["format"]],
+            on_click="ignore",
+            key=f"export_download_{part.name}",
+        )
@@ -0,0 +1,125 @@
+"""Flagged Users section."""
+from typing import Any, Dict, List
+
+import streamlit as st
+
+from viewer.core import MYSQL_AVAILABLE, _new_conn, ensure_viewer_schema, log_admin_action
+
+
+# ── Flagged users ─────────────────────────────────────────────────────────────
+
+def query_flagged_users() -> List[Dict[str, Any]]:
+    if not MYSQL_AVAILABLE:
+        return []
+    try:
+        ensure_viewer_schema()
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            "SELECT user_id, username, flag_type, reason, flagged_by, flagged_at "
+            "FROM flagged_users ORDER BY flagged_at DESC"
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return rows
+    except Exception:
+        return []
+
+
+def upsert_flagged_user(
+    user_id: int, username: str, flag_type: str, reason: str, flagged_by: str
+) -> None:
+    ensure_viewer_schema()
+    conn = _new_conn()
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT INTO flagged_users (user_id, username, flag_type, reason, flagged_by, flagged_at)
+        VALUES (%s, %s, %s, %s, %s, NOW())
+        ON DUPLICATE KEY UPDATE
+            username   = VALUES(username),
+            flag_type  = VALUES(flag_type),
+            reason     = VALUES(reason),
+            flagged_by = VALUES(flagged_by),
+            flagged_at = NOW()
+        """,
+        (user_id, username, flag_type, reason, flagged_by),
+    )
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def delete_flagged_user(user_id: int) -> None:
+    conn = _new_conn()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM flagged_users WHERE user_id = %s", (user_id,))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+# ─── 5. Banned / Flagged Users ────────────────────────────────────────────────
+
+def render_flagged_users_section(is_advisor: bool = False) -> None:
+    st.subheader("Banned / Flagged Users")
+    if is_advisor:
+        st.info("👁️ View only — advisor access does not allow editing.")
+
+    if not MYSQL_AVAILABLE:
+        st.error("MySQL not available.")
+        return
+
+    discord_auth = st.session_state.get("discord_auth") or {}
+    me = (discord_auth.get("user") or {}).get("username") or "unknown"
+
+    if not is_advisor:
+        with st.expander("Add / update flag", expanded=False):
+            f_uid  = st.text_input("Discord User ID (required)", key="fl_uid").strip()
+            f_name = st.text_input("Username (optional)", key="fl_name").strip()
+            f_type = st.selectbox("Flag type", ["flagged", "banned", "warn", "watch"], key="fl_type")
+            f_rsn  = st.text_area("Reason", key="fl_reason", height=80).strip()
+            if st.button("Save flag", key="fl_save_btn", type="primary"):
+                if not f_uid.isdigit():
+                    st.warning("User ID must be a number.")
+                else:
+                    try:
+                        upsert_flagged_user(int(f_uid), f_name, f_type, f_rsn, me)
+                        log_admin_action(me, "flag_user", f"type={f_type} uid={f_uid} user={f_name}: {f_rsn}")
+                        st.success(f"User {f_uid} flagged as {f_type}.")
+                        st.rerun()
+                    except Exception as exc:
+                        st.error(f"Failed: {exc}")
+
+    st.divider()
+
+    with st.spinner("Loading…"):
+        flagged = query_flagged_users()
+
+    if not flagged:
+        st.info("No flagged users.")
+        return
+
+    st.markdown(f"**{len(flagged)} flagged user{'s' if len(flagged) != 1 else ''}**")
+    for row in flagged:
+        uid    = row.get("user_id")
+        uname  = row.get("username") or "—"
+        ftype  = row.get("flag_type", "flagged")
+        reason = row.get("reason") or "No reason given"
+        by_who = row.get("flagged_by") or "—"
+        at_dt  = row.get("flagged_at")
+        at_str = str(at_dt)[:10] if at_dt else "—"
+        badge  = {"banned": "🔴", "flagged": "🟠", "warn": "🟡", "watch": "🔵"}.get(ftype, "⚪")
+        with st.expander(f"{badge} `{uid}` · {uname} · {ftype}", expanded=False):
+            st.markdown(f"**Reason:** {reason}")
+            st.caption(f"Flagged by {by_who} on {at_str}")
+            if not is_advisor:
+                if st.button("Remove flag", key=f"fl_del_{uid}"):
+                    try:
+                        delete_flagged_user(int(uid))
+                        log_admin_action(me, "unflag_user", f"uid={uid} user={uname}")
+                        st.success(f"Flag removed for {uid}.")
+                        st.rerun()
+                    except Exception as exc:
+                        st.error(f"Failed: {exc}")
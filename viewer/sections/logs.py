@@ -0,0 +1,837 @@
+"""Logs section: ticket list, full-text search results and the transcript viewer."""
+import json
+import os
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+from urllib.parse import quote
+
+import streamlit as st
+
+from search_index import TranscriptSearchIndex
+from transcript_catalog import default_path
+from viewer.core import (
+    DEFAULT_TRANSCRIPT_DIRS,
+    MYSQL_AVAILABLE,
+    SQLALCHEMY_AVAILABLE,
+    _new_conn,
+    app_config,
+    find_dir,
+    get_transcript_catalog,
+    query_category_names,
+    query_mysql_transcript,
+)
+from viewer.transcripts import (
+    KIND_CODES,
+    build_message_row,
+    get_message_columns,
+    get_message_table,
+    inject_transcript_styles,
+    load_transcript_file,
+    load_transcript_json,
+    message_day_bounds,
+    message_filter_mask,
+    parse_transcript,
+    render_message_rows,
+    render_ticket_summary_panel,
+    rows_matching,
+    transcript_source_version,
+)
+
+
+SEARCH_PAGE_SIZE = 20
+LIVE_POLL_SECONDS = 5
+LIVE_FETCH_LIMIT = 500
+PICKER_LIMIT = 50
+
+
+def query_exact_ticket_counts() -> Dict[str, int]:
+    """Return exact open/closed ticket counts directly from the DB (no LIMIT)."""
+    if not MYSQL_AVAILABLE:
+        return {"open": 0, "closed": 0}
+    try:
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            """
+            SELECT
+                SUM(status = 'open')   AS open_count,
+                SUM(status = 'closed') AS closed_count
+            FROM active_tickets
+            """
+        )
+        row = cursor.fetchone() or {}
+        cursor.close()
+        conn.close()
+        return {
+            "open":   int(row.get("open_count") or 0),
+            "closed": int(row.get("closed_count") or 0),
+        }
+    except Exception:
+        return {"open": 0, "closed": 0}
+
+
+def query_open_tickets_with_age() -> List[Dict[str, Any]]:
+    """Return open tickets enriched with age_hours since creation."""
+    if not MYSQL_AVAILABLE:
+        return []
+    try:
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            """
+            SELECT channel_id, user_id, member_username, mod_username,
+                   category_id, created_at,
+                   TIMESTAMPDIFF(HOUR, created_at, NOW()) AS age_hours
+            FROM active_tickets
+            WHERE status = 'open'
+            ORDER BY created_at ASC
+            """
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return rows
+    except Exception:
+        return []
+
+
+# ── User search ───────────────────────────────────────────────────────────────
+
+@st.cache_data(ttl=30, show_spinner=False)
+def query_user_tickets(search_term: str) -> List[Dict[str, Any]]:
+    """Return tickets matching a username or user ID."""
+    if not MYSQL_AVAILABLE or not search_term.strip():
+        return []
+    try:
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        like_term = f"%{search_term.strip()}%"
+        try:
+            uid = int(search_term.strip())
+            cursor.execute(
+                """
+                SELECT channel_id, user_id, member_username, mod_username,
+                       category_id, created_at, closed_at, status
+                FROM active_tickets
+                WHERE user_id = %s OR member_username LIKE %s
+                ORDER BY created_at DESC LIMIT 100
+                """,
+                (uid, like_term),
+            )
+        except ValueError:
+            cursor.execute(
+                """
+                SELECT channel_id, user_id, member_username, mod_username,
+                       category_id, created_at, closed_at, status
+                FROM active_tickets
+                WHERE member_username LIKE %s
+                ORDER BY created_at DESC LIMIT 100
+                """,
+                (like_term,),
+            )
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return rows
+    except Exception:
+        return []
+
+
+# ─── 3. Open Ticket Monitor ───────────────────────────────────────────────────
+
+def render_open_tickets_monitor() -> None:
+    st.subheader("Open Ticket Monitor")
+
+    if not MYSQL_AVAILABLE:
+        st.error("MySQL not available.")
+        return
+
+    with st.spinner("Loading open tickets…"):
+        tickets = query_open_tickets_with_age()
+
+    if not tickets:
+        st.success("No open tickets right now.")
+        return
+
+    st.metric("Currently open", len(tickets))
+    stale = [t for t in tickets if (t.get("age_hours") or 0) >= 48]
+    if stale:
+        st.warning(
+            f"{len(stale)} ticket{'s' if len(stale) != 1 else ''} stale (≥ 48 h without a response)"
+        )
+
+    cat_names_db = query_category_names()
+    config_cat_map: Dict[int, str] = {}
+    if app_config:
+        try:
+            config_cat_map = {v: k for k, v in getattr(app_config, "CATEGORY_IDS", {}).items()}
+        except Exception:
+            pass
+
+    display = []
+    for t in tickets:
+        cat_id   = t.get("category_id")
+        cat_name = cat_names_db.get(cat_id) or config_cat_map.get(cat_id) or str(cat_id or "—")
+        age_h    = t.get("age_hours") or 0
+        display.append({
+            "Channel":  str(t.get("channel_id", "")),
+            "User":     t.get("member_username", ""),
+            "Mod":      t.get("mod_username") or "Unassigned",
+            "Category": cat_name,
+            "Age (h)":  age_h,
+            "Stale":    "⚠ yes" if age_h >= 48 else "",
+        })
+
+    try:
+        import pandas as pd
+        df = pd.DataFrame(display).sort_values("Age (h)", ascending=False)
+        st.dataframe(df, use_container_width=True, hide_index=True)
+    except Exception:
+        st.table(display)
+
+
+# ─── 4. Ticket Search by User ─────────────────────────────────────────────────
+
+def render_user_search() -> None:
+    st.subheader("Ticket Search by User")
+    st.caption("Search by Discord username or numeric user ID.")
+
+    search = st.text_input(
+        "Username or User ID",
+        placeholder="e.g. moussecake or 123456789012345678",
+        key="usr_search_q",
+    ).strip()
+
+    if not search:
+        return
+
+    if not MYSQL_AVAILABLE:
+        st.error("MySQL not available.")
+        return
+
+    with st.spinner("Searching…"):
+        results = query_user_tickets(search)
+
+    if not results:
+        st.info("No tickets found for that user.")
+        return
+
+    st.success(f"{len(results)} ticket{'s' if len(results) != 1 else ''} found")
+
+    for t in results:
+        channel_id = str(t.get("channel_id", ""))
+        member     = t.get("member_username", "—")
+        mod        = t.get("mod_username") or "Unassigned"
+        status     = t.get("status", "")
+        created    = str(t.get("created_at", ""))[:10]
+        closed     = str(t.get("closed_at", "") or "")[:10] or "—"
+        badge      = "🟢" if status == "open" else "⚫"
+        link       = f"?section=logs&channel={quote(channel_id)}"
+        st.markdown(
+            f"{badge} **#{channel_id}** · user: `{member}` · mod: {mod} "
+            f"· created: {created} · closed: {closed}"
+        )
+        st.link_button("Open Transcript", link, key=f"usrlink_{channel_id}")
+        st.divider()
+
+
+# ── Full-text search ─────────────────────────────────────────────────────────
+
+def get_search_index() -> TranscriptSearchIndex:
+    """Return the transcript search index maintained by the bot (SQLite FTS5)."""
+    configured = getattr(app_config, "SEARCH_INDEX_PATH", "") if app_config else ""
+    path = configured or default_path(str(find_dir(DEFAULT_TRANSCRIPT_DIRS)), "search_index.sqlite3")
+    return TranscriptSearchIndex(path)
+
+
+def render_indexed_search_results(search_index: TranscriptSearchIndex, search_query: str, show_empty: bool = True) -> None:
+    """Ranked, paginated ticket and message hits from the full-text index."""
+    if st.session_state.get("logs_search_last_q") != search_query:
+        st.session_state["logs_search_last_q"] = search_query
+        st.session_state["logs_search_page"] = 0
+    page = int(st.session_state.get("logs_search_page", 0))
+    offset = page * SEARCH_PAGE_SIZE
+
+    ticket_hits = search_index.search_tickets(search_query, limit=SEARCH_PAGE_SIZE + 1, offset=offset)
+    message_hits = search_index.search_messages(search_query, limit=SEARCH_PAGE_SIZE + 1, offset=offset)
+    has_next = len(ticket_hits) > SEARCH_PAGE_SIZE or len(message_hits) > SEARCH_PAGE_SIZE
+    ticket_hits = ticket_hits[:SEARCH_PAGE_SIZE]
+    message_hits = message_hits[:SEARCH_PAGE_SIZE]
+
+    if not ticket_hits and not message_hits and (show_empty or page > 0):
+        st.info("No tickets or messages match that search." if page == 0 else "No more results.")
+    public_base_url = os.getenv("STREAMLIT_PUBLIC_URL", "").rstrip("/")
+
+    if ticket_hits:
+        st.markdown("**Matching tickets**")
+        for t in ticket_hits:
+            channel_id = str(t.get("channel_id", ""))
+            owner = t.get("owner_name") or t.get("member_username") or "—"
+            closed_by = t.get("closed_by") or "—"
+            category = t.get("category") or "—"
+            closed = str(t.get("closed_at") or "")[:10] or "—"
+            relative_link = f"?section=logs&channel={quote(channel_id)}"
+            st.markdown(f"**#{channel_id}** · user: `{owner}` · {category} · closed by: {closed_by} · closed: {closed}")
+            reason = (t.get("open_reason") or "").strip()
+            if reason:
+                st.caption(reason[:200])
+            st.link_button("Open Transcript", relative_link, key=f"fts_ticket_{channel_id}")
+
+    if message_hits:
+        st.markdown("**Matching messages**")
+        for hit in message_hits:
+            channel_id = str(hit.get("channel_id", ""))
+            relative_link = f"?section=logs&channel={quote(channel_id)}"
+            copy_link = f"{public_base_url}/{relative_link}" if public_base_url else relative_link
+            st.markdown(
+                f"**#{channel_id}** · {hit.get('author') or 'Unknown'} · "
+                f"{str(hit.get('timestamp') or '')[:16]}  \n{hit.get('snippet') or ''}"
+            )
+            col_open, col_copy = st.columns([0.25, 0.75])
+            with col_open:
+                st.link_button("Open Transcript", relative_link, key=f"fts_msg_{channel_id}_{hit.get('position')}")
+            with col_copy:
+                st.text_input("Copy link", value=copy_link, key=f"fts_copy_{channel_id}_{hit.get('position')}", label_visibility="collapsed")
+
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if page > 0 and st.button("← Previous", key="logs_search_prev"):
+            st.session_state["logs_search_page"] = page - 1
+            st.rerun()
+    with col_page:
+        st.caption(f"Page {page + 1}")
+    with col_next:
+        if has_next and st.button("Next →", key="logs_search_next"):
+            st.session_state["logs_search_page"] = page + 1
+            st.rerun()
+
+
+def render_user_ticket_results(results: List[Dict[str, Any]]) -> None:
+    """Tickets found by username / user ID in active_tickets, with open and copy-link controls."""
+    st.success(f"{len(results)} ticket{'s' if len(results) != 1 else ''} found")
+    public_base_url = os.getenv("STREAMLIT_PUBLIC_URL", "").rstrip("/")
+    for t in results:
+        channel_id = str(t.get("channel_id", ""))
+        member     = t.get("member_username", "—")
+        mod        = t.get("mod_username") or "Unassigned"
+        status     = t.get("status", "")
+        created    = str(t.get("created_at", ""))[:10]
+        closed     = str(t.get("closed_at", "") or "")[:10] or "—"
+        badge      = "🟢" if status == "open" else "⚫"
+        relative_link = f"?section=logs&channel={quote(channel_id)}"
+        copy_link = f"{public_base_url}/{relative_link}" if public_base_url else relative_link
+        st.markdown(f"{badge} **#{channel_id}** · user: `{member}` · mod: {mod} · created: {created} · closed: {closed}")
+        col_open, col_copy = st.columns([0.25, 0.75])
+        with col_open:
+            st.link_button("Open Transcript", relative_link, key=f"srch_link_{channel_id}")
+        with col_copy:
+            st.text_input("Copy link", value=copy_link, key=f"srch_copy_{channel_id}", label_visibility="collapsed")
+        st.divider()
+
+
+def render_logs_view(tickets: List[Dict[str, Any]], transcript_map: Dict[str, Path], db_transcripts_map: Dict[str, Dict[str, Any]], is_admin: bool = False):
+    st.subheader("Logs")
+
+    # ── Search bar (user search) ──────────────────────────────────────────────
+    search_query = st.text_input(
+        "Search tickets and transcripts",
+        placeholder="e.g. moussecake, 123456789012345678 or stolen art",
+        key="logs_search_q",
+    ).strip()
+
+    if search_query:
+        search_index = get_search_index()
+        indexed = not search_index.is_empty()
+        # The index only holds tickets saved or backfilled since it was built; the MySQL
+        # username / user ID lookup still finds everything older.
+        with st.spinner("Searching…"):
+            user_tickets = query_user_tickets(search_query)
+        if indexed:
+            render_indexed_search_results(search_index, search_query, show_empty=not user_tickets)
+        elif not MYSQL_AVAILABLE:
+            st.error("MySQL not available.")
+            return
+        if user_tickets:
+            render_user_ticket_results(user_tickets)
+        elif not indexed:
+            st.info("No tickets found for that user.")
+        return
+
+    if not tickets:
+        st.info("No tickets found in database.")
+        return
+
+    open_tickets = [t for t in tickets if str(t.get("status", "")).lower() == "open"]
+    closed_tickets = [t for t in tickets if str(t.get("status", "")).lower() == "closed"]
+
+    # Use exact DB counts for tab labels — the ticket list is capped at 500 rows
+    # so len(open_tickets)/len(closed_tickets) would under-report on large datasets.
+    exact_counts = query_exact_ticket_counts()
+    open_label   = f"Open ({exact_counts['open']})"
+    closed_label = f"Closed ({exact_counts['closed']})"
+
+    tab_open, tab_closed, tab_monitor = st.tabs([
+        open_label,
+        closed_label,
+        "Open Ticket Monitor",
+    ])
+
+    def render_ticket_list(items: List[Dict[str, Any]]):
+        if not items:
+            st.write("No tickets in this category.")
+            return
+        public_base_url = os.getenv("STREAMLIT_PUBLIC_URL", "").rstrip("/")
+        for ticket in items:
+            channel_id = str(ticket.get("channel_id"))
+            member = ticket.get("member_username", "Unknown")
+            mod = ticket.get("mod_username") or "Unassigned"
+            created = ticket.get("created_at", "")
+            category = str(ticket.get("category") or ticket.get("category_id") or "")
+            category_str = f" · {category}" if category else ""
+            relative_link = f"?section=logs&channel={quote(channel_id)}"
+            copy_link = f"{public_base_url}/{relative_link}" if public_base_url else relative_link
+            has_transcript = channel_id in transcript_map or channel_id in db_transcripts_map
+            st.markdown(f"**#{channel_id}** · {member} · mod: {mod} · created: {created}{category_str}")
+            col_open, col_copy = st.columns([0.25, 0.75])
+            with col_open:
+                st.link_button("Open Transcript", relative_link)
+            with col_copy:
+                st.text_input(
+                    "Copy link",
+                    value=copy_link,
+                    key=f"copy_link_{channel_id}_{ticket.get('status', 'unknown')}",
+                    label_visibility="collapsed",
+                )
+            if not has_transcript:
+                if str(ticket.get("status", "")).lower() == "open":
+                    st.caption("Open ticket · the link follows it live until the transcript is saved.")
+                else:
+                    st.caption("Transcript file not found yet for this ticket.")
+
+    with tab_open:
+        render_ticket_list(open_tickets)
+    with tab_closed:
+        render_ticket_list(closed_tickets)
+    with tab_monitor:
+        if is_admin:
+            render_open_tickets_monitor()
+        else:
+            st.info("Admin access required.")
+
+    if is_admin and SQLALCHEMY_AVAILABLE:
+        with st.expander("External transcript database", expanded=False):
+            render_external_db_browser()
+
+
+def query_live_messages(channel_id: str, after_message_id: int = 0) -> List[Dict[str, Any]]:
+    """Messages the bot published for an open ticket after `after_message_id`, oldest first."""
+    if not MYSQL_AVAILABLE:
+        return []
+    try:
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            "SELECT message_id, message_json FROM ticket_live_messages "
+            "WHERE channel_id = %s AND message_id > %s ORDER BY message_id LIMIT %s",
+            (int(channel_id), int(after_message_id), LIVE_FETCH_LIMIT),
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+    except Exception:
+        return []
+    messages = []
+    for row in rows:
+        try:
+            msg = json.loads(row["message_json"])
+        except ValueError:
+            continue
+        msg["message_id"] = row["message_id"]
+        messages.append(msg)
+    return messages
+
+
+def render_live_ticket_view(
+    channel_id: str,
+    image_root: Path,
+    staff_identifiers: List[str],
+    show_internal: bool,
+    internal_markers: List[str],
+) -> None:
+    """Follow an open ticket: each poll fetches only messages newer than the last one seen."""
+    st.caption(f"🟢 Live · ticket #{channel_id} is still open; new messages appear every {LIVE_POLL_SECONDS}s.")
+    state_key = f"live_ticket_{channel_id}"
+
+    @st.fragment(run_every=LIVE_POLL_SECONDS)
+    def _poll():
+        state = st.session_state.setdefault(state_key, {"last_id": 0, "rows": []})
+        new_messages = query_live_messages(channel_id, state["last_id"])
+        if new_messages:
+            state["last_id"] = new_messages[-1]["message_id"]
+            state["rows"].extend(build_message_row(m, internal_markers, staff_identifiers) for m in new_messages)
+        if not state["rows"]:
+            st.info("No messages published for this ticket yet.")
+            return
+        render_message_rows(state["rows"], image_root, show_internal, f"live_{channel_id}")
+
+    _poll()
+
+
+def _snowflake_prefix_ranges(prefix: str):
+    """Numeric [low, high) ranges covering every 17-20 digit snowflake starting with `prefix`."""
+    if not prefix.isdigit() or prefix.startswith("0"):
+        return []
+    value = int(prefix)
+    return [
+        (value * 10 ** (length - len(prefix)), (value + 1) * 10 ** (length - len(prefix)))
+        for length in range(max(17, len(prefix)), 21)
+    ]
+
+
+def query_db_transcript_matches(channel_prefix: str, owner_prefix: str, closed_from: str, closed_to: str, limit: int) -> List[Dict[str, Any]]:
+    """Index-backed ticket_transcripts lookup for the picker (channel id ranges, owner prefix, closed date)."""
+    if not MYSQL_AVAILABLE:
+        return []
+    clauses, params = [], []
+    if channel_prefix:
+        ranges = _snowflake_prefix_ranges(channel_prefix)
+        if not ranges:
+            return []
+        clauses.append("(" + " OR ".join("(channel_id >= %s AND channel_id < %s)" for _ in ranges) + ")")
+        for low, high in ranges:
+            params += [low, high]
+    if owner_prefix:
+        escaped = owner_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        clauses.append("owner_name LIKE %s")
+        params.append(f"{escaped}%")
+    if closed_from:
+        clauses.append("closed_at >= %s")
+        params.append(closed_from)
+    if closed_to:
+        clauses.append("closed_at < %s")
+        params.append(closed_to)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    try:
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            f"SELECT channel_id, owner_name, category_name AS category, closed_at FROM ticket_transcripts {where} "
+            "ORDER BY channel_id DESC LIMIT %s",
+            (*params, limit),
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        for row in rows:
+            row["channel_id"] = str(row["channel_id"])
+        return rows
+    except Exception:
+        return []
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def search_transcripts(transcript_dir: str, query: str, closed_from: str = None, closed_to: str = None, limit: int = PICKER_LIMIT) -> List[Dict[str, Any]]:
+    """Top matches from the local catalogue and ticket_transcripts, newest channel first."""
+    term = query.strip()
+    channel_prefix = term if term.isdigit() else ""
+    owner_prefix = "" if channel_prefix else term
+    matches: Dict[str, Dict[str, Any]] = {}
+    if os.path.isdir(transcript_dir):
+        for row in get_transcript_catalog(transcript_dir).search(channel_prefix, owner_prefix, closed_from, closed_to, limit):
+            matches[row["channel_id"]] = row
+    for row in query_db_transcript_matches(channel_prefix, owner_prefix, closed_from, closed_to, limit):
+        matches.setdefault(row["channel_id"], row)
+    return sorted(matches.values(), key=lambda r: int(r["channel_id"]), reverse=True)[:limit]
+
+
+def render_transcript_picker(preselected_channel: str) -> str:
+    """Search box + date range feeding a selectbox of at most PICKER_LIMIT matching tickets."""
+    col_q, col_dates = st.columns([3, 2])
+    with col_q:
+        query = st.text_input(
+            "Find ticket",
+            placeholder="Channel ID prefix or owner name",
+            key="transcript_picker_q",
+        )
+    with col_dates:
+        dates = st.date_input("Closed between", value=(), key="transcript_picker_dates")
+    closed_from = closed_to = None
+    if isinstance(dates, (list, tuple)) and dates:
+        closed_from = dates[0].isoformat()
+        closed_to = (dates[-1] + timedelta(days=1)).isoformat()
+
+    matches = search_transcripts(str(find_dir(DEFAULT_TRANSCRIPT_DIRS)), query, closed_from, closed_to)
+    labels = {
+        m["channel_id"]: f"#{m['channel_id']} · {m.get('owner_name') or 'Unknown'} · {str(m.get('closed_at') or '')[:10] or 'open'}"
+        for m in matches
+    }
+    options = list(labels)
+    if preselected_channel and preselected_channel not in labels:
+        options.insert(0, preselected_channel)
+    if not options:
+        st.info("No transcripts match." if query or closed_from else "No transcript files found.")
+        return ""
+    if len(matches) >= PICKER_LIMIT:
+        st.caption(f"Showing the newest {PICKER_LIMIT} matches; refine the search to narrow it down.")
+    index = options.index(preselected_channel) if preselected_channel in options else 0
+    return st.selectbox("Select ticket channel", options, index=index, format_func=lambda c: labels.get(c, f"#{c}"))
+
+
+def render_transcript_view(
+    transcript_map: Dict[str, Path],
+    db_transcripts_map: Dict[str, Dict[str, Any]],
+    image_root: Path,
+    staff_identifiers: List[str],
+    show_internal: bool,
+    internal_markers: List[str],
+    preselected_channel: str,
+):
+    st.subheader("Transcript View")
+    inject_transcript_styles()
+    selected_channel = render_transcript_picker(preselected_channel)
+    if not selected_channel:
+        return
+
+    transcript_json: Dict[str, Any] = {}
+    messages = []
+    if selected_channel not in transcript_map and selected_channel not in db_transcripts_map:
+        # Older than the preloaded DB window, or not closed yet.
+        fetched = query_mysql_transcript(selected_channel)
+        if fetched is None:
+            if not selected_channel.isdigit():
+                st.warning("Transcript not found.")
+                return
+            render_live_ticket_view(selected_channel, image_root, staff_identifiers, show_internal, internal_markers)
+            return
+        db_transcripts_map = {selected_channel: fetched}
+
+    if selected_channel in transcript_map:
+        selected_path = transcript_map[selected_channel]
+        st.caption(f"Transcript file: {selected_path}")
+        if selected_path.suffix.lower() == ".json":
+            transcript_json = load_transcript_json(selected_path)
+            messages = transcript_json.get("messages", []) if isinstance(transcript_json, dict) else []
+        else:
+            raw = load_transcript_file(selected_path)
+            messages = parse_transcript(raw)
+            transcript_json = {"ticket": {"channel_id": selected_channel}, "messages": messages}
+        source_version = transcript_source_version(path=selected_path)
+    else:
+        transcript_json = db_transcripts_map.get(selected_channel, {})
+        st.caption("Transcript source: database")
+        messages = transcript_json.get("messages", []) if isinstance(transcript_json, dict) else []
+        source_version = transcript_source_version(transcript_json=transcript_json)
+
+    if not messages:
+        st.info("Transcript is empty or could not be parsed.")
+        return
+
+    ticket = transcript_json.get("ticket", {}) if isinstance(transcript_json, dict) else {}
+
+    left_col, right_col = st.columns([1.0, 2.2], gap="large")
+    with left_col:
+        render_ticket_summary_panel(ticket, messages, staff_identifiers)
+
+    with right_col:
+        category = ticket.get("category") or "Transcript"
+        st.markdown(f"## {category}")
+
+        # ── Filters ─────────────────────────────────────────────────────────
+        message_table = get_message_table(selected_channel, source_version, messages, internal_markers, staff_identifiers)
+        message_columns = get_message_columns(selected_channel, source_version, message_table, internal_markers, staff_identifiers)
+        all_authors = message_columns["authors"]
+
+        fc1, fc2 = st.columns([3, 2])
+        with fc1:
+            search_query = st.text_input(
+                "Search",
+                placeholder="Search content or author…",
+                key=f"search_{selected_channel}",
+            )
+        with fc2:
+            selected_authors = st.multiselect(
+                "Author",
+                all_authors,
+                placeholder="All authors",
+                key=f"authors_{selected_channel}",
+            )
+
+        # Date range — only rendered when the conversation spans multiple days
+        day_bounds = message_day_bounds(message_columns)
+        date_from = date_to = None
+        date_range_changed = False
+        if day_bounds:
+            min_date, max_date = day_bounds
+            if min_date != max_date:
+                dc1, dc2, _ = st.columns([1, 1, 2])
+                date_from = dc1.date_input(
+                    "From", value=min_date, min_value=min_date, max_value=max_date,
+                    key=f"df_{selected_channel}",
+                )
+                date_to = dc2.date_input(
+                    "To", value=max_date, min_value=min_date, max_value=max_date,
+                    key=f"dt_{selected_channel}",
+                )
+                date_range_changed = date_from != min_date or date_to != max_date
+
+        filters_active = bool(search_query or selected_authors or date_range_changed)
+
+        # Filter once with vectorized masks, then slice the result into each tab bucket by kind
+        mask = message_filter_mask(message_table, message_columns, search_query, selected_authors, date_from, date_to)
+        kind = message_columns["kind"]
+        visible_rows          = rows_matching(message_table, mask)
+        conversation_messages = rows_matching(message_table, mask & (kind != KIND_CODES["internal"]))
+        user_messages         = rows_matching(message_table, mask & (kind == KIND_CODES["user"]))
+        staff_messages        = rows_matching(message_table, mask & (kind == KIND_CODES["staff"]))
+        internal_messages     = rows_matching(message_table, mask & (kind == KIND_CODES["internal"]))
+
+        total_visible = len(visible_rows)
+        if filters_active:
+            st.caption(f"Showing **{total_visible}** of **{len(messages)}** messages")
+        else:
+            st.caption(f"**{len(messages)}** messages total")
+
+        # ── Tabs ─────────────────────────────────────────────────────────────
+        tab_conversation, tab_user, tab_staff, tab_internal = st.tabs(
+            [
+                f"Conversation ({len(conversation_messages)})",
+                f"User Responses ({len(user_messages)})",
+                f"Staff Replies ({len(staff_messages)})",
+                f"Internal ({len(internal_messages)})",
+            ]
+        )
+
+        with tab_conversation:
+            if conversation_messages:
+                render_message_rows(conversation_messages, image_root, False, "conversation")
+            else:
+                st.info("No messages match the current filters." if filters_active else "No user/staff conversation messages found.")
+
+        with tab_user:
+            if user_messages:
+                render_message_rows(user_messages, image_root, False, "user")
+            else:
+                st.info("No messages match the current filters." if filters_active else "No user responses found.")
+
+        with tab_staff:
+            if staff_messages:
+                render_message_rows(staff_messages, image_root, False, "staff")
+            else:
+                st.info("No messages match the current filters." if filters_active else "No staff replies found.")
+
+        with tab_internal:
+            if internal_messages:
+                render_message_rows(internal_messages, image_root, True, "internal")
+            else:
+                st.info("No messages match the current filters." if filters_active else "No internal messages found.")
+
+
+EXTERNAL_DB_TABLES = ("transcripts", "messages", "transcript_messages", "ticket_messages")
+EXTERNAL_DB_PAGE_SIZE = 100
+EXTERNAL_DB_MAX_ENGINES = 4
+
+
+def external_db_urls() -> Dict[str, str]:
+    """Configured external transcript databases, label -> SQLAlchemy URL (EXTERNAL_TRANSCRIPT_DB_URLS in config.py)."""
+    configured = getattr(app_config, "EXTERNAL_TRANSCRIPT_DB_URLS", {}) if app_config else {}
+    return {str(label): str(url) for label, url in dict(configured or {}).items() if url}
+
+
+def _dispose_engine(engine) -> None:
+    engine.dispose()
+
+
+@st.cache_resource(show_spinner=False, max_entries=EXTERNAL_DB_MAX_ENGINES, on_release=_dispose_engine)
+def get_sqlalchemy_engine(url: str):
+    """One pooled SQLAlchemy engine per configured URL; evicted engines close their pools."""
+    from sqlalchemy import create_engine
+
+    try:
+        return create_engine(url, pool_pre_ping=True, pool_recycle=1800, pool_size=2, max_overflow=2)
+    except TypeError:
+        # Dialects with a non-queue pool (e.g. in-memory SQLite) reject the sizing arguments.
+        return create_engine(url, pool_pre_ping=True)
+
+
+@st.cache_data(ttl=600, max_entries=EXTERNAL_DB_MAX_ENGINES, show_spinner=False)
+def discover_transcript_table(url: str) -> Dict[str, str]:
+    """Find the transcript table and its timestamp column once, instead of reflecting on every page."""
+    from sqlalchemy import inspect
+
+    insp = inspect(get_sqlalchemy_engine(url))
+    tables = set(insp.get_table_names())
+    for tbl in EXTERNAL_DB_TABLES:
+        if tbl in tables:
+            columns = {c["name"] for c in insp.get_columns(tbl)}
+            order_col = next((c for c in ("created_at", "timestamp") if c in columns), "")
+            return {"table": tbl, "order_col": order_col}
+    return {}
+
+
+def query_custom_url(url: str, page: int = 0, page_size: int = EXTERNAL_DB_PAGE_SIZE):
+    """
+    Query one page of a configured transcript database via SQLAlchemy. Returns
+    {"table", "rows", "has_more"}, or None on error / when no known table exists.
+    """
+    if not SQLALCHEMY_AVAILABLE:
+        st.error("SQLAlchemy not installed. Database support unavailable.")
+        return None
+    if url not in external_db_urls().values():
+        # Only the allow-list in config.py - never a URL from the browser.
+        st.error("That database is not configured for the viewer.")
+        return None
+    from sqlalchemy import text
+
+    try:
+        found = discover_transcript_table(url)
+        if not found:
+            st.warning("No known transcript table found in DB (looked for transcripts/messages).")
+            return None
+        engine = get_sqlalchemy_engine(url)
+        quote_ident = engine.dialect.identifier_preparer.quote
+        order = f" ORDER BY {quote_ident(found['order_col'])} DESC" if found["order_col"] else ""
+        q = text(f"SELECT * FROM {quote_ident(found['table'])}{order} LIMIT :limit OFFSET :offset")
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True).execute(
+                q, {"limit": page_size + 1, "offset": page * page_size}
+            )
+            rows = [dict(r) for r in result.mappings().fetchmany(page_size + 1)]
+        return {"table": found["table"], "rows": rows[:page_size], "has_more": len(rows) > page_size}
+    except Exception as e:
+        st.error(f"DB error: {e}")
+    return None
+
+
+def render_external_db_browser() -> None:
+    """Page through a transcript table in one of the external databases configured in config.py."""
+    urls = external_db_urls()
+    if not urls:
+        st.info("No external transcript databases configured (EXTERNAL_TRANSCRIPT_DB_URLS in config.py).")
+        return
+    label = st.selectbox("Database", list(urls), key="external_db_label")
+    url = urls[label]
+    if st.session_state.get("external_db_last_label") != label:
+        st.session_state["external_db_last_label"] = label
+        st.session_state["external_db_page"] = 0
+    page = int(st.session_state.get("external_db_page", 0))
+
+    result = query_custom_url(url, page)
+    if result is None:
+        return
+    if result["rows"]:
+        st.dataframe(result["rows"], use_container_width=True, hide_index=True)
+    else:
+        st.info("No rows on this page.")
+
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if page > 0 and st.button("← Previous", key="external_db_prev"):
+            st.session_state["external_db_page"] = page - 1
+            st.rerun()
+    with col_page:
+        st.caption(f"`{result['table']}` · page {page + 1}")
+    with col_next:
+        if result["has_more"] and st.button("Next →", key="external_db_next"):
+            st.session_state["external_db_page"] = page + 1
+            st.rerun()
@@ -0,0 +1,159 @@
+"""Overview section: server counts and the signed-in staff member's activity."""
+from pathlib import Path
+from typing import Any, Dict, List
+
+import streamlit as st
+
+from viewer.core import APP_ROOT, MYSQL_AVAILABLE, _new_conn
+
+
+def query_staff_activity_metrics(staff_id: int):
+    """Return the bot-maintained activity aggregates for one staff member.
+
+    Returns None when the metrics table is unavailable or has no row for this
+    staff member, so callers fall back to scanning transcripts.
+    """
+    if not MYSQL_AVAILABLE or not staff_id:
+        return None
+    try:
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            "SELECT replies, tickets_handled, closes, assigned_open, assigned_closed "
+            "FROM staff_activity_metrics WHERE staff_id = %s",
+            (staff_id,),
+        )
+        row = cursor.fetchone()
+        cursor.close()
+        conn.close()
+        if not row:
+            return None
+        return {
+            "assigned_open":   int(row.get("assigned_open") or 0),
+            "assigned_closed": int(row.get("assigned_closed") or 0),
+            "closed_by_you":   int(row.get("closes") or 0),
+            "staff_replies":   int(row.get("replies") or 0),
+            "handled_tickets": int(row.get("tickets_handled") or 0),
+        }
+    except Exception:
+        return None
+
+
+def canonical_staff_names(user: Dict[str, Any]) -> List[str]:
+    values = [
+        str(user.get("username", "") or ""),
+        str(user.get("global_name", "") or ""),
+    ]
+    discriminator = str(user.get("discriminator", "") or "")
+    username = str(user.get("username", "") or "")
+    if username and discriminator and discriminator != "0":
+        values.append(f"{username}#{discriminator}")
+    return [value.strip() for value in values if value and value.strip()]
+
+
+def name_matches_staff(name: Any, possible_names: List[str]) -> bool:
+    normalized = str(name or "").strip().lower()
+    if not normalized:
+        return False
+    for candidate in possible_names:
+        cand = candidate.strip().lower()
+        if not cand:
+            continue
+        if normalized == cand or normalized.startswith(f"{cand}#") or cand in normalized:
+            return True
+    return False
+
+
+def compute_staff_overview_metrics(tickets: List[Dict[str, Any]], db_transcripts_map: Dict[str, Dict[str, Any]], discord_auth: Dict[str, Any]) -> Dict[str, int]:
+    user = discord_auth.get("user", {})
+    user_id = int(user.get("id", 0) or 0)
+    possible_names = canonical_staff_names(user)
+
+    assigned_open = 0
+    assigned_closed = 0
+    closed_by_staff = 0
+    staff_replies = 0
+    handled_channels = set()
+
+    for ticket in tickets:
+        mod_username = ticket.get("mod_username")
+        if name_matches_staff(mod_username, possible_names):
+            if str(ticket.get("status", "")).lower() == "open":
+                assigned_open += 1
+            else:
+                assigned_closed += 1
+
+    for channel_id, transcript_payload in db_transcripts_map.items():
+        if not isinstance(transcript_payload, dict):
+            continue
+        ticket = transcript_payload.get("ticket", {}) if isinstance(transcript_payload.get("ticket", {}), dict) else {}
+        messages = transcript_payload.get("messages", []) if isinstance(transcript_payload.get("messages", []), list) else []
+
+        closed_by = ticket.get("closed_by") or transcript_payload.get("closed_by")
+        if name_matches_staff(closed_by, possible_names):
+            closed_by_staff += 1
+            handled_channels.add(channel_id)
+
+        for msg in messages:
+            author_id = int(msg.get("author_id", 0) or 0)
+            author_name = str(msg.get("author", "") or "")
+            role = str(msg.get("role", "")).lower()
+            if role == "staff" and (author_id == user_id or name_matches_staff(author_name, possible_names)):
+                staff_replies += 1
+                handled_channels.add(channel_id)
+
+    return {
+        "assigned_open": assigned_open,
+        "assigned_closed": assigned_closed,
+        "closed_by_you": closed_by_staff,
+        "staff_replies": staff_replies,
+        "handled_tickets": len(handled_channels),
+    }
+
+
+def render_overview(
+    discord_auth: Dict[str, Any],
+    display_name: str,
+    tickets: List[Dict[str, Any]],
+    transcript_map: Dict[str, Path],
+    db_transcripts_map: Dict[str, Dict[str, Any]],
+) -> None:
+    st.subheader("Overview")
+    open_count = sum(1 for t in tickets if str(t.get("status", "")).lower() == "open")
+    closed_count = sum(1 for t in tickets if str(t.get("status", "")).lower() == "closed")
+    total_transcripts = len(set(list(transcript_map.keys()) + list(db_transcripts_map.keys())))
+    discord_user = discord_auth.get("user", {})
+    metrics = query_staff_activity_metrics(int(discord_user.get("id", 0) or 0))
+    if metrics is None:
+        metrics = compute_staff_overview_metrics(tickets, db_transcripts_map, discord_auth)
+
+    # ── Server stats ──────────────────────────────────────────────────────
+    st.markdown("**Server stats**")
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Open tickets", open_count)
+    c2.metric("Closed tickets", closed_count)
+    c3.metric("Total transcripts", total_transcripts)
+
+    st.divider()
+
+    # ── Your activity ─────────────────────────────────────────────────────
+    st.markdown(f"**Your activity** · {display_name}")
+    a1, a2, a3 = st.columns(3)
+    a1.metric("Open assigned", metrics["assigned_open"])
+    a2.metric("Closed by you", metrics["closed_by_you"])
+    a3.metric("Assigned & closed", metrics["assigned_closed"])
+
+    b1, b2, b3 = st.columns(3)
+    b1.metric("Your replies", metrics["staff_replies"])
+    b2.metric("Tickets handled", metrics["handled_tickets"])
+
+    st.divider()
+    st.caption("Use **Logs** to browse tickets and open full transcripts")
+
+    # Meme image — because modmail life 💀
+    meme_path = APP_ROOT / "image.png"
+    if meme_path.exists():
+        st.markdown("")
+        _, meme_col, _ = st.columns([1, 2, 1])
+        with meme_col:
+            st.image(str(meme_path), caption="the modmail experience", use_column_width=True)
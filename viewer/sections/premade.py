@@ -0,0 +1,157 @@
+"""Premade Messages section: dx_responses editor."""
+from typing import Dict, List
+
+import streamlit as st
+
+from viewer.core import MYSQL_AVAILABLE, _new_conn, log_admin_action
+
+
+# ── Premade messages (dx_responses) DB helpers ───────────────────────────────
+
+def query_dx_responses() -> List[Dict[str, str]]:
+    """Return all premade messages as [{'key': ..., 'response': ...}]."""
+    if not MYSQL_AVAILABLE:
+        return []
+    try:
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT `key`, `response` FROM dx_responses ORDER BY `key` ASC")
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return [{"key": r["key"], "response": r["response"]} for r in rows]
+    except Exception:
+        return []
+
+
+def upsert_dx_response(key: str, response: str) -> None:
+    """Insert or update a premade message by key."""
+    conn = _new_conn()
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT INTO dx_responses (`key`, `response`) VALUES (%s, %s) "
+        "ON DUPLICATE KEY UPDATE `response` = VALUES(`response`)",
+        (key, response),
+    )
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def delete_dx_response(key: str) -> None:
+    """Delete a premade message by key."""
+    conn = _new_conn()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM dx_responses WHERE `key` = %s", (key,))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def render_premade_messages_section(is_advisor: bool = False) -> None:
+    """Admin-only section: view, add, edit, and delete premade responses (dx_responses)."""
+    st.subheader("Premade Messages")
+    st.caption("Changes here take effect immediately in the Discord bot (`%key` shortcuts).")
+    if is_advisor:
+        st.info("👁️ View only — advisor access does not allow editing.")
+
+    if not MYSQL_AVAILABLE:
+        st.error("mysql-connector-python is not installed.")
+        return
+
+    discord_auth = st.session_state.get("discord_auth") or {}
+    me = (discord_auth.get("user") or {}).get("username") or "unknown"
+
+    # ── Load ─────────────────────────────────────────────────────────────────
+    try:
+        responses = query_dx_responses()
+    except Exception as e:
+        st.error(f"Could not load premade messages: {e}")
+        return
+
+    # ── Add new message ───────────────────────────────────────────────────────
+    if not is_advisor:
+        with st.expander("Add new premade message", expanded=not responses):
+            new_key = st.text_input(
+                "Key (used as `%key` in Discord)",
+                placeholder="e.g. rules",
+                key="pm_new_key",
+            ).strip().lower()
+            new_body = st.text_area(
+                "Message body",
+                placeholder="Type the full message text here…",
+                key="pm_new_body",
+                height=120,
+            ).strip()
+            if st.button("Save new message", key="pm_add_btn", type="primary"):
+                if not new_key:
+                    st.warning("Key cannot be empty.")
+                elif not new_body:
+                    st.warning("Message body cannot be empty.")
+                elif any(r["key"] == new_key for r in responses):
+                    st.warning(f"Key `{new_key}` already exists — edit it in the table below.")
+                else:
+                    try:
+                        upsert_dx_response(new_key, new_body)
+                        log_admin_action(me, "premade_add", f"key={new_key}")
+                        st.success(f"Premade message `{new_key}` saved.")
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Failed to save: {e}")
+
+    st.divider()
+
+    # ── Edit / delete existing ────────────────────────────────────────────────
+    if not responses:
+        st.info("No premade messages yet.")
+        return
+
+    st.markdown(f"**{len(responses)} premade message{'s' if len(responses) != 1 else ''}**")
+
+    for idx, row in enumerate(responses):
+        key = row["key"]
+        with st.expander(f"`%{key}`", expanded=False):
+            if is_advisor:
+                st.text(row["response"])
+            else:
+                edited_key = st.text_input(
+                    "Key",
+                    value=key,
+                    key=f"pm_key_{idx}",
+                ).strip().lower()
+                edited_body = st.text_area(
+                    "Message body",
+                    value=row["response"],
+                    key=f"pm_body_{idx}",
+                    height=140,
+                ).strip()
+
+                col_save, col_del, _ = st.columns([1, 1, 3])
+
+                with col_save:
+                    if st.button("Save changes", key=f"pm_save_{idx}", type="primary"):
+                        if not edited_key:
+                            st.warning("Key cannot be empty.")
+                        elif not edited_body:
+                            st.warning("Message body cannot be empty.")
+                        else:
+                            try:
+                                if edited_key != key:
+                                    # Key renamed: delete old, insert new
+                                    delete_dx_response(key)
+                                upsert_dx_response(edited_key, edited_body)
+                                log_admin_action(me, "premade_edit", f"key={edited_key}")
+                                st.success(f"Saved `{edited_key}`.")
+                                st.rerun()
+                            except Exception as e:
+                                st.error(f"Failed to save: {e}")
+
+                with col_del:
+                    if st.button("Delete", key=f"pm_del_{idx}"):
+                        try:
+                            delete_dx_response(key)
+                            log_admin_action(me, "premade_delete", f"key={key}")
+                            st.success(f"Deleted `{key}`.")
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"Failed to delete: {e}")
@@ -0,0 +1,54 @@
+"""Staff Role List section."""
+import streamlit as st
+
+
+# ─── 8. Staff Role List ───────────────────────────────────────────────────────
+
+def render_staff_roles_section() -> None:
+    st.subheader("Staff Role List")
+    st.caption("Discord role IDs and their access levels in this dashboard.")
+
+    rows = [
+        {
+            "Role":     "Jr. Mod",
+            "Role ID":  "1334289756539846656",
+            "Dashboard Access": "Viewer (Overview, Logs, Transcripts)",
+            "Admin UI": "No",
+            "Tech UI":  "No",
+        },
+        {
+            "Role":     "Mod",
+            "Role ID":  "1243559774847766619",
+            "Dashboard Access": "Viewer",
+            "Admin UI": "No",
+            "Tech UI":  "No",
+        },
+        {
+            "Role":     "Admin",
+            "Role ID":  "1243929060145631262",
+            "Dashboard Access": "Full admin dashboard",
+            "Admin UI": "Yes",
+            "Tech UI":  "No",
+        },
+        {
+            "Role":     "Owner",
+            "Role ID":  "1240455108047671406",
+            "Dashboard Access": "Full admin dashboard",
+            "Admin UI": "Yes",
+            "Tech UI":  "No",
+        },
+        {
+            "Role":     "Tech",
+            "Role ID":  "1243929202785386527",
+            "Dashboard Access": "Full admin dashboard + Bot Config Editor",
+            "Admin UI": "Yes",
+            "Tech UI":  "Yes",
+        },
+    ]
+
+    try:
+        import pandas as pd
+        df = pd.DataFrame(rows)
+        st.dataframe(df, use_container_width=True, hide_index=True)
+    except Exception:
+        st.table(rows)
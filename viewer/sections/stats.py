@@ -0,0 +1,443 @@
+"""Stats & Leaderboard section: ticket rollups and staff close counts."""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import streamlit as st
+
+from viewer.core import (
+    CCAC_ALLOWED_ROLE_IDS,
+    CCAC_MAIN_GUILD_ID,
+    DISCORD_API_BASE,
+    MYSQL_AVAILABLE,
+    _new_conn,
+    app_config,
+    get_bot_token,
+    http_json,
+    query_category_names,
+)
+
+
+@st.cache_data(ttl=60)
+def fetch_current_staff_usernames() -> set:
+    """Return the set of lowercase usernames of members who currently hold a staff role.
+
+    Reads the staff_roster table the bot keeps current from gateway member events,
+    so no Discord API calls are made. Falls back to paging the guild member list
+    only if the roster table is missing or empty (bot not yet updated / not synced).
+    """
+    if MYSQL_AVAILABLE:
+        try:
+            conn = _new_conn()
+            cursor = conn.cursor()
+            cursor.execute("SELECT username FROM staff_roster")
+            usernames = {(row[0] or "").strip().lower() for row in cursor.fetchall()}
+            cursor.close()
+            conn.close()
+            usernames.discard("")
+            if usernames:
+                return usernames
+        except Exception:
+            pass
+    return _fetch_staff_usernames_from_api()
+
+
+def _fetch_staff_usernames_from_api() -> set:
+    """Page through the guild member list (up to 5 000 members) for staff-role holders."""
+    bot_token = get_bot_token()
+    if not bot_token:
+        return set()
+    headers = {"Authorization": f"Bot {bot_token}"}
+    usernames: set = set()
+    after = 0
+    for _ in range(5):  # max 5 pages × 1 000 = 5 000 members
+        try:
+            members = http_json(
+                f"{DISCORD_API_BASE}/guilds/{CCAC_MAIN_GUILD_ID}/members?limit=1000&after={after}",
+                headers=headers,
+                cache_ttl=60,
+            )
+            if not isinstance(members, list) or not members:
+                break
+            for m in members:
+                member_role_ids = {int(r) for r in (m.get("roles") or [])}
+                if member_role_ids.intersection(CCAC_ALLOWED_ROLE_IDS):
+                    user = m.get("user") or {}
+                    un = (user.get("username") or "").strip().lower()
+                    if un:
+                        usernames.add(un)
+            if len(members) < 1000:
+                break
+            after = int(members[-1]["user"]["id"])
+        except Exception:
+            break
+    return usernames
+
+
+# ── Stats queries ─────────────────────────────────────────────────────────────
+
+def _query_ticket_stats_full() -> Dict[str, Any]:
+    """Aggregate counts straight from active_tickets (used until the bot has written rollups)."""
+    if not MYSQL_AVAILABLE:
+        return {}
+    try:
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT status, COUNT(*) AS cnt FROM active_tickets GROUP BY status")
+        by_status: Dict[str, int] = {r["status"]: r["cnt"] for r in cursor.fetchall()}
+        cursor.execute(
+            "SELECT category_id, COUNT(*) AS cnt FROM active_tickets "
+            "GROUP BY category_id ORDER BY cnt DESC"
+        )
+        by_category: List[Dict[str, Any]] = cursor.fetchall()
+        cursor.execute(
+            """
+            SELECT DATE(created_at) AS day, COUNT(*) AS cnt
+            FROM active_tickets
+            WHERE created_at >= DATE_SUB(NOW(), INTERVAL 30 DAY)
+            GROUP BY DATE(created_at)
+            ORDER BY day
+            """
+        )
+        daily_opens: List[Dict[str, Any]] = cursor.fetchall()
+        cursor.execute(
+            """
+            SELECT AVG(TIMESTAMPDIFF(MINUTE, created_at, closed_at)) AS avg_mins
+            FROM active_tickets
+            WHERE status = 'closed'
+              AND closed_at IS NOT NULL
+              AND created_at IS NOT NULL
+            """
+        )
+        row = cursor.fetchone()
+        avg_mins = row["avg_mins"] if row and row["avg_mins"] is not None else None
+        cursor.close()
+        conn.close()
+        return {
+            "by_status": by_status,
+            "by_category": by_category,
+            "daily_opens": daily_opens,
+            "avg_resolution_hours": round(avg_mins / 60, 1) if avg_mins is not None else None,
+        }
+    except Exception:
+        return {}
+
+
+def _query_staff_leaderboard_full() -> List[Dict[str, Any]]:
+    """Staff close counts straight from active_tickets (used until the bot has written rollups)."""
+    if not MYSQL_AVAILABLE:
+        return []
+    try:
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            """
+            SELECT mod_username, COUNT(*) AS closed_count
+            FROM active_tickets
+            WHERE status = 'closed'
+              AND mod_username IS NOT NULL
+              AND mod_username != ''
+            GROUP BY mod_username
+            ORDER BY closed_count DESC
+            LIMIT 25
+            """
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return rows
+    except Exception:
+        return []
+
+
+# Finished days come from the rollup tables the bot maintains (ticket_daily_rollup,
+# staff_daily_rollup); only tickets touched after the rollup watermark are read live.
+
+@st.cache_data(ttl=60, show_spinner=False)
+def query_live_ticket_partial() -> Dict[str, Any]:
+    """Return the not-yet-rolled-up bucket (normally just today), or None if no rollups exist."""
+    if not MYSQL_AVAILABLE:
+        return None
+    try:
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            "SELECT last_day, CURDATE() AS today FROM ticket_rollup_state WHERE name = 'daily'"
+        )
+        state = cursor.fetchone()
+        if not state:
+            cursor.close()
+            conn.close()
+            return None
+        since = state["last_day"] + timedelta(days=1)
+
+        cursor.execute("SELECT COUNT(*) AS cnt FROM active_tickets WHERE status = 'open'")
+        open_count = cursor.fetchone()["cnt"]
+        cursor.execute(
+            """
+            SELECT COALESCE(category_id, 0) AS category_id, DATE(created_at) AS day, COUNT(*) AS cnt
+            FROM active_tickets
+            WHERE created_at >= %s
+            GROUP BY COALESCE(category_id, 0), DATE(created_at)
+            """,
+            (since,),
+        )
+        opens = cursor.fetchall()
+        cursor.execute(
+            """
+            SELECT COUNT(*) AS closed,
+                   COALESCE(SUM(TIMESTAMPDIFF(MINUTE, created_at, closed_at)), 0) AS mins,
+                   COUNT(created_at) AS resolved
+            FROM active_tickets
+            WHERE status = 'closed' AND closed_at >= %s
+            """,
+            (since,),
+        )
+        closes = cursor.fetchone()
+        cursor.execute(
+            """
+            SELECT mod_id, MAX(mod_username) AS mod_username, COUNT(*) AS closed_count
+            FROM active_tickets
+            WHERE status = 'closed' AND mod_id IS NOT NULL AND closed_at >= %s
+            GROUP BY mod_id
+            """,
+            (since,),
+        )
+        staff = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return {
+            "watermark": str(state["last_day"]),
+            "today": str(state["today"]),
+            "open_count": open_count,
+            "opens": opens,
+            "closed": int(closes["closed"] or 0),
+            "resolution_minutes": int(closes["mins"] or 0),
+            "resolved_count": int(closes["resolved"] or 0),
+            "staff": staff,
+        }
+    except Exception:
+        return None
+
+
+@st.cache_data(ttl=6 * 3600, show_spinner=False)
+def query_ticket_rollup_history(watermark: str, today: str) -> Dict[str, Any]:
+    """Sum the finished-day rollups up to `watermark`. Cache key changes when the bot rolls a new day."""
+    if not MYSQL_AVAILABLE:
+        return None
+    try:
+        window_start = datetime.strptime(today, "%Y-%m-%d").date() - timedelta(days=30)
+        conn = _new_conn()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            """
+            SELECT category_id, SUM(opened) AS opened, SUM(closed) AS closed,
+                   SUM(resolution_minutes) AS mins, SUM(resolved_count) AS resolved
+            FROM ticket_daily_rollup
+            WHERE day <= %s
+            GROUP BY category_id
+            """,
+            (watermark,),
+        )
+        by_category = cursor.fetchall()
+        cursor.execute(
+            """
+            SELECT day, SUM(opened) AS cnt
+            FROM ticket_daily_rollup
+            WHERE day >= %s AND day <= %s
+            GROUP BY day
+            HAVING cnt > 0
+            ORDER BY day
+            """,
+            (window_start, watermark),
+        )
+        daily = cursor.fetchall()
+        cursor.execute(
+            """
+            SELECT mod_id, MAX(mod_username) AS mod_username, SUM(closed) AS closed_count
+            FROM staff_daily_rollup
+            WHERE day <= %s
+            GROUP BY mod_id
+            """,
+            (watermark,),
+        )
+        staff = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return {"by_category": by_category, "daily": daily, "staff": staff, "window_start": window_start}
+    except Exception:
+        return None
+
+
+def query_ticket_stats() -> Dict[str, Any]:
+    """Return aggregated ticket counts: finished-day rollups plus the cached live partial bucket."""
+    partial = query_live_ticket_partial()
+    history = query_ticket_rollup_history(partial["watermark"], partial["today"]) if partial else None
+    if not history:
+        return _query_ticket_stats_full()
+
+    per_category: Dict[int, int] = {}
+    per_day: Dict[str, int] = {}
+    closed = partial["closed"]
+    mins = partial["resolution_minutes"]
+    resolved = partial["resolved_count"]
+    for row in history["by_category"]:
+        per_category[row["category_id"]] = per_category.get(row["category_id"], 0) + int(row["opened"] or 0)
+        closed += int(row["closed"] or 0)
+        mins += int(row["mins"] or 0)
+        resolved += int(row["resolved"] or 0)
+    for row in history["daily"]:
+        per_day[str(row["day"])] = int(row["cnt"] or 0)
+    for row in partial["opens"]:
+        per_category[row["category_id"]] = per_category.get(row["category_id"], 0) + row["cnt"]
+        if row["day"] is not None and row["day"] >= history["window_start"]:
+            per_day[str(row["day"])] = per_day.get(str(row["day"]), 0) + row["cnt"]
+
+    by_category = [
+        {"category_id": cat_id, "cnt": cnt}
+        for cat_id, cnt in sorted(per_category.items(), key=lambda item: item[1], reverse=True)
+    ]
+    return {
+        "by_status": {"open": partial["open_count"], "closed": closed},
+        "by_category": by_category,
+        "daily_opens": [{"day": day, "cnt": cnt} for day, cnt in sorted(per_day.items())],
+        "avg_resolution_hours": round(mins / resolved / 60, 1) if resolved else None,
+    }
+
+
+def query_staff_leaderboard() -> List[Dict[str, Any]]:
+    """Return staff ticket close counts keyed by mod_id, sorted descending."""
+    partial = query_live_ticket_partial()
+    history = query_ticket_rollup_history(partial["watermark"], partial["today"]) if partial else None
+    if not history:
+        return _query_staff_leaderboard_full()
+
+    totals: Dict[int, Dict[str, Any]] = {}
+    for row in list(history["staff"]) + list(partial["staff"]):
+        entry = totals.setdefault(row["mod_id"], {"mod_id": row["mod_id"], "mod_username": None, "closed_count": 0})
+        entry["closed_count"] += int(row["closed_count"] or 0)
+        if row.get("mod_username"):
+            entry["mod_username"] = row["mod_username"]
+    rows = sorted(totals.values(), key=lambda r: r["closed_count"], reverse=True)
+    return rows[:25]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# Admin dashboard sections (all require is_admin; config editor requires is_tech)
+# ══════════════════════════════════════════════════════════════════════════════
+
+# ─── 1. Stats Dashboard ───────────────────────────────────────────────────────
+
+def render_stats_dashboard() -> None:
+    st.subheader("Stats Dashboard")
+
+    if not MYSQL_AVAILABLE:
+        st.error("MySQL not available.")
+        return
+
+    with st.spinner("Loading stats…"):
+        stats = query_ticket_stats()
+
+    if not stats:
+        st.warning("Could not load stats from the database.")
+        return
+
+    by_status = stats.get("by_status", {})
+    open_c    = by_status.get("open", 0)
+    closed_c  = by_status.get("closed", 0)
+    total     = open_c + closed_c
+    avg_h     = stats.get("avg_resolution_hours")
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Total Tickets",   total)
+    c2.metric("Open",            open_c)
+    c3.metric("Closed",          closed_c)
+    c4.metric("Avg Resolution",  f"{avg_h}h" if avg_h is not None else "—")
+
+    st.divider()
+
+    # Tickets by category
+    by_cat = stats.get("by_category", [])
+    if by_cat:
+        st.markdown("**Tickets by category**")
+        cat_names_db = query_category_names()
+        config_cat_map: Dict[int, str] = {}
+        if app_config:
+            try:
+                config_cat_map = {v: k for k, v in getattr(app_config, "CATEGORY_IDS", {}).items()}
+            except Exception:
+                pass
+        max_cnt = max((r["cnt"] for r in by_cat), default=1)
+        for row in by_cat[:20]:
+            cat_id   = row["category_id"] or 0
+            cat_name = cat_names_db.get(cat_id) or config_cat_map.get(cat_id) or str(cat_id)
+            st.progress(
+                min(row["cnt"] / max_cnt, 1.0),
+                text=f"**{cat_name}** — {row['cnt']} ticket{'s' if row['cnt'] != 1 else ''}",
+            )
+
+    st.divider()
+
+    # Daily ticket opens (last 30 days)
+    daily = stats.get("daily_opens", [])
+    if daily:
+        st.markdown("**Ticket opens — last 30 days**")
+        try:
+            import pandas as pd
+            df = pd.DataFrame(daily)
+            df["day"] = df["day"].astype(str)
+            df = df.set_index("day").rename(columns={"cnt": "Opens"})
+            st.bar_chart(df)
+        except Exception:
+            st.bar_chart({str(r["day"]): r["cnt"] for r in daily})
+    else:
+        st.info("No ticket data in the last 30 days.")
+
+
+# ─── 2. Staff Activity Leaderboard ───────────────────────────────────────────
+
+def render_staff_leaderboard() -> None:
+    st.subheader("Staff Activity Leaderboard")
+    st.caption("Only staff who currently hold a staff role in the Discord server are shown.")
+
+    if not MYSQL_AVAILABLE:
+        st.error("MySQL not available.")
+        return
+
+    col_ref, _ = st.columns([1, 4])
+    with col_ref:
+        if st.button("↺ Refresh staff list", key="lb_refresh_staff"):
+            fetch_current_staff_usernames.clear()
+            query_live_ticket_partial.clear()
+            st.rerun()
+
+    with st.spinner("Loading leaderboard…"):
+        rows = query_staff_leaderboard()
+        current_staff = fetch_current_staff_usernames()
+
+    # Filter to only staff who are currently in the server with a staff role.
+    # If the Discord API is unreachable (empty set returned), fall back to showing all.
+    if current_staff:
+        rows = [r for r in rows if (r.get("mod_username") or "").strip().lower() in current_staff]
+
+    if not rows:
+        st.info("No closed tickets found for current staff members.")
+        return
+
+    medals = ["🥇", "🥈", "🥉"]
+    st.markdown(f"**Top {len(rows)} active staff members by tickets closed**")
+    max_c = rows[0]["closed_count"] or 1
+    for i, row in enumerate(rows):
+        prefix = medals[i] if i < 3 else f"**#{i + 1}**"
+        name   = row["mod_username"] or "Unknown"
+        count  = row["closed_count"]
+        st.progress(count / max_c, text=f"{prefix} {name} — {count} closed")
+
+    st.divider()
+    try:
+        import pandas as pd
+        df = pd.DataFrame(rows).rename(
+            columns={"mod_username": "Staff", "closed_count": "Tickets Closed"}
+        ).set_index("Staff")
+        st.bar_chart(df["Tickets Closed"])
+    except Exception:
+        st.table(rows)
@@ -0,0 +1,97 @@
+"""
+Viewer timing - cold-start and per-rerun script timings.
+
+streamlit_transcripts.py records how long the first import of the viewer took and
+how long each script run took; the sidebar's Advanced panel shows the latest
+numbers. `python -m viewer.timing` prints an import-cost report measured in fresh
+interpreters, including which heavy libraries a cold start actually loads.
+"""
+import logging
+import statistics
+import subprocess
+import sys
+from collections import deque
+from pathlib import Path
+
+logger = logging.getLogger("modmail.viewer")
+
+HEAVY_MODULES = ("mysql.connector", "sqlalchemy", "pymysql", "PIL", "pandas", "numpy")
+SECTION_MODULES = (
+    "viewer.sections.overview",
+    "viewer.sections.logs",
+    "viewer.sections.stats",
+    "viewer.sections.export",
+    "viewer.sections.premade",
+    "viewer.sections.blacklist",
+    "viewer.sections.categories",
+    "viewer.sections.flagged",
+    "viewer.sections.staff_roles",
+    "viewer.sections.admin_log",
+    "viewer.sections.bot_config",
+)
+
+_cold_import_seconds = None
+_run_seconds = deque(maxlen=50)
+
+
+def record_cold_import(seconds: float) -> None:
+    global _cold_import_seconds
+    _cold_import_seconds = seconds
+    logger.info(f"Viewer cold import took {seconds * 1000:.0f} ms")
+
+
+def record_run(seconds: float) -> None:
+    _run_seconds.append(seconds)
+
+
+def summary() -> str:
+    """One-line report for the sidebar, e.g. 'Last run 41 ms · median 38 ms (12 runs) · cold import 290 ms'."""
+    parts = []
+    if _run_seconds:
+        parts.append(f"Last run {_run_seconds[-1] * 1000:.0f} ms")
+        parts.append(f"median {statistics.median(_run_seconds) * 1000:.0f} ms ({len(_run_seconds)} runs)")
+    if _cold_import_seconds is not None:
+        parts.append(f"cold import {_cold_import_seconds * 1000:.0f} ms")
+    return " · ".join(parts) or "No timings yet"
+
+
+_PROBE = (
+    "import sys, time\n"
+    "import streamlit\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = (time.perf_counter() - start) * 1000\n"
+    "heavy = [m for m in {heavy!r} if m in sys.modules]\n"
+    "print(f'{{elapsed:.1f}}|{{\",\".join(heavy)}}')\n"
+)
+
+
+def measure_import(module: str):
+    """Import `module` in a fresh interpreter (after streamlit) and return (ms, heavy modules loaded)."""
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=str(Path(__file__).resolve().parent.parent),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1:] or ["import failed"]
+    elapsed, _, heavy = result.stdout.strip().rpartition("\n")[-1].partition("|")
+    return float(elapsed), [m for m in heavy.split(",") if m]
+
+
+def main() -> None:
+    rows = [("viewer.app (cold start)", "viewer.app")]
+    rows += [(module, module) for module in SECTION_MODULES]
+    rows += [(f"{module} (on demand)", module) for module in HEAVY_MODULES]
+    print(f"{'module':<40} {'ms':>8}  heavy modules loaded")
+    for label, module in rows:
+        elapsed, heavy = measure_import(module)
+        if elapsed is None:
+            print(f"{label:<40} {'n/a':>8}  {heavy[0]}")
+        else:
+            print(f"{label:<40} {elapsed:>8.1f}  {', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
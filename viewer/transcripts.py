@@ -0,0 +1,681 @@
+"""Transcript parsing, message classification and chat-bubble rendering shared by the Logs pages."""
+import json
+import re
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+from urllib.parse import quote
+
+import streamlit as st
+
+from image_cache import ensure_thumbnail, image_fingerprint
+from viewer.core import APP_ROOT
+
+
+# Where images used to be published for static serving; see _remove_published_images.
+LEGACY_STATIC_IMAGE_DIR = APP_ROOT / "static" / "transcript-images"
+
+
+def load_transcript_file(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8")
+    except Exception as e:
+        return f"Error reading file: {e}"
+
+
+def load_transcript_json(path: Path) -> Dict[str, Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+MSG_RE = re.compile(r"^\[(?P<ts>[^\]]+)\]\s+(?P<author>[^:]+):\s*(?P<content>.*)$")
+IMG_RE = re.compile(r"^\[Image saved:\s*(?P<path>.+)\]$")
+ATTACH_RE = re.compile(r"^\[Attachment:\s*(?P<url>.+)\]$")
+
+
+def parse_transcript(raw: str) -> List[Dict[str, Any]]:
+    messages = []
+    last = None
+    for line in raw.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        m = MSG_RE.match(line)
+        if m:
+            last = {
+                "ts": m.group("ts"),
+                "author": m.group("author").strip(),
+                "content": m.group("content").strip(),
+                "images": [],
+                "attachments": [],
+            }
+            messages.append(last)
+            continue
+
+        m2 = IMG_RE.match(line)
+        if m2 and last is not None:
+            last["images"].append(m2.group("path").strip())
+            continue
+
+        m3 = ATTACH_RE.match(line)
+        if m3 and last is not None:
+            last["attachments"].append(m3.group("url").strip())
+            continue
+
+        if last is not None:
+            last["content"] += "\n" + line
+
+    return messages
+
+
+def is_staff(author: str, staff_identifiers: List[str]) -> bool:
+    auth_lower = author.lower()
+    for s in staff_identifiers:
+        if not s:
+            continue
+        if s.lower() in auth_lower:
+            return True
+    return False
+
+
+def is_internal(content: str, internal_markers: List[str]) -> bool:
+    for m in internal_markers:
+        if not m:
+            continue
+        if m.lower() in content.lower():
+            return True
+    return False
+
+
+def parse_iso_timestamp(value: str):
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except Exception:
+        return None
+
+
+def relative_time_label(value: str) -> str:
+    ts = parse_iso_timestamp(value)
+    if not ts:
+        return ""
+    now = datetime.now(timezone.utc)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    delta = now - ts
+    seconds = int(max(delta.total_seconds(), 0))
+    if seconds < 60:
+        return "just now"
+    minutes = seconds // 60
+    if minutes < 60:
+        return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
+    hours = minutes // 60
+    if hours < 24:
+        return f"{hours} hour{'s' if hours != 1 else ''} ago"
+    days = hours // 24
+    return f"{days} day{'s' if days != 1 else ''} ago"
+
+
+def inject_transcript_styles():
+    st.markdown(
+        """
+        <style>
+        .ticket-summary-card {
+            border: 1px solid rgba(192, 16, 64, 0.22);
+            border-radius: 12px;
+            padding: 16px;
+            background: #FFFFFF;
+            box-shadow: 0 2px 10px rgba(192, 16, 64, 0.08);
+        }
+        .ticket-summary-row {
+            margin-bottom: 12px;
+            padding-bottom: 12px;
+            border-bottom: 1px solid rgba(192, 16, 64, 0.10);
+        }
+        .ticket-summary-row:last-child {
+            margin-bottom: 0;
+            padding-bottom: 0;
+            border-bottom: none;
+        }
+        .ticket-summary-label {
+            font-size: 0.9rem;
+            color: #8B0A2A;
+            font-weight: 700;
+            text-transform: uppercase;
+            letter-spacing: 0.04em;
+        }
+        .ticket-summary-value {
+            margin-top: 4px;
+            color: #2D0A14;
+        }
+        .msg-card {
+            border-left: 3px solid rgba(192, 16, 64, 0.55);
+            border-radius: 8px;
+            padding: 10px 12px;
+            margin: 8px 0 14px;
+            background: rgba(245, 216, 222, 0.35);
+        }
+        .msg-system {
+            border-left-color: #D86080;
+            background: rgba(216, 96, 128, 0.10);
+        }
+        </style>
+        """,
+        unsafe_allow_html=True,
+    )
+
+
+def infer_closed_by(messages: List[Dict[str, Any]], staff_identifiers: List[str]) -> str:
+    for msg in reversed(messages):
+        role = str(msg.get("role", "")).lower()
+        author = msg.get("author", "Unknown")
+        if role == "staff" or is_staff(author, staff_identifiers):
+            return author
+    return "Unknown"
+
+
+def render_ticket_summary_panel(ticket: Dict[str, Any], messages: List[Dict[str, Any]], staff_identifiers: List[str]):
+    server_name = ticket.get("guild_name") or "Unknown"
+    owner_name = ticket.get("owner_name") or "Unknown"
+    closed_by_name = ticket.get("closed_by") or infer_closed_by(messages, staff_identifiers)
+    closed_by_id = ticket.get("closed_by_id") or ticket.get("closed_by_user_id") or ""
+    closed_by_display = f"{closed_by_name} | {closed_by_id}" if closed_by_id else closed_by_name
+    members_value = f"{owner_name}, {closed_by_name}" if closed_by_name != owner_name else owner_name
+    closed_at = ticket.get("closed_at")
+    closed_date = ""
+    if closed_at:
+        try:
+            dt = parse_iso_timestamp(closed_at)
+            if dt:
+                closed_date = dt.strftime("%Y-%m-%d")
+        except Exception:
+            pass
+    # Prefer human-readable category name, fall back to numeric category_id
+    category_display = str(ticket.get("category") or ticket.get("category_id") or "—")
+
+    st.markdown(
+        f"""
+        <div class="ticket-summary-card">
+            <div class="ticket-summary-row">
+                <div class="ticket-summary-label">Server name</div>
+                <div class="ticket-summary-value">{server_name}</div>
+            </div>
+            <div class="ticket-summary-row">
+                <div class="ticket-summary-label">Members</div>
+                <div class="ticket-summary-value">{members_value}</div>
+            </div>
+            <div class="ticket-summary-row">
+                <div class="ticket-summary-label">Category</div>
+                <div class="ticket-summary-value">{category_display}</div>
+            </div>
+            <div class="ticket-summary-row">
+                <div class="ticket-summary-label">Messages</div>
+                <div class="ticket-summary-value">{len(messages)}</div>
+            </div>
+            <div class="ticket-summary-row">
+                <div class="ticket-summary-label">Closed by</div>
+                <div class="ticket-summary-value">{closed_by_display}</div>
+            </div>
+            <div class="ticket-summary-row">
+                <div class="ticket-summary-label">Closed date</div>
+                <div class="ticket-summary-value">{closed_date}</div>
+            </div>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+
+def normalize_display_message(msg: Dict[str, Any]):
+    author = str(msg.get("author", "Unknown") or "Unknown")
+    content = str(msg.get("content", "") or "")
+
+    lines = [line for line in content.splitlines()]
+    cleaned_lines = []
+    prefix = author.strip().lower()
+    for idx, line in enumerate(lines):
+        lstripped = line.lstrip()
+        # Remove any line that starts with 'STAFF RESPONSE:' (case-insensitive, with or without colon)
+        if lstripped.lower().startswith("staff response"):
+            continue
+        # Remove 'user message' marker and possible username on next line
+        if idx == 0 and lstripped.lower() == "user message":
+            continue
+        # Remove username prefix from every line if present (robust: ignore case, allow colon, dash, pipe, period, whitespace)
+        lstripped_lower = lstripped.lower()
+        for sep in [":", "-", "|", ".", " "]:
+            if lstripped_lower.startswith(prefix + sep):
+                after = lstripped[len(prefix + sep):].lstrip()
+                if after:
+                    cleaned_lines.append(after)
+                break
+        else:
+            # Also handle exact match (username only)
+            if lstripped_lower == prefix:
+                continue
+            cleaned_lines.append(line)
+    normalized_content = "\n".join(cleaned_lines).strip()
+    return author, normalized_content
+
+
+def is_staff_response_message(msg: Dict[str, Any], normalized_content: str) -> bool:
+    raw_content = str(msg.get("content", "") or "")
+    raw_lower = raw_content.lower()
+    normalized_lower = (normalized_content or "").lower()
+
+    if raw_lower.startswith("%r ") or raw_lower == "%r":
+        return True
+    if "staff response" in raw_lower or normalized_lower.startswith("staff response"):
+        return True
+
+    embeds = msg.get("embeds", [])
+    if isinstance(embeds, list):
+        for embed in embeds:
+            if not isinstance(embed, dict):
+                continue
+            title = str(embed.get("title", "") or "").lower()
+            author = str(embed.get("author", "") or "").lower()
+            description = str(embed.get("description", "") or "").lower()
+            if "staff response" in title or "staff response" in author or "staff response" in description:
+                return True
+
+    return False
+
+
+def message_is_internal(msg: Dict[str, Any], normalized_content: str, internal_markers: List[str]) -> bool:
+    role = str(msg.get("role", "")).lower()
+    raw_content = str(msg.get("content", "") or "")
+    raw_lower = raw_content.lower()
+    trimmed = normalized_content.lstrip()
+
+    if is_internal(normalized_content, internal_markers):
+        return True
+    if role == "system":
+        return True
+    if role == "staff":
+        return not is_staff_response_message(msg, normalized_content)
+    if trimmed.startswith("%") or trimmed.startswith("!") or trimmed.startswith("/"):
+        return True
+    return False
+
+
+def get_avatar_url(msg: Dict[str, Any], author: str) -> str:
+    avatar_url = str(msg.get("author_avatar_url", "") or "").strip()
+    if avatar_url:
+        return avatar_url
+
+    author_id = msg.get("author_id")
+    if author_id:
+        return f"https://unavatar.io/discord/{author_id}"
+
+    return f"https://api.dicebear.com/8.x/initials/svg?seed={quote(author or 'user')}"
+
+
+@st.cache_resource
+def _remove_published_images() -> None:
+    """Delete copies earlier versions published under Streamlit's unauthenticated static route."""
+    shutil.rmtree(LEGACY_STATIC_IMAGE_DIR, ignore_errors=True)
+
+
+def render_transcript_image(p: Path, key: str) -> None:
+    """Show a cached thumbnail; the full-size image is only read when staff ask for it.
+
+    `key` must be unique on the page - the same message can be rendered in several tabs.
+    """
+    _remove_published_images()
+    try:
+        fingerprint = image_fingerprint(str(p))
+    except OSError as e:
+        st.write(f"[Image could not be opened: {p} ({e})]")
+        return
+    thumb = ensure_thumbnail(str(p), fingerprint)
+
+    # Both go through the session's media endpoint, so images stay behind the Discord login.
+    try:
+        st.image(thumb or str(p))
+    except Exception as e:
+        st.write(f"[Image could not be opened: {p} ({e})]")
+        return
+    if thumb:
+        st.download_button(
+            "Full size",
+            data=p.read_bytes,
+            file_name=p.name,
+            on_click="ignore",
+            type="tertiary",
+            key=f"full_image_{key}_{fingerprint}",
+        )
+
+
+def render_messages_appy_style(messages: List[Dict[str, Any]], image_root: Path, staff_identifiers: List[str], show_internal: bool, internal_markers: List[str]):
+    rows = build_message_table(messages, internal_markers, staff_identifiers)
+    render_message_rows(rows, image_root, show_internal)
+
+
+def render_message_rows(rows: List[Dict[str, Any]], image_root: Path, show_internal: bool, key_prefix: str = "messages"):
+    """
+    Render precomputed message-table rows (see build_message_table) as chat bubbles.
+    `key_prefix` keeps widget keys apart when the same rows are rendered more than once per page.
+    """
+    prev_author = None
+    for row_index, row in enumerate(rows):
+        msg = row["msg"]
+        author = row["author"]
+        content = row["content"]
+        if row["internal"] and not show_internal:
+            continue
+
+        is_staff_msg = row["is_staff"]
+        avatar_url = get_avatar_url(msg, author)
+
+        # Add extra vertical space if author changes
+        extra_top_margin = 28 if prev_author is not None and author != prev_author else 8
+        prev_author = author
+
+        # Minimal, modern bubble style
+        if is_staff_msg:
+            bubble_style = "background:#7B0020;border-radius:10px;padding:13px 18px 13px 16px;box-shadow:0 2px 8px rgba(192,16,64,0.18);color:#FBF0F2;"
+        else:
+            bubble_style = "background:#FFFFFF;border:1px solid rgba(192,16,64,0.18);border-radius:10px;padding:13px 18px 13px 16px;box-shadow:0 2px 6px rgba(192,16,64,0.07);color:#2D0A14;"
+
+        # Use a single column and flexbox for Discord-like alignment
+        with st.container():
+            if is_staff_msg:
+                st.markdown(f'''
+                <div style="display: flex; flex-direction: row; justify-content: flex-end; align-items: flex-start; margin-bottom: 18px;">
+                    <div style="display: flex; flex-direction: column; align-items: flex-end;">
+                        <div style='text-align:right;margin-bottom:2px;'><strong>{author}</strong> <span style='background:#C01040;color:#fff;border-radius:6px;padding:2px 8px;font-size:0.85em;margin-left:8px;'>Staff</span></div>
+                        <div style='{bubble_style}margin-bottom:2px;min-width:60px;display:inline-block;text-align:left;'>
+                            {(content or '').replace(chr(10), '<br>')}
+                        </div>
+                    </div>
+                    <img src="{avatar_url}" width="44" style="border-radius:8px;margin-left:12px;object-fit:cover;" />
+                </div>
+                ''', unsafe_allow_html=True)
+            else:
+                st.markdown(f'''
+                <div style="display: flex; flex-direction: row; justify-content: flex-start; align-items: flex-start; margin-bottom: 18px;">
+                    <img src="{avatar_url}" width="44" style="border-radius:8px;margin-right:12px;object-fit:cover;" />
+                    <div style="display: flex; flex-direction: column; align-items: flex-start;">
+                        <div style='margin-bottom:2px;'><strong>{author}</strong> <span style='background:#D86080;color:#fff;border-radius:6px;padding:2px 8px;font-size:0.85em;margin-left:8px;'>User</span></div>
+                        <div style='{bubble_style}margin-bottom:2px;min-width:60px;display:inline-block;'>
+                            {(content or '').replace(chr(10), '<br>')}
+                        </div>
+                    </div>
+                </div>
+                ''', unsafe_allow_html=True)
+            # Images and attachments
+            for image_index, img_path in enumerate(msg.get("images", [])):
+                p = Path(img_path)
+                if not p.exists():
+                    p = image_root.joinpath(Path(img_path).name)
+                if p.exists():
+                    render_transcript_image(p, f"{key_prefix}_{row_index}_{image_index}")
+                else:
+                    st.write(f"[Image not found: {img_path}]")
+            for url in msg.get("attachments", []):
+                st.write(f"[Attachment: {url}]")
+
+
+def render_messages(messages: List[Dict[str, Any]], image_root: Path, staff_identifiers: List[str], show_internal: bool, internal_markers: List[str]):
+    for msg in messages:
+        internal = is_internal(msg.get("content", ""), internal_markers)
+        if internal and not show_internal:
+            continue
+
+        role = str(msg.get("role", "")).lower()
+        staff = role == "staff" or is_staff(msg.get("author", ""), staff_identifiers)
+        bubble_role = "assistant" if staff else "user"
+        ts = msg.get("ts") or msg.get("timestamp") or ""
+
+        with st.chat_message(bubble_role):
+            st.markdown(f"**{msg.get('author', '')}**  ")
+            if ts:
+                st.caption(ts)
+            st.write(msg.get("content", ""))
+
+            embeds = msg.get("embeds", [])
+            if isinstance(embeds, list):
+                for embed in embeds:
+                    if not isinstance(embed, dict):
+                        continue
+                    embed_title = embed.get("title", "")
+                    embed_author = embed.get("author", "")
+                    embed_description = embed.get("description", "")
+                    embed_fields = embed.get("fields", [])
+
+                    if embed_title:
+                        st.markdown(f"**Embed:** {embed_title}")
+                    if embed_author:
+                        st.caption(f"Embed author: {embed_author}")
+                    if embed_description:
+                        st.write(embed_description)
+
+                    if isinstance(embed_fields, list) and embed_fields:
+                        for field in embed_fields:
+                            if not isinstance(field, dict):
+                                continue
+                            field_name = field.get("name", "")
+                            field_value = field.get("value", "")
+                            if field_name and field_value:
+                                st.markdown(f"**{field_name}**")
+                                st.write(field_value)
+                            elif field_value:
+                                st.write(field_value)
+
+            for image_index, img_path in enumerate(msg.get("images", [])):
+                p = Path(img_path)
+                if not p.exists():
+                    p = image_root.joinpath(Path(img_path).name)
+                if p.exists():
+                    render_transcript_image(p, f"{key_prefix}_{row_index}_{image_index}")
+                else:
+                    st.write(f"[Image not found: {img_path}]")
+
+            for url in msg.get("attachments", []):
+                st.markdown(f"Attachment: [{url}]({url})")
+
+
+def classify_message_kind(msg: Dict[str, Any], normalized_content: str, internal_markers: List[str], staff_identifiers: List[str]) -> str:
+    if message_is_internal(msg, normalized_content, internal_markers):
+        return "internal"
+
+    role = str(msg.get("role", "")).lower()
+    if role == "user":
+        return "user"
+    if role == "staff" or is_staff_response_message(msg, normalized_content) or is_staff(str(msg.get("author", "")), staff_identifiers):
+        return "staff"
+    return "internal"
+
+
+def filter_messages_by_kind(messages: List[Dict[str, Any]], internal_markers: List[str], staff_identifiers: List[str], allowed_kinds: set) -> List[Dict[str, Any]]:
+    filtered = []
+    for msg in messages:
+        _author, content = normalize_display_message(msg)
+        if classify_message_kind(msg, content, internal_markers, staff_identifiers) in allowed_kinds:
+            filtered.append(msg)
+    return filtered
+
+
+# ── Per-transcript message table ─────────────────────────────────────────────
+# Normalising and classifying a message is the expensive part of rendering a
+# transcript, so it is done once per message and the tabs/filters slice the
+# resulting rows instead of re-running normalize/classify for every bucket.
+
+def build_message_row(msg: Dict[str, Any], internal_markers: List[str], staff_identifiers: List[str]) -> Dict[str, Any]:
+    author, content = normalize_display_message(msg)
+    raw_author = str(msg.get("author", "") or "")
+    raw_content = str(msg.get("content", "") or "")
+    role = str(msg.get("role", "")).lower()
+
+    internal = message_is_internal(msg, content, internal_markers)
+    staff_response = is_staff_response_message(msg, content)
+
+    if internal:
+        kind = "internal"
+    elif role == "user":
+        kind = "user"
+    elif role == "staff" or staff_response or is_staff(raw_author, staff_identifiers):
+        kind = "staff"
+    else:
+        kind = "internal"
+
+    return {
+        "msg": msg,
+        "author": author,
+        "content": content,
+        "raw_author": raw_author,
+        "kind": kind,
+        "internal": internal,
+        "is_staff": role == "staff" or staff_response or is_staff(author, staff_identifiers),
+        "ts": parse_iso_timestamp(msg.get("timestamp") or msg.get("ts", "")),
+        "content_lower": raw_content.lower(),
+        "author_lower": raw_author.lower(),
+    }
+
+
+def build_message_table(messages: List[Dict[str, Any]], internal_markers: List[str], staff_identifiers: List[str]) -> List[Dict[str, Any]]:
+    return [build_message_row(msg, internal_markers, staff_identifiers) for msg in messages if isinstance(msg, dict)]
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _cached_message_table(
+    channel_id: str,
+    source_version: str,
+    internal_markers: tuple,
+    staff_identifiers: tuple,
+    _messages: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    # cache_resource hands back the same list object (no pickle round-trip),
+    # so callers must treat the rows as read-only.
+    return build_message_table(_messages, list(internal_markers), list(staff_identifiers))
+
+
+def get_message_table(
+    channel_id: str,
+    source_version: str,
+    messages: List[Dict[str, Any]],
+    internal_markers: List[str],
+    staff_identifiers: List[str],
+) -> List[Dict[str, Any]]:
+    """Return the cached message table for a transcript, keyed by channel, source version and settings."""
+    return _cached_message_table(
+        str(channel_id),
+        str(source_version),
+        tuple(internal_markers),
+        tuple(staff_identifiers),
+        messages,
+    )
+
+
+# Kind codes for MessageColumns.kind; 0/1 together form the Conversation tab.
+KIND_CODES = {"user": 0, "staff": 1, "internal": 2}
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+_NAT_DAY = -(2 ** 63)  # int64 bit pattern of NaT
+
+
+def build_message_columns(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Columnar view of a message table for vectorized filtering: per-row day
+    (datetime64[D], NaT when the timestamp is missing), author code and kind code.
+    """
+    import numpy as np
+
+    authors = sorted({row["raw_author"] for row in rows if row["raw_author"]})
+    author_codes = {author: code for code, author in enumerate(authors)}
+    return {
+        "authors": authors,
+        "author_codes": author_codes,
+        # Days since 1970-01-01 in each timestamp's own offset (same as ts.date()); NaT when missing.
+        "day": np.array(
+            [row["ts"].toordinal() - _EPOCH_ORDINAL if row["ts"] is not None else _NAT_DAY for row in rows],
+            dtype=np.int64,
+        ).view("datetime64[D]"),
+        "author": np.array([author_codes.get(row["raw_author"], -1) for row in rows], dtype=np.int32),
+        "kind": np.array([KIND_CODES.get(row["kind"], KIND_CODES["internal"]) for row in rows], dtype=np.int8),
+    }
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _cached_message_columns(
+    channel_id: str,
+    source_version: str,
+    internal_markers: tuple,
+    staff_identifiers: tuple,
+    _rows: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    return build_message_columns(_rows)
+
+
+def get_message_columns(
+    channel_id: str,
+    source_version: str,
+    rows: List[Dict[str, Any]],
+    internal_markers: List[str],
+    staff_identifiers: List[str],
+) -> Dict[str, Any]:
+    """Return the cached columnar view of a message table (same key as get_message_table)."""
+    return _cached_message_columns(
+        str(channel_id),
+        str(source_version),
+        tuple(internal_markers),
+        tuple(staff_identifiers),
+        rows,
+    )
+
+
+def message_day_bounds(columns: Dict[str, Any]):
+    """(first_day, last_day) as datetime.date across messages with a timestamp, or None."""
+    import numpy as np
+
+    days = columns["day"]
+    known = days[~np.isnat(days)]
+    if not known.size:
+        return None
+    return known.min().item(), known.max().item()
+
+
+def message_filter_mask(rows: List[Dict[str, Any]], columns: Dict[str, Any], search_query: str = "", authors=None, date_from=None, date_to=None):
+    """Boolean mask over `rows` for the search, author and inclusive date-range filters."""
+    import numpy as np
+
+    mask = np.ones(len(rows), dtype=bool)
+    if authors:
+        codes = [columns["author_codes"][a] for a in authors if a in columns["author_codes"]]
+        mask &= np.isin(columns["author"], codes)
+    if date_from and date_to:
+        days = columns["day"]
+        # Messages without a timestamp stay visible, as before.
+        mask &= np.isnat(days) | ((days >= np.datetime64(date_from, "D")) & (days <= np.datetime64(date_to, "D")))
+    if search_query:
+        q = search_query.lower()
+        # Substring search is per string; only run it on rows the cheap masks kept.
+        for i in np.flatnonzero(mask):
+            row = rows[i]
+            if q not in row["content_lower"] and q not in row["author_lower"]:
+                mask[i] = False
+    return mask
+
+
+def rows_matching(rows: List[Dict[str, Any]], mask) -> List[Dict[str, Any]]:
+    import numpy as np
+
+    return [rows[i] for i in np.flatnonzero(mask)]
+
+
+def transcript_source_version(path: Path = None, transcript_json: Dict[str, Any] = None) -> str:
+    """Cheap identifier that changes whenever the underlying transcript changes."""
+    if path is not None:
+        try:
+            stat = path.stat()
+            return f"file:{stat.st_mtime_ns}:{stat.st_size}"
+        except OSError:
+            return "file:missing"
+    payload = transcript_json if isinstance(transcript_json, dict) else {}
+    ticket = payload.get("ticket", {}) if isinstance(payload.get("ticket", {}), dict) else {}
+    messages = payload.get("messages", []) if isinstance(payload.get("messages", []), list) else []
+    return f"db:{len(messages)}:{ticket.get('closed_at')}"